@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+📊 Rollup Analytics
+Per-domain and per-country aggregates over stored results (pandas)
+
+Email and phone results are read from saved reports and batch job
+output, buffered into column lists, and turned into a DataFrame every
+OSINT_ANALYTICS_CHUNK rows (default 100000). Each chunk is reduced with
+vectorized groupbys and merged into running totals, so memory grows with
+the number of distinct domains/countries/carriers, not with results.
+
+    python analytics.py [--top N] [--out file.json] [--no-export]
+
+Rollups:
+    emails   count, disposable/role/MX rates per domain, provider distribution
+             (domain table, else the stored MX hosts; see mail_providers.py)
+    phones   valid rate, country, carrier and line type breakdowns
+"""
+
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+import serialize
+from batch_jobs import JOBS_DIR, BatchJob, list_jobs
+from dedup import ROLE_KEYWORDS
+from report_store import REPORTS_DIR, iter_reports, report_type
+
+DEFAULT_CHUNK = 100000
+DEFAULT_TOP = 15
+
+EMAIL_COLUMNS = ('domain', 'local', 'disposable', 'has_mx', 'mx')
+PHONE_COLUMNS = ('country', 'carrier', 'type', 'valid')
+
+
+def iter_records(reports_dir=REPORTS_DIR, jobs_dir=JOBS_DIR):
+    """Yield (kind, result) for every stored email and phone result"""
+    for path, data in iter_reports(reports_dir):
+        kind = report_type(path, data)
+        if kind in ('email', 'phone') and 'error' not in data:
+            yield kind, data
+
+    for meta in list_jobs(jobs_dir):
+        if meta['analysis'] not in ('email', 'phone') or not meta['completed']:
+            continue
+        job = BatchJob(meta['analysis'], meta['input'], meta['job_id'], jobs_dir)
+        for _, result in job.iter_results():
+            if isinstance(result, dict) and 'error' not in result:
+                yield meta['analysis'], result
+
+
+def email_row(result):
+    local, _, domain = str(result.get('email', '')).rpartition('@')
+    domain = (result.get('domain') or domain).lower()
+    mx = result.get('mx_records') or {}
+    servers = mx.get('servers') or ('',)
+    return (domain, (result.get('username') or local).lower(),
+            bool(result.get('disposable')), bool(mx.get('has_mx')), servers[0])
+
+
+def phone_row(result):
+    return (result.get('country') or 'Unknown', result.get('carrier') or 'Unknown',
+            result.get('type') or 'Unknown', bool(result.get('valid')))
+
+
+class Rollup:
+    """Running aggregates, merged one DataFrame chunk at a time"""
+
+    def __init__(self, providers=None, role_keywords=None):
+        import pandas as pd
+        from mail_providers import get_index
+
+        self.pd = pd
+        self.index = get_index() if providers is None else providers
+        role_keywords = ROLE_KEYWORDS if role_keywords is None else role_keywords
+        self.role_pattern = '|'.join(re.escape(k) for k in role_keywords) or '(?!)'
+        self.domains = None
+        self.providers = None
+        self.countries = None
+        self.carriers = None
+        self.types = None
+        self.phones = 0
+        self.valid = 0
+        self.chunks = 0
+
+    @staticmethod
+    def _merge(total, part):
+        return part if total is None else total.add(part, fill_value=0)
+
+    def add_emails(self, columns):
+        frame = self.pd.DataFrame(dict(zip(EMAIL_COLUMNS, columns)))
+        frame['role'] = frame['local'].str.contains(self.role_pattern, regex=True)
+        frame['count'] = 1
+        part = frame.groupby('domain', sort=False)[['count', 'disposable', 'role', 'has_mx']].sum()
+        self.domains = self._merge(self.domains, part)
+
+        # One classification per distinct (domain, first MX host) in the chunk
+        pairs = frame.groupby(['domain', 'mx'], sort=False).size()
+        names = [self.index.classify(domain, (mx,)) for domain, mx in pairs.index]
+        self.providers = self._merge(self.providers, pairs.groupby(names, sort=False).sum())
+        self.chunks += 1
+
+    def add_phones(self, columns):
+        frame = self.pd.DataFrame(dict(zip(PHONE_COLUMNS, columns)))
+        self.countries = self._merge(self.countries, frame['country'].value_counts(sort=False))
+        self.carriers = self._merge(self.carriers, frame['carrier'].value_counts(sort=False))
+        self.types = self._merge(self.types, frame['type'].value_counts(sort=False))
+        self.phones += len(frame)
+        self.valid += int(frame['valid'].sum())
+        self.chunks += 1
+
+    def result(self, top=DEFAULT_TOP):
+        """Plain dict of the rollups (top N rows per table)"""
+        summary = {'emails': {'total': 0}, 'phones': {'total': self.phones}}
+
+        if self.domains is not None:
+            domains = self.domains.astype('int64')
+            total = int(domains['count'].sum())
+            rates = domains[['disposable', 'role', 'has_mx']].div(domains['count'], axis=0)
+            table = domains.assign(disposable_rate=rates['disposable'], role_rate=rates['role'],
+                                   mx_rate=rates['has_mx'])
+            table = table.sort_values('count', ascending=False, kind='stable').head(top)
+
+            summary['emails'] = {
+                'total': total,
+                'domains': len(domains),
+                'disposable_rate': round(int(domains['disposable'].sum()) / total, 4),
+                'role_rate': round(int(domains['role'].sum()) / total, 4),
+                'mx_coverage': round(int(domains['has_mx'].sum()) / total, 4),
+                'top_domains': [
+                    {'domain': domain, 'count': int(row['count']),
+                     'disposable_rate': round(float(row['disposable_rate']), 4),
+                     'role_rate': round(float(row['role_rate']), 4),
+                     'mx_rate': round(float(row['mx_rate']), 4)}
+                    for domain, row in table.iterrows()
+                ],
+                'providers': _counts(self.providers, top),
+            }
+
+        if self.phones:
+            summary['phones'] = {
+                'total': self.phones,
+                'valid_rate': round(self.valid / self.phones, 4),
+                'countries': _counts(self.countries, top),
+                'carriers': _counts(self.carriers, top),
+                'types': _counts(self.types, top),
+            }
+        return summary
+
+
+def _counts(series, top):
+    series = series.astype('int64').sort_values(ascending=False, kind='stable').head(top)
+    return {str(key): int(value) for key, value in series.items()}
+
+
+def rollup(records, chunk_rows=None, providers=None, role_keywords=None):
+    """Aggregate (kind, result) pairs chunk by chunk; returns a Rollup
+
+    providers is a mail_providers.ProviderIndex (default: the shared one).
+    """
+    chunk_rows = chunk_rows or int(os.environ.get('OSINT_ANALYTICS_CHUNK', DEFAULT_CHUNK))
+    totals = Rollup(providers, role_keywords)
+    buffers = {'email': [[] for _ in EMAIL_COLUMNS], 'phone': [[] for _ in PHONE_COLUMNS]}
+    rows = {'email': email_row, 'phone': phone_row}
+    flush = {'email': totals.add_emails, 'phone': totals.add_phones}
+
+    for kind, result in records:
+        columns = buffers[kind]
+        for column, value in zip(columns, rows[kind](result)):
+            column.append(value)
+        if len(columns[0]) >= chunk_rows:
+            flush[kind](columns)
+            buffers[kind] = [[] for _ in columns]
+
+    for kind, columns in buffers.items():
+        if columns[0]:
+            flush[kind](columns)
+    return totals
+
+
+def print_rollup(summary):
+    emails, phones = summary['emails'], summary['phones']
+    print(f"\n📧 Emails: {emails['total']}")
+    if emails['total']:
+        print(f"   Domains: {emails['domains']}  Disposable: {emails['disposable_rate']:.1%}  "
+              f"Role: {emails['role_rate']:.1%}  MX coverage: {emails['mx_coverage']:.1%}")
+        print(f"\n   {'Domain':<32} {'Count':>8} {'Disp.':>7} {'Role':>7} {'MX':>7}")
+        for row in emails['top_domains']:
+            print(f"   {row['domain'][:32]:<32} {row['count']:>8} {row['disposable_rate']:>7.1%} "
+                  f"{row['role_rate']:>7.1%} {row['mx_rate']:>7.1%}")
+        print("\n   Providers:")
+        for name, count in emails['providers'].items():
+            print(f"   • {name}: {count}")
+
+    print(f"\n📱 Phones: {phones['total']}")
+    if phones['total']:
+        print(f"   Valid: {phones['valid_rate']:.1%}")
+        for title, key in (('Countries', 'countries'), ('Carriers', 'carriers'), ('Line types', 'types')):
+            print(f"\n   {title}:")
+            for name, count in phones[key].items():
+                print(f"   • {name}: {count}")
+
+
+def run_analytics(reports_dir=REPORTS_DIR, jobs_dir=JOBS_DIR, top=DEFAULT_TOP, output=None, export=True):
+    """Compute, print and (optionally) export the rollups; returns (summary, path)"""
+    from secure_store import open_for_write
+
+    started = time.time()
+    totals = rollup(iter_records(reports_dir, jobs_dir))
+    summary = totals.result(top)
+    summary['generated'] = datetime.now().isoformat()
+    summary['seconds'] = round(time.time() - started, 2)
+    print_rollup(summary)
+
+    path = None
+    if export:
+        output = output or os.path.join(
+            'exports', f"analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        f, path = open_for_write(output)
+        with f:
+            serialize.dump(summary, f, pretty=True)
+    return summary, path
+
+
+def main():
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print("Usage: analytics.py [--top N] [--out file.json] [--no-export]")
+        return
+    top = int(args[args.index('--top') + 1]) if '--top' in args else DEFAULT_TOP
+    output = args[args.index('--out') + 1] if '--out' in args else None
+    try:
+        summary, path = run_analytics(top=top, output=output, export='--no-export' not in args)
+    except ImportError:
+        print("❌ Missing module: pandas")
+        print("Install with: pip install pandas")
+        return
+    print(f"\n⏱️  {summary['seconds']}s")
+    if path:
+        print(f"✅ Rollups saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
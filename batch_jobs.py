@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+📦 Batch Jobs
+Resumable bulk analyses driven by a checkpoint journal
+
+A job reads one target per line from an input file. Every finished
+target appends a fixed-size record to jobs/<job_id>/journal.bin:
+
+    input offset, input end, output segment, output offset
+
+Results are written as JSON lines to a new output segment per run
+(results-<n>.jsonl, encrypted like reports when enabled), so the
+journal says exactly where each target's output lives. Restarting a job
+with the same ID seeks past the completed prefix of the input and skips
+anything else already journaled. A torn record from a crash is ignored,
+and records whose output never reached disk are redone. Targets whose
+analysis raised are written to the output as {'error': ...} but never
+journaled, so a resumed job retries them. (An analyzer's own error
+result, such as an invalid address, is a definite answer and is kept.)
+
+Given a canonical() function, targets that are another spelling of an
+identity already analyzed in this run reuse its result, passed through
+restamp() so each line still reports its own spelling.
+"""
+
+import os
+import time
+import struct
+import hashlib
+
+import metrics
+import serialize
+from dedup import DedupStore
+from secure_store import SecureStoreError, open_for_read, open_for_write
+
+JOBS_DIR = 'jobs'
+RECORD = struct.Struct('<QQIQ')
+
+# Journal writes go to the OS every record; fsync is batched
+SYNC_EVERY = 64
+SYNC_INTERVAL = 1.0
+
+
+def make_job_id(analysis, input_path):
+    """Stable job ID for an analysis over an input file"""
+    digest = hashlib.sha1(f"{analysis}:{os.path.abspath(input_path)}".encode()).hexdigest()
+    return f"{analysis}-{digest[:10]}"
+
+
+class Journal:
+    """Append-only checkpoint records for one job"""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = self._read()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        # Drop a partially written trailing record
+        usable = len(data) - len(data) % RECORD.size
+        if usable != len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(usable)
+        return list(RECORD.iter_unpack(data[:usable]))
+
+    def done_offsets(self):
+        return {record[0] for record in self.records}
+
+    def resume_offset(self):
+        """End of the longest completed prefix of the input"""
+        position = 0
+        for start, end, _, _ in sorted(self.records):
+            if start > position:
+                break
+            position = max(position, end)
+        return position
+
+    def append(self, start, end, segment, output_offset):
+        if self._file is None:
+            self._file = open(self.path, 'ab', buffering=0)
+        record = (start, end, segment, output_offset)
+        self._file.write(RECORD.pack(*record))
+        self.records.append(record)
+
+        self._unsynced += 1
+        if self._unsynced >= SYNC_EVERY or time.monotonic() - self._last_sync >= SYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+class BatchJob:
+    def __init__(self, analysis, input_path, job_id=None, jobs_dir=JOBS_DIR):
+        self.analysis = analysis
+        self.input_path = input_path
+        self.job_id = job_id or make_job_id(analysis, input_path)
+        self.directory = os.path.join(jobs_dir, self.job_id)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.meta_path = os.path.join(self.directory, 'job.json')
+        self.meta = self._load_meta()
+        self.journal = Journal(os.path.join(self.directory, 'journal.bin'))
+        self.stats = {'done': 0, 'skipped': 0, 'errors': 0, 'duplicates': 0}
+        self._verify_journal()
+
+    def _load_meta(self):
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = serialize.load(f)
+            if meta['analysis'] != self.analysis:
+                raise ValueError(f"Job {self.job_id} is a {meta['analysis']} job, not {self.analysis}")
+            return meta
+
+        meta = {
+            'job_id': self.job_id,
+            'analysis': self.analysis,
+            'input': os.path.abspath(self.input_path),
+            'created': time.time(),
+            'segments': [],
+        }
+        self._save_meta(meta)
+        return meta
+
+    def _save_meta(self, meta):
+        tmp = self.meta_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            serialize.dump(meta, f, pretty=True)
+        os.replace(tmp, self.meta_path)
+
+    def _read_segment(self, segment):
+        """Complete result lines of one output segment"""
+        entries = []
+        path = os.path.join(self.directory, self.meta['segments'][segment])
+        try:
+            with open_for_read(path) as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break
+                    entries.append(serialize.loads(line))
+        except (OSError, ValueError, SecureStoreError):
+            # A segment cut short by a crash keeps its complete lines
+            pass
+        return entries
+
+    def _verify_journal(self):
+        """Forget journal records whose output was lost in a crash"""
+        if not self.journal.records:
+            return
+        lines = {}
+        valid = []
+        for record in self.journal.records:
+            segment, output_offset = record[2], record[3]
+            if segment >= len(self.meta['segments']):
+                continue
+            if segment not in lines:
+                lines[segment] = len(self._read_segment(segment))
+            if output_offset < lines[segment]:
+                valid.append(record)
+        self.journal.records = valid
+
+    @property
+    def completed(self):
+        return len(self.journal.records)
+
+    def _open_segment(self):
+        segment = len(self.meta['segments'])
+        f, path = open_for_write(os.path.join(self.directory, f"results-{segment}.jsonl"))
+        self.meta['segments'].append(os.path.basename(path))
+        self._save_meta(self.meta)
+        return segment, f
+
+    def run(self, analyze, progress=None, canonical=None, restamp=None):
+        """Analyze every remaining target; safe to interrupt and rerun"""
+        done = self.journal.done_offsets()
+        segment, out = None, None
+        written = 0
+        seen = DedupStore(path=os.path.join(self.directory, 'dedup.sqlite')) if canonical else None
+
+        try:
+            with open(self.input_path, 'rb') as f:
+                position = self.journal.resume_offset()
+                f.seek(position)
+
+                for line in iter(f.readline, b''):
+                    start, position = position, position + len(line)
+                    target = line.decode('utf-8', 'replace').strip()
+                    if not target or target.startswith('#'):
+                        continue
+                    if start in done:
+                        self.stats['skipped'] += 1
+                        continue
+
+                    key = canonical(target) if seen is not None else None
+                    failed = False
+                    if key is not None and key in seen:
+                        result = seen.get(key)
+                        if restamp is not None:
+                            result = restamp(target, result)
+                        self.stats['duplicates'] += 1
+                    else:
+                        try:
+                            with metrics.timed(f"batch_{self.analysis}"):
+                                result = analyze(target)
+                        except KeyboardInterrupt:
+                            raise
+                        except Exception as e:
+                            result = {'error': str(e)}
+                            failed = True
+                            self.stats['errors'] += 1
+                        if key is not None and not failed:
+                            seen.add(key, result)
+
+                    if out is None:
+                        segment, out = self._open_segment()
+                    out.write(serialize.dumps({'target': target, 'result': result}) + '\n')
+                    out.flush()
+
+                    # Failures stay out of the journal so a resumed job retries them
+                    if not failed:
+                        self.journal.append(start, position, segment, written)
+                        self.stats['done'] += 1
+                    written += 1
+                    if progress:
+                        progress(self, target)
+        finally:
+            # Close output (writing any buffered chunk) before the journal's final sync
+            if out is not None:
+                out.close()
+            self.journal.close()
+            if seen is not None:
+                seen.close()
+
+        return self.stats
+
+    def iter_results(self):
+        """Yield (target, result) for every journaled target"""
+        journaled = {}
+        for _, _, segment, output_offset in self.journal.records:
+            journaled.setdefault(segment, set()).add(output_offset)
+
+        for segment in sorted(journaled):
+            for index, entry in enumerate(self._read_segment(segment)):
+                if index in journaled[segment]:
+                    yield entry['target'], entry['result']
+
+
+def list_jobs(jobs_dir=JOBS_DIR):
+    """Metadata plus completed count for every job"""
+    if not os.path.isdir(jobs_dir):
+        return []
+    jobs = []
+    for entry in sorted(os.scandir(jobs_dir), key=lambda e: e.name):
+        meta_path = os.path.join(entry.path, 'job.json')
+        if not os.path.exists(meta_path):
+            continue
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = serialize.load(f)
+        journal_path = os.path.join(entry.path, 'journal.bin')
+        size = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+        meta['completed'] = size // RECORD.size
+        jobs.append(meta)
+    return jobs
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+⏱️ Encryption Benchmark
+Compares plaintext writes against the chunked AES-GCM stream
+and the raw AESGCM primitive throughput
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import secure_store
+
+WRITE_SIZE = 64 * 1024
+
+
+def _throughput(size_mb, seconds):
+    return f"{size_mb / seconds:8.0f} MB/s"
+
+
+def bench_primitive(key, block, size_mb):
+    aead = secure_store._aead(key)
+    chunks = size_mb * 1024 * 1024 // len(block)
+    nonce = os.urandom(12)
+    start = time.perf_counter()
+    for _ in range(chunks):
+        aead.encrypt(nonce, block, b'')
+    return time.perf_counter() - start
+
+
+def bench_write(path, block, size_mb, opener):
+    writes = size_mb * 1024 * 1024 // len(block)
+    start = time.perf_counter()
+    with opener(path) as f:
+        for _ in range(writes):
+            f.write(block)
+    return time.perf_counter() - start
+
+
+def bench_read(path, opener):
+    start = time.perf_counter()
+    with opener(path) as f:
+        while f.read(secure_store.DEFAULT_CHUNK_SIZE):
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    key = os.urandom(32)
+    block = os.urandom(WRITE_SIZE)
+    big_block = os.urandom(secure_store.DEFAULT_CHUNK_SIZE)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = os.path.join(tmp, 'plain.bin')
+        encrypted = os.path.join(tmp, 'data.bin.enc')
+
+        results = [
+            ('AESGCM primitive (1 MiB)', bench_primitive(key, big_block, size_mb)),
+            ('plaintext write', bench_write(plain, block, size_mb, lambda p: open(p, 'wb'))),
+            ('encrypted write', bench_write(
+                encrypted, block, size_mb,
+                lambda p: secure_store.open_encrypted(p, 'wb', key=key))),
+            ('plaintext read', bench_read(plain, lambda p: open(p, 'rb'))),
+            ('encrypted read', bench_read(
+                encrypted, lambda p: secure_store.open_encrypted(p, 'rb', key=key))),
+        ]
+
+    print(f"\n🔐 {size_mb} MB, {WRITE_SIZE // 1024} KiB writes")
+    print("-" * 50)
+    for name, seconds in results:
+        print(f"  {name:26} {seconds:6.2f}s {_throughput(size_mb, seconds)}")
+
+    overhead = results[2][1] / results[1][1]
+    print(f"\n  Encrypted write overhead: {overhead:.2f}x plaintext")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+⏱️ Extraction Benchmark
+Phone and email extraction over a synthetic corpus: the prefiltered
+scanners in extractor.py against PhoneNumberMatcher / a whole-text regex
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import extractor
+
+WORDS = ('invoice', 'order', 'meeting', 'shipment', 'the', 'and', 'for', 'customer', 'account',
+         'reference', 'total', 'due', 'please', 'contact', 'regarding', 'update')
+
+
+def noise(rng):
+    """Digits that are not phone numbers: dates, amounts, IDs, times"""
+    return rng.choice((
+        f"{rng.randint(2000, 2030)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        f"{rng.randint(1, 99999)}.{rng.randint(0, 99):02d}",
+        f"#{rng.randint(10 ** 11, 10 ** 12)}",
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+    ))
+
+
+def phone(rng):
+    return rng.choice((
+        f"077 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        f"+94 71 {rng.randint(1000000, 9999999)}",
+        f"(011) {rng.randint(200, 599)}-{rng.randint(1000, 9999)}",
+        f"+44 7911 {rng.randint(100000, 999999)}",
+    ))
+
+
+def write_corpus(directory, files, lines_per_file, seed=7):
+    rng = random.Random(seed)
+    for n in range(files):
+        with open(os.path.join(directory, f"doc{n}.txt"), 'w') as f:
+            for i in range(lines_per_file):
+                words = [rng.choice(WORDS) for _ in range(12)]
+                words.insert(rng.randrange(12), noise(rng))
+                if i % 10 == 0:
+                    words.insert(rng.randrange(12), phone(rng))
+                if i % 25 == 0:
+                    words.insert(rng.randrange(12), f"user{rng.randint(1, 5000)}@example.com")
+                f.write(' '.join(words) + '\n')
+
+
+def naive_phones(directory, region):
+    import phonenumbers
+
+    found = 0
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            found += sum(1 for _ in phonenumbers.PhoneNumberMatcher(f.read(), region))
+    return found
+
+
+def naive_emails(directory):
+    pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b')
+    found = 0
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            found += len(pattern.findall(f.read()))
+    return found
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    workers = os.cpu_count() or 1
+    region = 'LK'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_corpus(tmp, files, lines)
+        size_mb = sum(os.path.getsize(os.path.join(tmp, n)) for n in os.listdir(tmp)) / 1024 / 1024
+
+        def scan(kind, processes):
+            return len(list(extractor.extract([tmp], kind, processes, unique=False, region=region)))
+
+        results = [
+            ('phone: PhoneNumberMatcher', *timed(naive_phones, tmp, region)),
+            ('phone: prefiltered, 1 process', *timed(scan, 'phone', 1)),
+            (f'phone: prefiltered, {workers} processes', *timed(scan, 'phone', workers)),
+            ('email: whole-text regex', *timed(naive_emails, tmp)),
+            ('email: prefiltered, 1 process', *timed(scan, 'email', 1)),
+            (f'email: prefiltered, {workers} processes', *timed(scan, 'email', workers)),
+        ]
+
+    print(f"\n🔎 {files} files, {size_mb:.1f} MB")
+    print("-" * 64)
+    for name, found, seconds in results:
+        print(f"  {name:32} {seconds:7.2f}s {size_mb / seconds:8.1f} MB/s {found:>8} hits")
+
+    print(f"\n  Phone speedup (1 process): {results[0][2] / results[1][2]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
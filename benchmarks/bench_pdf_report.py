@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+⏱️ PDF Report Benchmark
+Builds a PDF summary from N synthetic saved reports and
+reports wall time and peak Python memory
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_report import PDFReportBuilder
+from report_store import iter_reports
+
+
+def write_reports(directory, count):
+    """Write count synthetic phone/email/username reports"""
+    for i in range(count):
+        kind = ('phone', 'email', 'username')[i % 3]
+        if kind == 'phone':
+            data = {
+                'original': f'0701{i:06d}',
+                'international': f'+94 70 1{i:06d}',
+                'country': 'Sri Lanka',
+                'carrier': 'Mobitel',
+                'type': 'Mobile',
+                'timestamp': '2024-01-01T00:00:00',
+            }
+        elif kind == 'email':
+            data = {
+                'email': f'user{i}@example.com',
+                'disposable': False,
+                'mx_records': {'has_mx': True, 'servers': ['mx1.example.com.']},
+                'timestamp': '2024-01-01T00:00:00',
+            }
+        else:
+            data = {
+                'username': f'user{i}',
+                'platforms': {'GitHub': f'https://github.com/user{i}'},
+                'check_date': '2024-01-01T00:00:00',
+            }
+        with open(os.path.join(directory, f'{kind}_{i:08d}.json'), 'w') as f:
+            json.dump(data, f)
+
+
+def run(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        reports_dir = os.path.join(tmp, 'reports')
+        os.makedirs(reports_dir)
+        write_reports(reports_dir, count)
+
+        output = os.path.join(tmp, 'summary.pdf')
+        tracemalloc.start()
+        start = time.perf_counter()
+        builder = PDFReportBuilder(output)
+        builder.build(iter_reports(reports_dir))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'reports': builder.total,
+            'seconds': round(elapsed, 2),
+            'peak_mb': round(peak / 1024 / 1024, 1),
+            'pdf_kb': os.path.getsize(output) // 1024,
+        }
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    print(f"{'reports':>8} {'seconds':>8} {'peak MB':>8} {'PDF KB':>8}")
+    for count in counts:
+        result = run(count)
+        print(f"{result['reports']:>8} {result['seconds']:>8} {result['peak_mb']:>8} {result['pdf_kb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+⏱️ Serialization Benchmark
+Compares the installed JSON backends on report-shaped documents:
+encode (pretty and compact), decode, and size on disk
+"""
+
+import os
+import sys
+import time
+import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serialize import Serializer, available_backends
+
+
+def sample_report(i):
+    """A phone report plus MX data, shaped like what the collector saves"""
+    return {
+        'original': f'0701{i:06d}',
+        'international': f'+94 70 1{i:06d}',
+        'e164': f'+94701{i:06d}',
+        'country': 'Sri Lanka',
+        'carrier': 'Mobitel',
+        'type': 'Mobile',
+        'timezones': ('Asia/Colombo',),
+        'valid': True,
+        'possible': True,
+        'mx_records': {'has_mx': True, 'servers': [f'mx{n}.example.com.' for n in range(3)]},
+        'timestamp': datetime.datetime(2024, 1, 1, 0, 0, i % 60),
+    }
+
+
+def bench(func, documents, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for document in documents:
+            func(document)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rounds = 3
+    documents = [sample_report(i) for i in range(count)]
+
+    print(f"\n🧾 {count} reports, best of {rounds}")
+    print(f"  {'backend':10} {'pretty':>9} {'compact':>9} {'decode':>9} {'bytes/doc':>10}")
+    print("-" * 52)
+    for backend in available_backends():
+        codec = Serializer(backend)
+        encoded = [codec.dumpb(d) for d in documents]
+        pretty = bench(lambda d: codec.dumpb(d, pretty=True), documents, rounds)
+        compact = bench(codec.dumpb, documents, rounds)
+        decode = bench(codec.loads, encoded, rounds)
+        size = sum(len(e) for e in encoded) // count
+        print(f"  {backend:10} {pretty:8.3f}s {compact:8.3f}s {decode:8.3f}s {size:>10}")
+
+    pretty_size = len(Serializer('json').dumpb(documents[0], pretty=True))
+    print(f"\n  Pretty stdlib document: {pretty_size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+⏱️ SPF Audit Benchmark
+SPF/DMARC audit of synthetic domains against a local stub nameserver:
+one shared, memoized auditor against a fresh auditor per domain
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rate_limit
+from dns_stub import PROVIDER_ZONES, StubDNSServer, synthetic_zones, zone_targets
+from dns_tools import DeadlineResolver, ResolverConfig
+from spf import SPFAuditor
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    latency = sys.argv[2] if len(sys.argv) > 2 else 'fixed:0.002'
+    zones = synthetic_zones(count)
+    domains = zone_targets(zones)
+    rate_limit.reset_limiter(rate_limit.RateLimiter(rate_limit.LimiterConfig(initial=1e9, maximum=1e9, burst=1e9)))
+
+    with StubDNSServer(zones, latency=latency) as server:
+        resolver = DeadlineResolver(ResolverConfig(nameservers=[server.address]))
+        resolve = lambda name: resolver.resolve(name, 'TXT')
+
+        start = time.perf_counter()
+        shared = SPFAuditor(resolve)
+        results = shared.audit(domains)
+        shared_seconds = time.perf_counter() - start
+        shared_queries = server.queries
+
+        # Per-domain auditors: nothing is memoized between domains
+        sample = domains[:max(1, count // 10)]
+        start = time.perf_counter()
+        for domain in sample:
+            SPFAuditor(resolve, workers=1).audit_domain(domain)
+        naive_seconds = (time.perf_counter() - start) * len(domains) / len(sample)
+        naive_queries = (server.queries - shared_queries) * len(domains) / len(sample)
+
+    distinct = len(domains) * 2 + len(PROVIDER_ZONES)  # SPF + _dmarc per domain, providers once
+    statuses = {}
+    for result in results:
+        statuses[result['spf']['status']] = statuses.get(result['spf']['status'], 0) + 1
+
+    print(f"\n🛡️  {len(domains)} domains, {latency} per query, {distinct} distinct TXT names")
+    print("-" * 64)
+    print(f"  {'shared auditor':28} {shared_seconds:7.2f}s {shared_queries:>9} queries")
+    print(f"  {'auditor per domain (est.)':28} {naive_seconds:7.2f}s {naive_queries:>9.0f} queries")
+    print(f"\n  SPF status: {statuses}")
+    print(f"  Speedup: {naive_seconds / shared_seconds:.1f}x, "
+          f"{shared_queries / len(domains):.2f} queries per domain")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+⏱️ Benchmark harness
+
+Each benchmark is timed with timeit (best of several repeats) and
+divided by the time of a fixed pure-Python reference workload measured
+right next to it. The resulting score is roughly machine independent
+and is compared with the committed baseline in baselines.json.
+
+    pytest benchmarks                      # fail on regressions
+    pytest benchmarks --update-baselines   # record new baselines
+"""
+
+import io
+import os
+import json
+import timeit
+import contextlib
+
+import pytest
+
+BASELINES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DEFAULT_TOLERANCE = 1.5
+REPEATS = 7
+ATTEMPTS = 3
+MIN_TIME = 0.02
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('osint benchmarks')
+    group.addoption('--update-baselines', action='store_true', default=False,
+                    help="Record benchmark scores into benchmarks/baselines.json")
+    group.addoption('--benchmark-tolerance', type=float,
+                    default=float(os.environ.get('OSINT_BENCH_TOLERANCE', DEFAULT_TOLERANCE)),
+                    help="Allowed slowdown factor against the baseline (default 1.5)")
+
+
+def _reference_workload():
+    """Fixed mix of string, dict and regex work used to normalize timings"""
+    import re
+
+    pattern = re.compile(r'\d+')
+    table = {}
+    for i in range(200):
+        key = f"user{i}@example.com"
+        table[key.lower()] = pattern.findall(key)
+    return len(table)
+
+
+def measure(func, *args, **kwargs):
+    """Best per-call time in seconds, with stdout silenced"""
+    sink = io.StringIO()
+
+    def call():
+        with contextlib.redirect_stdout(sink):
+            func(*args, **kwargs)
+        sink.seek(0)
+        sink.truncate()
+
+    timer = timeit.Timer(call)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= MIN_TIME:
+            break
+        loops *= 2 if elapsed > MIN_TIME / 10 else 10
+    return min([elapsed] + timer.repeat(repeat=REPEATS - 1, number=loops)) / loops
+
+
+@pytest.fixture(scope='session')
+def baselines():
+    try:
+        with open(BASELINES_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'benchmarks': {}}
+
+
+@pytest.fixture(scope='session')
+def _recorder(request, baselines):
+    updated = {}
+    yield updated
+    if request.config.getoption('--update-baselines') and updated:
+        baselines.setdefault('benchmarks', {}).update(updated)
+        baselines['unit'] = 'seconds per call / reference workload seconds'
+        with open(BASELINES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+@pytest.fixture
+def benchmark(request, baselines, _recorder):
+    """Time func(*args) and compare its score against the stored baseline"""
+    config = request.config
+    name = request.node.name
+
+    def score_of(func, args, kwargs):
+        # Re-measure the reference next to every benchmark so that
+        # frequency scaling and noisy neighbours affect both sides alike
+        per_call = measure(func, *args, **kwargs)
+        reference = min(measure(_reference_workload), measure(_reference_workload))
+        return per_call, per_call / reference
+
+    def run(func, *args, **kwargs):
+        per_call, score = score_of(func, args, kwargs)
+
+        if config.getoption('--update-baselines'):
+            _recorder[name] = round(score, 4)
+            return per_call
+
+        baseline = baselines.get('benchmarks', {}).get(name)
+        if baseline is None:
+            pytest.skip(f"No baseline for {name}; run with --update-baselines")
+
+        # A real regression is slow on every attempt; noise usually is not
+        tolerance = config.getoption('--benchmark-tolerance')
+        for _ in range(ATTEMPTS - 1):
+            if score <= baseline * tolerance:
+                break
+            retry_per_call, retry_score = score_of(func, args, kwargs)
+            if retry_score < score:
+                per_call, score = retry_per_call, retry_score
+
+        assert score <= baseline * tolerance, (
+            f"{name} regressed: score {score:.4f} vs baseline {baseline:.4f} "
+            f"({score / baseline:.2f}x, tolerance {tolerance}x, {per_call * 1e6:.1f}µs/call)"
+        )
+        return per_call
+
+    return run
@@ -0,0 +1,75 @@
+"""
+Microbenchmarks for the core analyzers (offline, DNS stubbed)
+"""
+
+PHONES = ['+94701234567', '0771234567', '+14155552671', '+447911123456']
+EMAILS = ['john.doe@gmail.com', 'support@example.com', 'x@mailinator.com', 'not-an-email']
+
+
+def test_verify_email_format(benchmark, hunter):
+    benchmark(lambda: [hunter.verify_email_format(e) for e in EMAILS])
+
+
+def test_guess_email_variations(benchmark, hunter):
+    benchmark(hunter.guess_email_variations, 'John Michael Doe', 'example.com')
+
+
+def test_is_role_account(benchmark, hunter):
+    benchmark(lambda: [hunter.is_role_account(e) for e in EMAILS])
+
+
+def test_is_disposable_email(benchmark, collector):
+    domains = [e.split('@')[-1] for e in EMAILS]
+    benchmark(lambda: [collector.is_disposable_email(d) for d in domains])
+
+
+def test_get_number_type(benchmark, collector):
+    benchmark(lambda: [collector.get_number_type(t) for t in range(12)])
+
+
+def test_check_mx_records(benchmark, stub_dns, collector):
+    benchmark(lambda: [collector.check_mx_records(d) for d in ('gmail.com', 'missing.invalid')])
+
+
+def test_simulate_email_verification(benchmark, stub_dns, hunter):
+    benchmark(hunter.simulate_email_verification, 'john.doe@example.com')
+
+
+def test_quick_email_search(benchmark, quick_search):
+    benchmark(quick_search.quick_email_search, 'john.doe@example.com')
+
+
+def test_quick_phone_search(benchmark, quick_search):
+    benchmark(lambda: [quick_search.quick_phone_search(p) for p in PHONES])
+
+
+def test_phone_parsing(benchmark, collector):
+    benchmark(lambda: [collector.analyze_phone(p) for p in PHONES])
+
+
+def test_number_range_lookup(benchmark):
+    from number_ranges import get_table
+
+    table = get_table()
+    benchmark(lambda: list(table.lookup_many(PHONES)))
+
+
+def test_phone_normalize_many(benchmark):
+    from phone_normalize import normalize_many
+
+    benchmark(lambda: list(normalize_many(PHONES)))
+
+
+def test_serialize_report(benchmark, collector):
+    import serialize
+
+    report = collector.analyze_phone(PHONES[0])
+    benchmark(lambda: serialize.loads(serialize.dumpb(report, pretty=True)))
+
+
+def test_phone_extraction(benchmark):
+    from extractor import scan_phones
+
+    text = (b"Order 2024-01-02 total 12345.67 ref #123456789012, call 077 123 4567 "
+            b"or +44 7911 123456 before 17:30.\n") * 20
+    benchmark(lambda: list(scan_phones(text, 0, len(text), 'LK')))
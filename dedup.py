@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+🧬 Canonicalization & Deduplication
+Collapse different spellings of the same target before analysis
+
+Emails are lowercased, IDN domains converted to punycode, and provider
+rules applied (Gmail ignores dots and +tags, most large providers
+ignore +tags). Phones become E.164 and domains lowercase punycode.
+
+DedupStore remembers one result per canonical identity in memory and
+spills to SQLite once it holds more than OSINT_DEDUP_MEMORY_KEYS keys,
+so duplicates are answered without re-running the analysis.
+"""
+
+import os
+import hashlib
+import sqlite3
+import tempfile
+
+import serialize
+
+DEFAULT_MEMORY_KEYS = 200000
+
+# domain -> (canonical domain, ignore dots, strip +tags)
+PROVIDER_RULES = {
+    'gmail.com': ('gmail.com', True, True),
+    'googlemail.com': ('gmail.com', True, True),
+    'outlook.com': ('outlook.com', False, True),
+    'hotmail.com': ('hotmail.com', False, True),
+    'live.com': ('live.com', False, True),
+    'icloud.com': ('icloud.com', False, True),
+    'me.com': ('icloud.com', False, True),
+    'mac.com': ('icloud.com', False, True),
+    'protonmail.com': ('protonmail.com', False, True),
+    'proton.me': ('proton.me', False, True),
+    'pm.me': ('pm.me', False, True),
+    'fastmail.com': ('fastmail.com', False, True),
+    'zoho.com': ('zoho.com', False, True),
+}
+
+# Local parts that mark a role/group mailbox
+ROLE_KEYWORDS = (
+    'admin', 'administrator', 'contact', 'info', 'support',
+    'help', 'sales', 'service', 'webmaster', 'postmaster',
+    'hostmaster', 'abuse', 'noc', 'security', 'billing'
+)
+
+
+def canonical_domain(domain):
+    """Lowercase ASCII (punycode) form of a domain"""
+    domain = domain.strip().rstrip('.').lower()
+    if not domain.isascii():
+        try:
+            domain = domain.encode('idna').decode('ascii')
+        except UnicodeError:
+            pass
+    return domain
+
+
+def ascii_email(email):
+    """Address with its domain in punycode, spelling otherwise unchanged"""
+    local, sep, domain = email.strip().rpartition('@')
+    if not sep or domain.isascii():
+        return email.strip()
+    return f"{local}@{canonical_domain(domain)}"
+
+
+def canonical_email(email):
+    """Canonical mailbox for an address, per provider rules"""
+    email = email.strip()
+    local, sep, domain = email.rpartition('@')
+    if not sep or not local:
+        return email.lower()
+
+    domain = canonical_domain(domain)
+    local = local.lower()
+    rule = PROVIDER_RULES.get(domain)
+    if rule:
+        domain, ignore_dots, strip_tags = rule
+        if strip_tags:
+            local = local.split('+', 1)[0]
+        if ignore_dots:
+            local = local.replace('.', '')
+    return f"{local}@{domain}"
+
+
+def canonical_phone(phone):
+    from phone_normalize import normalize
+    return normalize(phone).e164 or str(phone).strip()
+
+
+def canonical(analysis, target):
+    """Canonical identity of a target for an analysis type"""
+    target = str(target)
+    if analysis.startswith('email'):
+        return canonical_email(target)
+    if analysis == 'phone':
+        return canonical_phone(target)
+    if analysis in ('domain', 'spf'):
+        return canonical_domain(target)
+    return target.strip().lower()
+
+
+def _digest(key):
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+
+class DedupStore:
+    """Canonical key -> result, in memory until it spills to SQLite"""
+
+    def __init__(self, max_memory_keys=None, path=None):
+        if max_memory_keys is None:
+            max_memory_keys = int(os.environ.get('OSINT_DEDUP_MEMORY_KEYS', DEFAULT_MEMORY_KEYS))
+        self.max_memory_keys = max_memory_keys
+        self.path = path
+        self._memory = {}
+        self._db = None
+
+    def __len__(self):
+        count = len(self._memory)
+        if self._db is not None:
+            count += self._db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        return count
+
+    def __contains__(self, key):
+        return self._lookup(_digest(key)) is not None
+
+    def _lookup(self, digest):
+        if digest in self._memory:
+            return self._memory[digest]
+        if self._db is not None:
+            row = self._db.execute("SELECT result FROM seen WHERE key = ?", (digest,)).fetchone()
+            if row is not None:
+                return row[0]
+        return None
+
+    def _spill(self):
+        if self.path is None:
+            fd, self.path = tempfile.mkstemp(prefix='dedup-', suffix='.sqlite')
+            os.close(fd)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute("CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY, result TEXT)")
+        self._db.executemany("INSERT OR REPLACE INTO seen VALUES (?, ?)", self._memory.items())
+        self._memory.clear()
+
+    def get(self, key, default=None):
+        stored = self._lookup(_digest(key))
+        return default if stored is None else serialize.loads(stored)
+
+    def add(self, key, result=None):
+        """Remember key (and its result); returns False if it was already present"""
+        digest = _digest(key)
+        if self._lookup(digest) is not None:
+            return False
+
+        stored = serialize.dumps(result)
+        if self._db is None and len(self._memory) >= self.max_memory_keys:
+            self._spill()
+        if self._db is None:
+            self._memory[digest] = stored
+        else:
+            self._db.execute("INSERT OR REPLACE INTO seen VALUES (?, ?)", (digest, stored))
+        return True
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
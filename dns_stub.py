@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+🧪 Stub DNS Server
+Local authoritative UDP nameserver for tests and load tests
+
+Answers from a {name: {rdtype: [text]}} zone dict (or a JSON file of
+one). Replies can be delayed by a latency distribution, and a fraction
+of queries can be dropped or answered with SERVFAIL / NXDOMAIN:
+
+    python dns_stub.py [--zones zones.json | --domains 1000] [--port 5353]
+                       [--latency lognormal:0.02,0.5] [--drop 0.01]
+                       [--servfail 0.01] [--nxdomain 0.01] [--seed N]
+
+Latency specs:
+    fixed:S            every reply after S seconds
+    uniform:LO,HI      uniform between LO and HI seconds
+    exp:MEAN           exponential with the given mean
+    lognormal:MED,SIG  lognormal with median MED seconds and shape SIG
+"""
+
+import sys
+import time
+import heapq
+import random
+import socket
+import threading
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+# MX hosts and matching SPF records used by synthetic_zones()
+SYNTHETIC_MX = (
+    ['1 aspmx.l.google.com.', '5 alt1.aspmx.l.google.com.'],
+    ['0 {label}.mail.protection.outlook.com.'],
+    ['10 mx1.{domain}.', '20 mx2.{domain}.'],
+    ['10 mx.zoho.com.'],
+    ['10 mx1.{domain}.'],
+)
+SYNTHETIC_SPF = (
+    'v=spf1 include:_spf.google.com ~all',
+    'v=spf1 include:spf.protection.outlook.com -all',
+    'v=spf1 mx a -all',
+    'v=spf1 include:zoho.com ~all',
+    'v=spf1 ip4:{ip} -all',
+)
+
+# Provider SPF records the synthetic domains include (shared by all of them)
+PROVIDER_ZONES = {
+    '_spf.google.com': {'TXT': ['"v=spf1 include:_netblocks.google.com include:_netblocks2.google.com '
+                                'include:_netblocks3.google.com ~all"']},
+    '_netblocks.google.com': {'TXT': ['"v=spf1 ip4:35.190.247.0/24 ip4:64.233.160.0/19 ~all"']},
+    '_netblocks2.google.com': {'TXT': ['"v=spf1 ip6:2001:4860:4000::/36 ip6:2404:6800:4000::/36 ~all"']},
+    '_netblocks3.google.com': {'TXT': ['"v=spf1 ip4:172.217.0.0/19 ip4:172.253.56.0/21 ~all"']},
+    'spf.protection.outlook.com': {'TXT': ['"v=spf1 ip4:40.92.0.0/15 ip4:40.107.0.0/16 -all"']},
+    'zoho.com': {'TXT': ['"v=spf1 ip4:136.143.188.0/24 ip4:165.173.128.0/24 ~all"']},
+}
+
+_rrsets = {}
+
+
+def _rrset(qname, rdtype, records):
+    # Parsing rdata dominates a stub lookup, so build each rrset once
+    key = (qname, rdtype, tuple(records))
+    if key not in _rrsets:
+        _rrsets[key] = dns.rrset.from_text_list(qname, 300, 'IN', rdtype, records)
+    return _rrsets[key]
+
+
+def stub_response(query, zones):
+    """Build a DNS response for query from a {name: {rdtype: [text]}} zone dict"""
+    response = dns.message.make_response(query)
+    question = query.question[0]
+    name = question.name.to_text().rstrip('.').lower()
+    rdtype = dns.rdatatype.to_text(question.rdtype)
+
+    if name not in zones:
+        response.set_rcode(dns.rcode.NXDOMAIN)
+    elif rdtype in zones[name]:
+        response.answer.append(_rrset(question.name, rdtype, zones[name][rdtype]))
+    return response
+
+
+def parse_latency(spec):
+    """Sampler rng -> seconds for a latency spec (see module docstring); None for no delay"""
+    if spec is None or spec == '' or spec == 0:
+        return None
+    if isinstance(spec, (int, float)):
+        seconds = float(spec)
+        return lambda rng: seconds
+
+    kind, _, args = str(spec).partition(':')
+    try:
+        values = [float(v) for v in args.split(',') if v.strip()]
+        if kind == 'fixed' and len(values) == 1:
+            return lambda rng: values[0]
+        if kind == 'uniform' and len(values) == 2:
+            return lambda rng: rng.uniform(values[0], values[1])
+        if kind == 'exp' and len(values) == 1 and values[0] > 0:
+            return lambda rng: rng.expovariate(1 / values[0])
+        if kind == 'lognormal' and len(values) == 2 and values[0] > 0:
+            from math import log
+            mu = log(values[0])
+            return lambda rng: rng.lognormvariate(mu, values[1])
+    except ValueError:
+        pass
+    raise ValueError(f"Bad latency spec {spec!r} (fixed:S, uniform:LO,HI, exp:MEAN, lognormal:MED,SIG)")
+
+
+def synthetic_zones(count, suffix='test'):
+    """count domains d<n>.<suffix> with A, MX and SPF records (DMARC on every
+    other one), plus the provider SPF records they include"""
+    zones = dict(PROVIDER_ZONES)
+    for n in range(count):
+        domain = f"d{n}.{suffix}"
+        ip = f"10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}"
+        kind = n % len(SYNTHETIC_MX)
+        zones[domain] = {
+            'A': [ip],
+            'MX': [record.format(domain=domain, label=domain.replace('.', '-'))
+                   for record in SYNTHETIC_MX[kind]],
+            'TXT': [f'"{SYNTHETIC_SPF[kind].format(ip=ip)}"'],
+        }
+        if n % 2 == 0:
+            zones[f"_dmarc.{domain}"] = {'TXT': ['"v=DMARC1; p=quarantine; rua=mailto:dmarc@example.com"']}
+    return zones
+
+
+def zone_targets(zones):
+    """Names in a zone dict worth analyzing (not provider or underscore records)"""
+    return [name for name in sorted(zones) if not name.startswith('_') and name not in PROVIDER_ZONES]
+
+
+def load_zones(path):
+    """Zone dict from a JSON file"""
+    import serialize
+
+    with open(path, 'r', encoding='utf-8') as f:
+        zones = serialize.load(f)
+    return {name.rstrip('.').lower(): records for name, records in zones.items()}
+
+
+class StubDNSServer:
+    """Answers from a zone dict with configurable latency and failure injection
+
+    delay/drop/servfail are shorthands for a fixed latency and rates of 1.0.
+    """
+
+    def __init__(self, zones, delay=0.0, drop=False, servfail=False, latency=None,
+                 drop_rate=0.0, servfail_rate=0.0, nxdomain_rate=0.0, seed=None,
+                 host='127.0.0.1', port=0):
+        self.zones = zones
+        self.latency = parse_latency(latency if latency is not None else delay)
+        self.drop_rate = 1.0 if drop else drop_rate
+        self.servfail_rate = 1.0 if servfail else servfail_rate
+        self.nxdomain_rate = nxdomain_rate
+        self.stats = {'dropped': 0, 'servfail': 0, 'nxdomain': 0, 'answered': 0}
+        self.queries = 0
+        self._rng = random.Random(seed)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.1)
+        self.host, self.port = self.sock.getsockname()[:2]
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+        # Delayed replies wait in one heap served by one thread
+        self._pending = []
+        self._pending_lock = threading.Condition()
+        self._sender = threading.Thread(target=self._send_delayed, daemon=True)
+
+    @property
+    def address(self):
+        return f"{self.host}:{self.port}"
+
+    def __enter__(self):
+        self._thread.start()
+        self._sender.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._running = False
+        with self._pending_lock:
+            self._pending_lock.notify()
+        self._thread.join()
+        self._sender.join()
+        self.sock.close()
+
+    def _answer(self, wire):
+        query = dns.message.from_wire(wire)
+        roll = self._rng.random()
+        if roll < self.servfail_rate:
+            self.stats['servfail'] += 1
+            response = dns.message.make_response(query)
+            response.set_rcode(dns.rcode.SERVFAIL)
+        elif roll < self.servfail_rate + self.nxdomain_rate:
+            self.stats['nxdomain'] += 1
+            response = dns.message.make_response(query)
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        else:
+            response = stub_response(query, self.zones)
+            if response.rcode() == dns.rcode.NXDOMAIN:
+                self.stats['nxdomain'] += 1
+            else:
+                self.stats['answered'] += 1
+        return response.to_wire()
+
+    def _serve(self):
+        while self._running:
+            try:
+                wire, client = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            self.queries += 1
+            if self.drop_rate and self._rng.random() < self.drop_rate:
+                self.stats['dropped'] += 1
+                continue
+
+            try:
+                reply = self._answer(wire)
+            except Exception:
+                continue
+            delay = self.latency(self._rng) if self.latency else 0.0
+            if delay > 0:
+                with self._pending_lock:
+                    heapq.heappush(self._pending, (time.monotonic() + delay, self.queries, reply, client))
+                    self._pending_lock.notify()
+            else:
+                self._send(reply, client)
+
+    def _send_delayed(self):
+        while True:
+            with self._pending_lock:
+                while self._running and (not self._pending or self._pending[0][0] > time.monotonic()):
+                    self._pending_lock.wait(self._pending[0][0] - time.monotonic() if self._pending else None)
+                if not self._running:
+                    return
+                _, _, reply, client = heapq.heappop(self._pending)
+            self._send(reply, client)
+
+    def _send(self, reply, client):
+        try:
+            self.sock.sendto(reply, client)
+        except OSError:
+            pass
+
+
+def main():
+    args = sys.argv[1:]
+
+    def option(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    zones = load_zones(option('--zones')) if '--zones' in args else synthetic_zones(int(option('--domains', 1000)))
+    server = StubDNSServer(
+        zones, latency=option('--latency'), drop_rate=float(option('--drop', 0)),
+        servfail_rate=float(option('--servfail', 0)), nxdomain_rate=float(option('--nxdomain', 0)),
+        seed=option('--seed'), port=int(option('--port', 5353)))
+
+    with server:
+        print(f"🧪 Stub DNS on {server.address} ({len(zones)} names)")
+        print(f"   Use with: OSINT_DNS_SERVERS={server.address}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print(f"\n👋 Stopped after {server.queries} queries: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
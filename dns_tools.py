@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+🧭 Deadline-Aware DNS
+Per-query timeouts, per-target budgets and hedged queries
+to a second nameserver
+
+Configuration (environment):
+    OSINT_DNS_SERVERS      comma separated nameservers, host or host:port
+                           (default: system resolver configuration)
+    OSINT_DNS_TIMEOUT      per-query deadline in seconds (default 2.0)
+    OSINT_DNS_BUDGET       overall budget per target in seconds (default 5.0)
+    OSINT_DNS_HEDGE_PCT    latency percentile that triggers a hedge (default 0.9)
+    OSINT_DNS_HEDGE_DELAY  hedge delay until enough samples exist (default 0.3)
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import dns.exception
+import dns.message
+import dns.query
+import dns.rcode
+import dns.rdataclass
+import dns.resolver
+
+import metrics
+from rate_limit import get_limiter
+
+MIN_SAMPLES = 20
+RETRANSMIT_INTERVAL = 1.0
+LATENCY_WINDOW = 500
+
+# Definitive answers: another nameserver would say the same thing
+AUTHORITATIVE_ERRORS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+
+
+class DeadlineExceeded(dns.exception.Timeout):
+    """The per-query deadline or per-target budget ran out"""
+    degraded = True
+
+
+class RateLimited(dns.exception.Timeout):
+    """No rate-limit token was due before the query's deadline"""
+
+
+class Deadline:
+    """Absolute point in time shared by every lookup for one target"""
+
+    def __init__(self, seconds):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+
+class ResolverConfig:
+    def __init__(self, nameservers=None, query_timeout=2.0, target_budget=5.0,
+                 hedge_percentile=0.9, hedge_delay=0.3, min_hedge_delay=0.01):
+        self.nameservers = list(nameservers or [])
+        self.query_timeout = query_timeout
+        self.target_budget = target_budget
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ
+        servers = [s.strip() for s in env.get('OSINT_DNS_SERVERS', '').split(',') if s.strip()]
+        return cls(
+            nameservers=servers,
+            query_timeout=float(env.get('OSINT_DNS_TIMEOUT', 2.0)),
+            target_budget=float(env.get('OSINT_DNS_BUDGET', 5.0)),
+            hedge_percentile=float(env.get('OSINT_DNS_HEDGE_PCT', 0.9)),
+            hedge_delay=float(env.get('OSINT_DNS_HEDGE_DELAY', 0.3)),
+        )
+
+
+def _parse_server(server):
+    """'1.2.3.4' or '1.2.3.4:5353' or '[::1]:5353' -> (host, port)"""
+    if server.startswith('['):
+        host, _, port = server[1:].partition(']:')
+        return host.rstrip(']'), int(port or 53)
+    if server.count(':') == 1:
+        host, port = server.split(':')
+        return host, int(port)
+    return server, 53
+
+
+def _system_nameservers():
+    try:
+        return list(dns.resolver.Resolver().nameservers)
+    except dns.resolver.NoResolverConfiguration:
+        return ['127.0.0.1']
+
+
+class DeadlineResolver:
+    def __init__(self, config=None):
+        self.config = config or ResolverConfig.from_env()
+        servers = self.config.nameservers or _system_nameservers()
+        self.upstreams = [_parse_server(server) for server in servers[:2]]
+
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='dns')
+        self.stats = {'queries': 0, 'hedged': 0, 'hedge_wins': 0, 'degraded': 0, 'failed': 0}
+
+    def _count(self, key, metric):
+        with self._lock:
+            self.stats[key] += 1
+        metrics.inc(metric)
+
+    def budget(self, seconds=None):
+        """Start a per-target budget to pass to resolve()"""
+        return Deadline(self.config.target_budget if seconds is None else seconds)
+
+    def hedge_delay(self):
+        """Recent primary latency at the configured percentile"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < MIN_SAMPLES:
+            return self.config.hedge_delay
+        index = min(len(samples) - 1, int(len(samples) * self.config.hedge_percentile))
+        return max(self.config.min_hedge_delay, samples[index])
+
+    def _exchange(self, upstream, qname, rdtype, expires):
+        """One paced UDP exchange (TCP on truncation) that never outlives expires"""
+        host, port = upstream
+        bucket = get_limiter().bucket(f"dns:{host}:{port}")
+        if not bucket.acquire(expires - time.monotonic()):
+            raise RateLimited(f"{qname} {rdtype} rate limited past its deadline")
+
+        # The attempt starts once the token is in hand, so pacing never eats into it
+        window = min(RETRANSMIT_INTERVAL, expires - time.monotonic())
+        if window <= 0:
+            raise RateLimited(f"{qname} {rdtype} rate limited past its deadline")
+
+        query = dns.message.make_query(qname, rdtype)
+        try:
+            response, _ = dns.query.udp_with_fallback(query, host, timeout=window, port=port)
+        except dns.exception.Timeout:
+            # A window cut short by the deadline says nothing about the upstream
+            if window >= min(RETRANSMIT_INTERVAL, self.config.query_timeout) / 2:
+                bucket.congestion()
+            raise
+
+        if response.rcode() in (dns.rcode.SERVFAIL, dns.rcode.REFUSED):
+            bucket.congestion()
+        else:
+            bucket.success()
+        return query, response
+
+    def _query(self, upstream, qname, rdtype, timeout):
+        expires = time.monotonic() + timeout
+        start = time.monotonic()
+
+        # Retransmit lost packets until the deadline
+        while True:
+            if expires - time.monotonic() <= 0:
+                raise dns.exception.Timeout(f"{qname} {rdtype} timed out")
+            try:
+                query, response = self._exchange(upstream, qname, rdtype, expires)
+                break
+            except RateLimited:
+                raise
+            except dns.exception.Timeout:
+                continue
+
+        if upstream is self.upstreams[0]:
+            with self._lock:
+                self._latencies.append(time.monotonic() - start)
+        metrics.inc('osint_dns_queries_total', upstream=f"{upstream[0]}:{upstream[1]}")
+
+        rcode = response.rcode()
+        if rcode == dns.rcode.NXDOMAIN:
+            raise dns.resolver.NXDOMAIN(qnames=[query.question[0].name], responses={})
+        if rcode != dns.rcode.NOERROR:
+            raise dns.resolver.NoNameservers(request=query, errors=[])
+
+        # Answer follows CNAMEs and raises NoAnswer when the type is missing
+        return dns.resolver.Answer(query.question[0].name, query.question[0].rdtype,
+                                   dns.rdataclass.IN, response)
+
+    def _resolve_inline(self, qname, rdtype, timeout):
+        # Nothing to hedge to, so skip the thread hop
+        try:
+            return self._query(self.upstreams[0], qname, rdtype, timeout)
+        except AUTHORITATIVE_ERRORS:
+            raise
+        except dns.exception.Timeout:
+            self._count('degraded', 'osint_dns_degraded_total')
+            raise DeadlineExceeded(f"{qname} {rdtype} exceeded {timeout:.2f}s")
+        except Exception:
+            self._count('failed', 'osint_dns_failed_total')
+            raise
+
+    def resolve(self, qname, rdtype='A', deadline=None):
+        """Resolve within min(query timeout, remaining budget), hedging if slow"""
+        deadline = deadline or self.budget(self.config.query_timeout)
+        timeout = min(self.config.query_timeout, deadline.remaining())
+        with self._lock:
+            self.stats['queries'] += 1
+
+        if timeout <= 0:
+            self._count('degraded', 'osint_dns_degraded_total')
+            raise DeadlineExceeded(f"No budget left for {qname} {rdtype}")
+
+        if len(self.upstreams) == 1:
+            return self._resolve_inline(qname, rdtype, timeout)
+
+        expires = time.monotonic() + timeout
+        primary = self._pool.submit(self._query, self.upstreams[0], qname, rdtype, timeout)
+        pending = {primary}
+        hedged = None
+        last_error = None
+
+        # Give the primary until the hedge delay, then race the secondary
+        done, _ = wait(pending, timeout=min(self.hedge_delay(), timeout))
+
+        while True:
+            for future in done:
+                pending.discard(future)
+                try:
+                    answer = future.result()
+                except AUTHORITATIVE_ERRORS:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    continue
+                if future is hedged:
+                    self._count('hedge_wins', 'osint_dns_hedge_wins_total')
+                return answer
+
+            remaining = expires - time.monotonic()
+            if hedged is None and len(self.upstreams) > 1 and remaining > 0:
+                hedged = self._pool.submit(self._query, self.upstreams[1], qname, rdtype, remaining)
+                pending.add(hedged)
+                self._count('hedged', 'osint_dns_hedged_total')
+
+            if not pending:
+                if isinstance(last_error, dns.exception.Timeout):
+                    break
+                self._count('failed', 'osint_dns_failed_total')
+                raise last_error or dns.resolver.NoNameservers()
+
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+
+        self._count('degraded', 'osint_dns_degraded_total')
+        raise DeadlineExceeded(f"{qname} {rdtype} exceeded {timeout:.2f}s")
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['hedge_delay_ms'] = round(self.hedge_delay() * 1000, 1)
+        stats['upstreams'] = [f"{host}:{port}" for host, port in self.upstreams]
+        limiter = get_limiter()
+        stats['rates'] = {u: round(limiter.bucket(f"dns:{u}").rate, 1) for u in stats['upstreams']}
+        return stats
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_resolver():
+    """Process-wide resolver so latency history and the thread pool are shared"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DeadlineResolver()
+        return _shared
+
+
+def reset_resolver(resolver=None):
+    """Replace the shared resolver (None rebuilds it from the environment)"""
+    global _shared
+    with _shared_lock:
+        _shared = resolver
@@ -6,16 +6,27 @@ FOR EDUCATIONAL AND AUTHORIZED USE ONLY
 """
 
 import re
-import json
+import sys
 import time
+import hashlib
 import requests
-import dns.resolver
 from datetime import datetime
 from urllib.parse import urlparse
 
+import metrics
+import profiling
+import serialize
+import rate_limit
+from dedup import ROLE_KEYWORDS
+from dns_tools import AUTHORITATIVE_ERRORS, get_resolver
+from mail_providers import get_index
+from platforms import get_registry
+from result_cache import get_cache
+
+
 class EmailHunter:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = rate_limit.install(requests.Session())
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -23,18 +34,9 @@ class EmailHunter:
         # Common email patterns
         self.email_regex = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
         
-        # Common email providers
-        self.providers = {
-            'gmail.com': 'Google',
-            'yahoo.com': 'Yahoo',
-            'outlook.com': 'Microsoft',
-            'hotmail.com': 'Microsoft',
-            'protonmail.com': 'ProtonMail',
-            'icloud.com': 'Apple',
-            'aol.com': 'AOL',
-            'zoho.com': 'Zoho',
-            'mail.com': 'Mail.com'
-        }
+        # Consumer domains; custom domains are classified by their MX hosts
+        self.providers = get_index().domains
+        self.role_keywords = ROLE_KEYWORDS
     
     def verify_email_format(self, email):
         """Verify email format is valid"""
@@ -85,11 +87,24 @@ class EmailHunter:
     
     def check_mx_records(self, domain):
         """Check if domain has MX records (can receive email)"""
+        has_mx, servers, _ = self.resolve_mx(domain)
+        return has_mx, servers
+    
+    def resolve_mx(self, domain):
+        """(has MX, servers, definite); definite is False when the lookup failed
+        without an answer or NXDOMAIN/NoAnswer, e.g. SERVFAIL or a timeout"""
         try:
-            mx_records = dns.resolver.resolve(domain, 'MX')
-            return True, [str(mx.exchange) for mx in mx_records]
-        except:
-            return False, []
+            with metrics.timed('dns_mx'):
+                mx_records = get_resolver().resolve(domain, 'MX')
+            return True, [str(mx.exchange) for mx in mx_records], True
+        except AUTHORITATIVE_ERRORS:
+            return False, [], True
+        except Exception:
+            return False, [], False
+    
+    def classify_provider(self, domain, mx_servers=()):
+        """Mailbox provider from the domain or its already-resolved MX hosts"""
+        return get_index().classify(domain, mx_servers)
     
     def simulate_email_verification(self, email):
         """Simulate email verification (educational purposes)"""
@@ -106,7 +121,7 @@ class EmailHunter:
             'email': email,
             'format_valid': True,
             'domain': domain,
-            'provider': self.providers.get(domain, 'Unknown'),
+            'provider': self.classify_provider(domain, mx_servers),
             'has_mx_records': has_mx,
             'mx_servers': mx_servers,
             'disposable': False,
@@ -124,29 +139,22 @@ class EmailHunter:
     
     def is_role_account(self, email):
         """Check if email is a role/group account"""
-        role_keywords = [
-            'admin', 'administrator', 'contact', 'info', 'support',
-            'help', 'sales', 'service', 'webmaster', 'postmaster',
-            'hostmaster', 'abuse', 'noc', 'security', 'billing'
-        ]
-        
         username = email.split('@')[0].lower()
-        return any(keyword in username for keyword in role_keywords)
+        return any(keyword in username for keyword in self.role_keywords)
     
     def find_associated_accounts(self, email):
         """Find accounts associated with email (simulated)"""
         username = email.split('@')[0]
         
+        registry = get_registry()
+        searches = registry.links(email, 'search')
+        
         # Simulated account findings
         accounts = {
-            'social_media': {
-                'twitter': f'https://twitter.com/search?q={email}',
-                'facebook': f'https://www.facebook.com/search/top/?q={email}',
-                'instagram': f'https://www.instagram.com/explore/tags/{username}/',
-                'linkedin': f'https://www.linkedin.com/search/results/all/?keywords={email}'
-            },
+            'social_media': {platform.lower(): url for platform, url in searches.items()},
+            'profiles': registry.links(username),
             'data_breaches': self.simulate_breach_check(email),
-            'github': f'https://github.com/search?q={email}&type=users',
+            'github': searches['GitHub'],
             'gravatar': f'https://en.gravatar.com/{hashlib.md5(email.encode()).hexdigest()}'
         }
         
@@ -158,7 +166,6 @@ class EmailHunter:
         breaches = []
         
         # Based on email hash for simulation
-        import hashlib
         email_hash = hashlib.md5(email.lower().encode()).hexdigest()
         
         # Check first few characters for simulation
@@ -200,16 +207,27 @@ class EmailHunter:
         if not is_valid:
             return None
         
+        # Reuse a fresh report for the same mailbox, under this spelling
+        cache = get_cache()
+        entry = cache.get_entry('email_intel', email)
+        if entry is not None:
+            report = self.restamp_report(entry['result'], email)
+            print(f"♻️  Cached report from {int(cache.age(entry) // 60)} min ago")
+            print(f"Provider: {report['provider']}")
+            print(f"Breaches: {report['breaches_found']}")
+            return report
+        
         # Get domain info
         domain = email.split('@')[1]
         print(f"Domain: {domain}")
         
-        # Check provider
-        provider = self.providers.get(domain, 'Unknown')
+        # Check MX records
+        has_mx, mx_servers, definite = self.resolve_mx(domain)
+        
+        # Check provider (domain table, then the MX hosts just resolved)
+        provider = self.classify_provider(domain, mx_servers)
         print(f"Provider: {provider}")
         
-        # Check MX records
-        has_mx, mx_servers = self.check_mx_records(domain)
         print(f"MX Records: {'✅' if has_mx else '❌'}")
         if has_mx and mx_servers:
             print(f"  Servers: {', '.join(mx_servers[:2])}")
@@ -246,8 +264,30 @@ class EmailHunter:
             'analysis_date': datetime.now().isoformat()
         }
         
+        # A resolver failure is not "no MX"; leave it uncached so it is retried
+        if definite:
+            try:
+                cache.put('email_intel', email, report)
+            except Exception as e:
+                print(f"⚠️  Cache write failed: {e}")
+        
         return report
     
+    def restamp_report(self, report, email):
+        """A cached report for another spelling of the mailbox, rewritten for this one
+        
+        MX data and the provider are shared; the address, role check, simulated
+        breaches and account links depend on the exact spelling.
+        """
+        if report['email'] == email:
+            return report
+        domain = email.split('@')[1]
+        accounts = self.find_associated_accounts(email)
+        verification = dict(report['verification'], email=email, domain=domain,
+                            role_account=self.is_role_account(email))
+        return dict(report, email=email, domain=domain, verification=verification,
+                    accounts=accounts, breaches_found=len(accounts['data_breaches']))
+    
     def search_by_name_domain(self, name, domain):
         """Search for emails by name and domain"""
         print(f"\n🔍 Searching for emails: {name} @ {domain}")
@@ -284,6 +324,68 @@ class EmailHunter:
             'analysis_date': datetime.now().isoformat()
         }
 
+def run_option(hunter, choice):
+    """Run one menu option (1-5); only the analysis itself is profiled, not the prompts"""
+    if choice == '1':
+        email = input("Enter email to analyze: ").strip()
+        if email:
+            with profiling.profiled('hunter_option_1'):
+                report = hunter.generate_email_intel_report(email)
+            if report:
+                save = input("\n💾 Save report? (y/n): ").lower()
+                if save == 'y':
+                    filename = f"email_report_{email.replace('@', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        serialize.dump(report, f)
+                    print(f"✅ Saved to: {filename}")
+    
+    elif choice == '2':
+        name = input("Enter full name: ").strip()
+        domain = input("Enter domain (e.g., company.com): ").strip()
+        if name and domain:
+            with profiling.profiled('hunter_option_2'):
+                report = hunter.search_by_name_domain(name, domain)
+            save = input("\n💾 Save results? (y/n): ").lower()
+            if save == 'y':
+                filename = f"email_search_{name.replace(' ', '_')}_{domain}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                with open(filename, 'w', encoding='utf-8') as f:
+                    serialize.dump(report, f)
+                print(f"✅ Saved to: {filename}")
+    
+    elif choice == '3':
+        name = input("Enter name: ").strip()
+        domain = input("Enter domain: ").strip()
+        if name and domain:
+            with profiling.profiled('hunter_option_3'):
+                variations = hunter.guess_email_variations(name, domain)
+            print(f"\n📧 Generated {len(variations)} email variations:")
+            for i, email in enumerate(variations, 1):
+                print(f"{i:3}. {email}")
+    
+    elif choice == '4':
+        domain = input("Enter domain to check MX records: ").strip()
+        if domain:
+            with profiling.profiled('hunter_option_4'):
+                has_mx, mx_servers = hunter.check_mx_records(domain)
+            print(f"\nDomain: {domain}")
+            print(f"Has MX records: {'✅ Yes' if has_mx else '❌ No'}")
+            if has_mx:
+                print("MX Servers:")
+                for server in mx_servers:
+                    print(f"  • {server}")
+    
+    elif choice == '5':
+        path = input("Enter file or directory to scan: ").strip()
+        if path:
+            from extractor import print_stats, run_extraction
+            
+            with profiling.profiled('hunter_option_5'):
+                stats, output = run_extraction([path])
+            print_stats(stats, output)
+    
+    else:
+        print("❌ Invalid choice")
+
 def main():
     print("\n" + "📧" * 30)
     print("    ADVANCED EMAIL HUNTER")
@@ -291,67 +393,30 @@ def main():
     print("📧" * 30)
     
     hunter = EmailHunter()
+    if '--no-cache' in sys.argv:
+        get_cache().bypass = True
+    try:
+        profiling.configure(argv=sys.argv)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
     
     print("\n🔧 Available functions:")
     print("1. Analyze single email")
     print("2. Find emails by name & domain")
     print("3. Generate email variations")
     print("4. Check domain MX records")
-    print("5. Exit")
+    print("5. Extract emails from your own files (DLP sweep)")
+    print("6. Exit")
     
     try:
-        choice = input("\nSelect option (1-5): ").strip()
-        
-        if choice == '1':
-            email = input("Enter email to analyze: ").strip()
-            if email:
-                report = hunter.generate_email_intel_report(email)
-                if report:
-                    save = input("\n💾 Save report? (y/n): ").lower()
-                    if save == 'y':
-                        filename = f"email_report_{email.replace('@', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                        with open(filename, 'w') as f:
-                            json.dump(report, f, indent=2)
-                        print(f"✅ Saved to: {filename}")
-        
-        elif choice == '2':
-            name = input("Enter full name: ").strip()
-            domain = input("Enter domain (e.g., company.com): ").strip()
-            if name and domain:
-                report = hunter.search_by_name_domain(name, domain)
-                save = input("\n💾 Save results? (y/n): ").lower()
-                if save == 'y':
-                    filename = f"email_search_{name.replace(' ', '_')}_{domain}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                    with open(filename, 'w') as f:
-                        json.dump(report, f, indent=2)
-                    print(f"✅ Saved to: {filename}")
-        
-        elif choice == '3':
-            name = input("Enter name: ").strip()
-            domain = input("Enter domain: ").strip()
-            if name and domain:
-                variations = hunter.guess_email_variations(name, domain)
-                print(f"\n📧 Generated {len(variations)} email variations:")
-                for i, email in enumerate(variations, 1):
-                    print(f"{i:3}. {email}")
+        choice = input("\nSelect option (1-6): ").strip()
         
-        elif choice == '4':
-            domain = input("Enter domain to check MX records: ").strip()
-            if domain:
-                has_mx, mx_servers = hunter.check_mx_records(domain)
-                print(f"\nDomain: {domain}")
-                print(f"Has MX records: {'✅ Yes' if has_mx else '❌ No'}")
-                if has_mx:
-                    print("MX Servers:")
-                    for server in mx_servers:
-                        print(f"  • {server}")
-        
-        elif choice == '5':
+        if choice == '6':
             print("\n👋 Goodbye!")
             return
         
-        else:
-            print("❌ Invalid choice")
+        run_option(hunter, choice)
     
     except KeyboardInterrupt:
         print("\n\n👋 Program terminated")
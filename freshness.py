@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+⏳ Freshness Scheduler
+Re-verify only the domains whose DNS data has expired
+
+Every MX lookup records the domain with its DNS TTL, so the data is
+known good until checked_at + TTL. The scheduler keeps those expiry
+times in cache/freshness.sqlite (indexed, so the most stale domain is
+always first) and a refresh run re-verifies expired domains oldest
+first until its query budget is spent. Lookups that time out are retried
+with exponential backoff instead of at the next run.
+
+Observations are buffered and written in batches (every FLUSH_EVERY
+checks or FLUSH_INTERVAL seconds), so tracking adds no database commit
+to each lookup.
+
+Configuration (environment):
+    OSINT_FRESH_BUDGET    DNS queries per refresh run (default 200)
+    OSINT_FRESH_MIN_TTL   shortest recheck interval in seconds (default 300)
+    OSINT_FRESH_MAX_TTL   longest recheck interval in seconds (default 7 days)
+"""
+
+import os
+import time
+import atexit
+import sqlite3
+import threading
+from datetime import datetime
+
+import metrics
+from dedup import canonical_domain
+
+DEFAULT_DB = os.path.join('cache', 'freshness.sqlite')
+NEGATIVE_TTL = 3600         # "no MX" answers, like a typical SOA minimum
+QUERIES_PER_DOMAIN = 2      # A + MX
+FLUSH_EVERY = 256
+FLUSH_INTERVAL = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    checked_at REAL NOT NULL,
+    ttl REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    failures INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS domains_expiry ON domains (expires_at);
+"""
+
+
+class FreshnessScheduler:
+    def __init__(self, path=DEFAULT_DB, min_ttl=None, max_ttl=None):
+        self.path = path
+        env = os.environ.get
+        self.min_ttl = float(min_ttl or env('OSINT_FRESH_MIN_TTL', 300))
+        self.max_ttl = float(max_ttl or env('OSINT_FRESH_MAX_TTL', 7 * 86400))
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Analyzer threads (service mode) share one connection
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._pending = {}
+        self._last_flush = time.monotonic()
+
+    def interval(self, ttl, ok=True, failures=0):
+        """Seconds until a domain is due again"""
+        if not ok:
+            return min(self.max_ttl, self.min_ttl * 2 ** failures)
+        if ttl is None:
+            ttl = NEGATIVE_TTL
+        return min(self.max_ttl, max(self.min_ttl, float(ttl)))
+
+    def observe(self, domain, ttl=None, ok=True, checked_at=None):
+        """Record a check of domain; ttl None means a negative answer"""
+        domain = canonical_domain(domain)
+        if not domain:
+            return
+        with self._lock:
+            # Count every failure in the buffer window, and whether the stored
+            # streak still applies (a success in the window resets it)
+            previous = self._pending.get(domain)
+            if ok:
+                failures, carry = 0, False
+            elif previous is None:
+                failures, carry = 1, True
+            else:
+                failures, carry = previous[3] + 1, previous[4]
+            self._pending[domain] = (checked_at or time.time(), ttl, ok, failures, carry)
+            if len(self._pending) < FLUSH_EVERY and time.monotonic() - self._last_flush < FLUSH_INTERVAL:
+                return
+        self.flush()
+
+    def flush(self):
+        """Write buffered observations in one transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            if not pending:
+                return
+            self.db.execute("BEGIN")
+            for domain, (checked_at, ttl, ok, failures, carry) in pending.items():
+                if carry:
+                    row = self.db.execute("SELECT failures FROM domains WHERE domain = ?", (domain,)).fetchone()
+                    failures += row[0] if row else 0
+                self.db.execute(
+                    "INSERT OR REPLACE INTO domains VALUES (?, ?, ?, ?, ?)",
+                    (domain, checked_at, ttl if ttl is not None else -1,
+                     checked_at + self.interval(ttl, ok, failures - 1), failures))
+            self.db.execute("COMMIT")
+
+    def seed(self, domains):
+        """Track (domain, checked_at) pairs from past runs; unknown TTLs are due now"""
+        added = 0
+        with self._lock:
+            self.db.execute("BEGIN")
+            for domain, checked_at in domains:
+                domain = canonical_domain(domain)
+                if domain:
+                    added += self.db.execute(
+                        "INSERT OR IGNORE INTO domains VALUES (?, ?, -1, ?, 0)",
+                        (domain, checked_at, checked_at)).rowcount
+            self.db.execute("COMMIT")
+        return added
+
+    def due(self, now=None, limit=None):
+        """Expired domains, most stale first"""
+        now = now or time.time()
+        self.flush()
+        with self._lock:
+            return [row[0] for row in self.db.execute(
+                "SELECT domain FROM domains WHERE expires_at <= ? ORDER BY expires_at LIMIT ?",
+                (now, -1 if limit is None else limit))]
+
+    def refresh(self, verify, budget=None, queries=None):
+        """Re-verify expired domains until the query budget is spent
+
+        verify(domain) performs the lookups (and calls observe via the
+        analyzers). queries() returns a running DNS query count; without
+        it each domain is charged QUERIES_PER_DOMAIN.
+        """
+        budget = int(budget or os.environ.get('OSINT_FRESH_BUDGET', 200))
+        stats = {'due': self.count_due(), 'refreshed': 0, 'changed': 0, 'queries': 0}
+        start = queries() if queries else 0
+        started = time.time()
+
+        # Domains refreshed this run are no longer due, so paging resumes at the
+        # most stale remaining one; seen guards against a verify that never observes
+        seen = set()
+        while stats['queries'] < budget:
+            page = self.due(now=started, limit=len(seen) + max(1, (budget - stats['queries']) // QUERIES_PER_DOMAIN))
+            page = [domain for domain in page if domain not in seen]
+            if not page:
+                break
+            for domain in page:
+                seen.add(domain)
+                if stats['queries'] >= budget:
+                    break
+                if verify(domain):
+                    stats['changed'] += 1
+                stats['refreshed'] += 1
+                stats['queries'] = (queries() - start) if queries else stats['refreshed'] * QUERIES_PER_DOMAIN
+                metrics.inc('osint_freshness_refreshed_total')
+
+        stats['remaining'] = self.count_due()
+        return stats
+
+    def count_due(self, now=None):
+        self.flush()
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM domains WHERE expires_at <= ?",
+                                   (now or time.time(),)).fetchone()[0]
+
+    def summary(self):
+        now = time.time()
+        self.flush()
+        with self._lock:
+            tracked, next_due = self.db.execute("SELECT COUNT(*), MIN(expires_at) FROM domains").fetchone()
+        return {'tracked': tracked, 'due': self.count_due(now),
+                'next_due_in': max(0.0, next_due - now) if next_due else None}
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self.db.close()
+
+
+def report_domains(reports):
+    """(domain, checked_at) for email reports from iter_reports()"""
+    for _, report in reports:
+        domain = report.get('domain') or report.get('email', '').rpartition('@')[2]
+        if not domain:
+            continue
+        try:
+            checked_at = datetime.fromisoformat(report.get('timestamp', '')).timestamp()
+        except (TypeError, ValueError):
+            checked_at = 0.0
+        yield domain, checked_at
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Process-wide scheduler over cache/freshness.sqlite, flushed at exit"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = FreshnessScheduler()
+            atexit.register(_shared.flush)
+        return _shared
+
+
+def reset_scheduler(scheduler=None):
+    """Replace the shared scheduler (None reopens it on next use)"""
+    global _shared
+    with _shared_lock:
+        previous, _shared = _shared, scheduler
+    if previous is not None and previous is not scheduler:
+        atexit.unregister(previous.flush)
+        previous.close()
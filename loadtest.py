@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+🏋️ DNS Load Test
+Drive MX / domain / email / SPF analyses at a target rate against local stub
+nameservers (dns_stub.py) and report throughput, latency and cache hits
+
+    python loadtest.py [--workload mx|domain|email|spf] [--qps 200] [--duration 10]
+                       [--domains 1000 | --zones zones.json] [--zipf 1.1] [--unknown 0.05]
+                       [--latency lognormal:0.02,0.5] [--drop 0.01] [--servfail 0.01]
+                       [--nxdomain 0] [--servers 2] [--concurrency 64] [--no-limit]
+                       [--seed N] [--out logs/loadtest.json]
+
+Load is open-loop: request n is due at start + n/qps whether or not
+earlier ones have finished, and its latency is measured from that due
+time, so queueing behind a slow resolver shows up in p99 instead of
+quietly lowering the offered rate. Targets are drawn from the zone names
+with Zipf popularity (so the result cache sees repeats); --unknown is the
+fraction of names the stub does not know (NXDOMAIN).
+
+The run happens in a temporary working directory with fresh cache,
+freshness, resolver and rate limiter state, so nothing leaks into the
+real cache/. --no-limit replaces the adaptive rate limiter with an
+unthrottled one to measure the resolver alone.
+
+Workloads:
+    mx       collector.check_mx_records(domain)
+    domain   A + MX recon through the result cache (domain_recon/batch path)
+    email    email analysis through the result cache
+    spf      SPF/DMARC audit through the result cache (includes memoized)
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import accumulate
+
+import serialize
+from dns_stub import StubDNSServer, load_zones, synthetic_zones, zone_targets
+
+WORKLOADS = ('mx', 'domain', 'email', 'spf')
+
+
+class TargetPicker:
+    """Zone names with Zipf popularity, plus a fraction of unknown names"""
+
+    def __init__(self, names, zipf=1.1, unknown=0.0, seed=None):
+        self.names = list(names)
+        self.unknown = unknown
+        self.rng = random.Random(seed)
+        self.cumulative = list(accumulate(1 / (rank ** zipf) for rank in range(1, len(self.names) + 1)))
+
+    def pick(self):
+        if self.unknown and self.rng.random() < self.unknown:
+            return f"missing{self.rng.randrange(10 ** 9)}.invalid"
+        index = bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])
+        return self.names[min(index, len(self.names) - 1)]
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), int(q * len(sorted_values) + 0.999999)))
+    return sorted_values[rank - 1]
+
+
+def outcome(result):
+    if not isinstance(result, dict):
+        return 'ok'
+    if 'error' in result:
+        return 'error'
+    if result.get('degraded') or (result.get('mx_records') or {}).get('degraded'):
+        return 'degraded'
+    if 'temperror' in ((result.get('spf') or {}).get('status'), (result.get('dmarc') or {}).get('status')):
+        return 'degraded'
+    return 'ok'
+
+
+def drive(analyze, pick, qps, duration, concurrency=64):
+    """Offer pick() targets to analyze at qps for duration seconds (open loop)"""
+    latencies = []
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def one(target, due):
+        try:
+            status = outcome(analyze(target))
+        except Exception:
+            status = 'error'
+        latency = time.monotonic() - due
+        with lock:
+            latencies.append(latency)
+            outcomes[status] += 1
+
+    offered = 0
+    start = time.monotonic()
+    with ThreadPoolExecutor(concurrency, thread_name_prefix='load') as pool:
+        while offered < qps * duration:
+            due = start + offered / qps
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            pool.submit(one, pick(), due)
+            offered += 1
+    elapsed = time.monotonic() - start
+
+    latencies.sort()
+    return {
+        'offered': offered,
+        'completed': len(latencies),
+        'seconds': round(elapsed, 3),
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'max_ms': round((latencies[-1] if latencies else 0.0) * 1000, 2),
+        'outcomes': dict(outcomes),
+    }
+
+
+class Sandbox:
+    """Temporary working directory with fresh shared state for one run"""
+
+    def __init__(self, nameservers, no_limit=False):
+        self.nameservers = nameservers
+        self.no_limit = no_limit
+
+    def _reset(self, resolver=None, limiter=None):
+        import dns_tools
+        import freshness
+        import rate_limit
+        import result_cache
+        import spf
+
+        freshness.reset_scheduler()
+        spf.reset_auditor()
+        result_cache.reset_cache()
+        dns_tools.reset_resolver(resolver)
+        rate_limit.reset_limiter(limiter)
+
+    def __enter__(self):
+        from dns_tools import DeadlineResolver, ResolverConfig
+        from rate_limit import LimiterConfig, RateLimiter
+
+        self.previous = os.getcwd()
+        self.directory = tempfile.mkdtemp(prefix='loadtest-')
+        os.chdir(self.directory)
+
+        config = ResolverConfig.from_env()
+        config.nameservers = self.nameservers
+        limiter = RateLimiter(LimiterConfig(initial=1e9, maximum=1e9, burst=1e9)) if self.no_limit else None
+        self._reset(DeadlineResolver(config), limiter)
+        return self
+
+    def __exit__(self, *exc):
+        self._reset()
+        os.chdir(self.previous)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        return False
+
+
+def workload(collector, name):
+    """Blocking callable(domain) for a workload"""
+    if name == 'mx':
+        return collector.check_mx_records
+    if name == 'domain':
+        return lambda domain: collector.analyze_target('domain', domain)
+    if name == 'email':
+        return lambda domain: collector.analyze_target('email', f"user@{domain}")
+    if name == 'spf':
+        return lambda domain: collector.analyze_target('spf', domain)
+    raise ValueError(f"Unknown workload {name!r} (use {', '.join(WORKLOADS)})")
+
+
+def run_loadtest(workload_name='mx', qps=200, duration=10.0, zones=None, domains=1000, zipf=1.1,
+                 unknown=0.05, latency=None, drop=0.0, servfail=0.0, nxdomain=0.0, servers=1,
+                 concurrency=64, no_limit=False, seed=None):
+    """Start stub nameservers, drive the workload, and return the report dict"""
+    from dns_tools import get_resolver
+    from result_cache import get_cache
+    from service import load_script
+
+    zones = zones if zones is not None else synthetic_zones(domains)
+    stubs = [StubDNSServer(zones, latency=latency, drop_rate=drop, servfail_rate=servfail,
+                           nxdomain_rate=nxdomain, seed=None if seed is None else f"{seed}:{n}")
+             for n in range(servers)]
+    picker = TargetPicker(zone_targets(zones), zipf, unknown, seed)
+
+    for stub in stubs:
+        stub.__enter__()
+    try:
+        with Sandbox([stub.address for stub in stubs], no_limit):
+            collector = load_script('osint_collector', 'osint collector.py').OSINTCollector()
+            report = drive(workload(collector, workload_name), picker.pick, qps, duration, concurrency)
+            cache = get_cache().summary()
+            resolver = get_resolver().summary()
+    finally:
+        for stub in stubs:
+            stub.__exit__(None, None, None)
+
+    report.update({
+        'workload': workload_name,
+        'target_qps': qps,
+        'cache_hit_ratio': cache['hit_rate'] if cache['lookups'] else None,
+        'cache': {key: cache[key] for key in ('hits', 'misses', 'stale', 'stores')},
+        'resolver': {key: resolver[key] for key in ('queries', 'hedged', 'hedge_wins', 'degraded', 'failed')},
+        'resolver_rates': resolver['rates'],
+        'servers': [dict(stub.stats, queries=stub.queries, address=stub.address) for stub in stubs],
+        'config': {'zones': len(zones), 'zipf': zipf, 'unknown': unknown, 'latency': latency,
+                   'drop': drop, 'servfail': servfail, 'nxdomain': nxdomain,
+                   'concurrency': concurrency, 'rate_limit': not no_limit},
+        'generated': datetime.now().isoformat(),
+    })
+    return report
+
+
+def print_report(report):
+    print(f"\n🏋️  {report['workload']} @ {report['target_qps']} qps for {report['seconds']}s")
+    print(f"   Throughput: {report['throughput']}/s ({report['completed']}/{report['offered']} completed)")
+    print(f"   Latency:    p50 {report['p50_ms']} ms  p99 {report['p99_ms']} ms  max {report['max_ms']} ms")
+    ratio = report['cache_hit_ratio']
+    print(f"   Cache hits: {'n/a' if ratio is None else f'{ratio:.1%}'}")
+    print(f"   Outcomes:   {report['outcomes']}")
+    print(f"   Resolver:   {report['resolver']}  rates {report['resolver_rates']}")
+    for server in report['servers']:
+        print(f"   Stub {server['address']}: {server['queries']} queries, {server['answered']} answered, "
+              f"{server['nxdomain']} NXDOMAIN, {server['servfail']} SERVFAIL, {server['dropped']} dropped")
+
+
+def main():
+    args = sys.argv[1:]
+    if '--help' in args or '-h' in args:
+        print(__doc__)
+        return
+
+    def option(name, default, cast=str):
+        return cast(args[args.index(name) + 1]) if name in args else default
+
+    try:
+        report = run_loadtest(
+            workload_name=option('--workload', 'mx'),
+            qps=option('--qps', 200.0, float),
+            duration=option('--duration', 10.0, float),
+            zones=load_zones(args[args.index('--zones') + 1]) if '--zones' in args else None,
+            domains=option('--domains', 1000, int),
+            zipf=option('--zipf', 1.1, float),
+            unknown=option('--unknown', 0.05, float),
+            latency=option('--latency', None),
+            drop=option('--drop', 0.0, float),
+            servfail=option('--servfail', 0.0, float),
+            nxdomain=option('--nxdomain', 0.0, float),
+            servers=option('--servers', 1, int),
+            concurrency=option('--concurrency', 64, int),
+            no_limit='--no-limit' in args,
+            seed=option('--seed', None),
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    print_report(report)
+    output = option('--out', os.path.join(
+        'logs', f"loadtest_{report['workload']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        serialize.dump(report, f, pretty=True)
+    print(f"\n✅ Report saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+📮 Mail Provider Classifier
+Names the mailbox provider behind a domain from the domain itself or
+its MX hostnames, loaded from data/mail_providers.csv
+
+Consumer domains (gmail.com, outlook.com, ...) are looked up directly.
+Custom domains are classified by the MX hosts already resolved for them,
+e.g. aspmx.l.google.com is Google Workspace and
+contoso-com.mail.protection.outlook.com is Microsoft 365. MX patterns
+are compiled into a dict keyed by hostname suffix, and a lookup probes
+one key per label of the host, so its cost does not grow with the table.
+
+    python mail_providers.py <domain> [mx host ...]
+"""
+
+import os
+import sys
+import csv
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_SOURCE = os.path.join(DATA_DIR, 'mail_providers.csv')
+
+UNKNOWN = 'Unknown'
+
+
+def _host(name):
+    return str(name).strip().rstrip('.').lower()
+
+
+class ProviderIndex:
+    def __init__(self, rows=()):
+        self.domains = {}
+        self._suffixes = {}  # suffix -> (provider, subdomains only)
+        for provider, kind, pattern in rows:
+            self.add(provider, kind, pattern)
+
+    def add(self, provider, kind, pattern):
+        pattern = _host(pattern)
+        if kind == 'domain':
+            self.domains[pattern] = provider
+        elif kind == 'mx':
+            wildcard = pattern.startswith('*.')
+            self._suffixes[pattern[2:] if wildcard else pattern] = (provider, wildcard)
+        else:
+            raise ValueError(f"{provider}: unknown kind {kind!r} (use domain or mx)")
+
+    @classmethod
+    def load(cls, path=DEFAULT_SOURCE):
+        rows = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith('#') or row[0] == 'provider':
+                    continue
+                rows.append([cell.strip() for cell in row[:3]])
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.domains) + len(self._suffixes)
+
+    def match_mx(self, host):
+        """Provider for one MX hostname (longest matching suffix), or None"""
+        host = _host(host)
+        position = 0
+        while True:
+            entry = self._suffixes.get(host[position:] if position else host)
+            if entry is not None and (position or not entry[1]):
+                return entry[0]
+            position = host.find('.', position) + 1
+            if not position:
+                return None
+
+    def classify(self, domain, mx_hosts=()):
+        """Provider for a domain, falling back to its MX hosts in the order given"""
+        provider = self.domains.get(_host(domain))
+        if provider is not None:
+            return provider
+        for host in mx_hosts or ():
+            provider = self.match_mx(host)
+            if provider is not None:
+                return provider
+        return UNKNOWN
+
+
+_index = None
+
+
+def get_index(path=DEFAULT_SOURCE):
+    """Shared index, loaded on first use"""
+    global _index
+    if _index is None:
+        _index = ProviderIndex.load(path)
+    return _index
+
+
+def classify(domain, mx_hosts=()):
+    return get_index().classify(domain, mx_hosts)
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: mail_providers.py <domain> [mx host ...]")
+        return
+    if len(args) == 1:
+        # No hosts given: look them up like the analyzers do
+        try:
+            from dns_tools import get_resolver
+            args += [str(r.exchange) for r in get_resolver().resolve(args[0], 'MX')]
+        except Exception as e:
+            print(f"⚠️  MX lookup failed: {e}")
+    print(f"{args[0]}: {classify(args[0], args[1:])}")
+
+
+if __name__ == "__main__":
+    main()
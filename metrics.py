@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+📈 Stage Metrics
+Counters and latency histograms for analysis stages,
+exportable as Prometheus text or a JSON snapshot
+"""
+
+import os
+import time
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from functools import wraps
+
+import serialize
+
+STAGE_SECONDS = 'osint_stage_duration_seconds'
+STAGE_TOTAL = 'osint_stage_total'
+
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    STAGE_SECONDS: ('histogram', 'Time spent per analysis stage'),
+    STAGE_TOTAL: ('counter', 'Stage executions by outcome'),
+}
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bucket bound containing the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._stages = {}
+        self._acquire, self._release = self._lock.acquire, self._lock.release
+        self.started = datetime.now()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def _stage_entry(self, stage, outcome):
+        key = self._key(STAGE_SECONDS, {'stage': stage})
+        counter_key = self._key(STAGE_TOTAL, {'stage': stage, 'outcome': outcome})
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            entry = self._stages[(stage, outcome)] = (histogram, counter_key)
+        return entry
+
+    def record_stage(self, stage, seconds, outcome='ok'):
+        # Stage timers are always on, so this path avoids per-call key building,
+        # method calls and the with-statement; nothing inside the lock can raise
+        entry = self._stages.get((stage, outcome)) or self._stage_entry(stage, outcome)
+        histogram, counter_key = entry
+        counters = self.counters
+        self._acquire()
+        histogram.counts[bisect_left(histogram.buckets, seconds)] += 1
+        histogram.sum += seconds
+        histogram.count += 1
+        counters[counter_key] = counters.get(counter_key, 0) + 1
+        self._release()
+
+    def has_data(self):
+        return bool(self.counters or self.gauges or self.histograms)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self._stages.clear()
+            self.started = datetime.now()
+
+    def stage_summary(self):
+        """Rows of (stage, count, total_s, mean_ms, p50_ms, p95_ms), slowest total first"""
+        rows = []
+        with self._lock:
+            for (name, labels), h in self.histograms.items():
+                if name != STAGE_SECONDS:
+                    continue
+                stage = dict(labels).get('stage', '')
+                mean = h.sum / h.count if h.count else 0.0
+                rows.append((stage, h.count, h.sum, mean * 1000,
+                             h.quantile(0.5) * 1000, h.quantile(0.95) * 1000))
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def snapshot(self):
+        """JSON-serializable view of every metric"""
+        def labelled(key):
+            return {'name': key[0], 'labels': dict(key[1])}
+
+        with self._lock:
+            return {
+                'started': self.started.isoformat(),
+                'exported': datetime.now().isoformat(),
+                'counters': [dict(labelled(k), value=v) for k, v in self.counters.items()],
+                'gauges': [dict(labelled(k), value=v) for k, v in self.gauges.items()],
+                'histograms': [
+                    dict(labelled(k), buckets=list(h.buckets), counts=list(h.counts),
+                         sum=h.sum, count=h.count)
+                    for k, h in self.histograms.items()
+                ],
+            }
+
+    def to_prometheus(self):
+        """Render metrics in the Prometheus text exposition format"""
+        def fmt_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+        lines = []
+        typed = set()
+
+        def header(name, default_type):
+            if name not in typed:
+                kind, text = HELP.get(name, (default_type, name))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+                typed.add(name)
+
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, 'counter')
+                lines.append(f"{name}{fmt_labels(labels)} {value}")
+
+            for (name, labels), value in sorted(self.gauges.items()):
+                header(name, 'gauge')
+                lines.append(f"{name}{fmt_labels(labels)} {value}")
+
+            for (name, labels), h in sorted(self.histograms.items()):
+                header(name, 'histogram')
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{fmt_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_bucket{fmt_labels(labels, [('le', '+Inf')])} {h.count}")
+                lines.append(f"{name}_sum{fmt_labels(labels)} {h.sum:.6f}")
+                lines.append(f"{name}_count{fmt_labels(labels)} {h.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, directory='logs', formats=None):
+        """Write metrics files into directory; returns the written paths"""
+        formats = formats or os.environ.get('OSINT_METRICS_FORMAT', 'json,prom')
+        formats = [f.strip() for f in formats.split(',') if f.strip()]
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        written = []
+
+        if 'prom' in formats:
+            path = os.path.join(directory, f'metrics_{timestamp}.prom')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            written.append(path)
+
+        if 'json' in formats:
+            path = os.path.join(directory, f'metrics_{timestamp}.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                serialize.dump(self.snapshot(), f, pretty=True)
+            written.append(path)
+
+        return written
+
+
+REGISTRY = MetricsRegistry()
+
+
+class timed:
+    """Time a stage as a context manager or decorator"""
+
+    __slots__ = ('stage', 'registry', '_start')
+
+    def __init__(self, stage, registry=None):
+        self.stage = stage
+        self.registry = registry or REGISTRY
+
+    def __call__(self, func):
+        stage, record = self.stage, self.registry.record_stage
+        clock = time.perf_counter
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(stage, clock() - start, 'error')
+                raise
+            record(stage, clock() - start)
+            return result
+
+        return wrapper
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.record_stage(
+            self.stage,
+            time.perf_counter() - self._start,
+            'error' if exc_type else 'ok',
+        )
+        return False
+
+
+def inc(name, value=1, **labels):
+    REGISTRY.inc(name, value, **labels)
+
+
+def set_gauge(name, value, **labels):
+    REGISTRY.set_gauge(name, value, **labels)
+
+
+def print_stage_summary(registry=None):
+    """Print a stage timing table"""
+    rows = (registry or REGISTRY).stage_summary()
+    if not rows:
+        print("  No stage timings recorded yet")
+        return
+
+    print(f"  {'Stage':18} {'Count':>7} {'Total s':>9} {'Mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for stage, count, total, mean, p50, p95 in rows:
+        print(f"  {stage:18} {count:>7} {total:>9.3f} {mean:>9.2f} {p50:>8.1f} {p95:>8.1f}")
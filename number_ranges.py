@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+📶 Number Range Table
+Longest-prefix operator/region lookup for E.164 numbers
+
+Ranges are digit prefixes of the full international number (no '+').
+They are compiled into a sorted array of packed keys with a parent index
+per entry, so a lookup is one bisect plus a short walk up the prefix
+chain, and the compiled table loads straight from a binary file. The
+file header records the phonenumbers version its bundled ranges came
+from, so upgrading phonenumbers rebuilds the table.
+
+    python number_ranges.py build [--no-phonenumbers] [csv ...]
+    python number_ranges.py lookup +94701234567
+"""
+
+import os
+import re
+import sys
+import csv
+import time
+import struct
+import tempfile
+from array import array
+from bisect import bisect_right
+
+MAGIC = b'ONR2'
+HEADER = struct.Struct('<4sII16s')  # magic, entries, label bytes, phonenumbers version
+MAX_DIGITS = 15
+LENGTH_BITS = 4
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_SOURCE = os.path.join(DATA_DIR, 'number_ranges.csv')
+DEFAULT_COMPILED = os.path.join(DATA_DIR, 'number_ranges.bin')
+
+_NON_DIGITS = re.compile(r'\D')
+_POW10 = [10 ** n for n in range(MAX_DIGITS + 1)]
+
+
+def _pack(prefix):
+    """Digits -> integer that sorts like the string, shorter prefixes first"""
+    return (int(prefix.ljust(MAX_DIGITS, '0')) << LENGTH_BITS) | len(prefix)
+
+
+def _digits(number):
+    number = str(number)
+    if not number.isdigit():
+        # E164 input ('+' then digits) is the common case and needs no regex
+        stripped = number[1:] if number[:1] == '+' else number
+        number = stripped if stripped.isdigit() else _NON_DIGITS.sub('', number)
+    return number[:MAX_DIGITS]
+
+
+def read_csv(path):
+    """Yield (prefix, operator, region) rows from a ranges CSV"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith('#') or row[0] == 'prefix':
+                continue
+            prefix = _digits(row[0])
+            if prefix:
+                operator = row[1].strip() if len(row) > 1 else ''
+                region = row[2].strip() if len(row) > 2 else ''
+                yield prefix, operator, region
+
+
+def phonenumbers_version():
+    """Installed phonenumbers version, '' when it is missing"""
+    try:
+        import phonenumbers
+    except ImportError:
+        return ''
+    return phonenumbers.__version__
+
+
+def phonenumbers_ranges():
+    """Carrier and geocoding prefixes bundled with phonenumbers"""
+    from phonenumbers.carrierdata import CARRIER_DATA
+    from phonenumbers.geodata import GEOCODE_DATA
+
+    for prefix, names in CARRIER_DATA.items():
+        yield prefix, names.get('en', ''), ''
+    for prefix, names in GEOCODE_DATA.items():
+        yield prefix, '', names.get('en', '')
+
+
+class NumberRangeTable:
+    def __init__(self, keys, parents, operators, regions, labels, version=''):
+        self.keys = keys
+        self.parents = parents
+        self.operators = operators
+        self.regions = regions
+        self.labels = labels
+        self.version = version
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def compile(cls, rows, version=''):
+        """Build a table from (prefix, operator, region) rows; later rows win per field
+
+        version is the phonenumbers version the rows include data from, if any.
+        """
+        merged = {}
+        for prefix, operator, region in rows:
+            old_operator, old_region = merged.get(prefix, ('', ''))
+            merged[prefix] = (operator or old_operator, region or old_region)
+
+        labels = ['']
+        label_ids = {'': 0}
+
+        def label_id(text):
+            if text not in label_ids:
+                label_ids[text] = len(labels)
+                labels.append(text)
+            return label_ids[text]
+
+        keys, parents = array('Q'), array('i')
+        operators, regions = array('I'), array('I')
+        stack = []
+
+        # Sorted order visits every prefix right after its ancestors
+        for prefix in sorted(merged):
+            while stack and not prefix.startswith(stack[-1][1]):
+                stack.pop()
+            parents.append(stack[-1][0] if stack else -1)
+            stack.append((len(keys), prefix))
+
+            operator, region = merged[prefix]
+            keys.append(_pack(prefix))
+            operators.append(label_id(operator))
+            regions.append(label_id(region))
+
+        return cls(keys, parents, operators, regions, labels, version)
+
+    def save(self, path):
+        blob = '\n'.join(self.labels).encode('utf-8')
+        # A unique temp file per writer: concurrent builds never share one
+        fd, tmp = tempfile.mkstemp(prefix='.number_ranges-', suffix='.tmp',
+                                   dir=os.path.dirname(path) or '.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, len(self.keys), len(blob), self.version.encode('ascii')))
+                for column in (self.keys, self.parents, self.operators, self.regions):
+                    column.tofile(f)
+                f.write(blob)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def compiled_version(path):
+        """phonenumbers version recorded in a compiled file, None if it is not a current table"""
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            return None
+        return HEADER.unpack(header)[3].rstrip(b'\0').decode('ascii')
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        magic, count, blob_size, version = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a compiled number range table")
+
+        view = memoryview(data)[HEADER.size:]
+        columns = []
+        for typecode in ('Q', 'i', 'I', 'I'):
+            column = array(typecode)
+            size = count * column.itemsize
+            column.frombytes(view[:size])
+            view = view[size:]
+            columns.append(column)
+
+        labels = bytes(view[:blob_size]).decode('utf-8').split('\n')
+        return cls(*columns, labels, version.rstrip(b'\0').decode('ascii'))
+
+    def lookup(self, number):
+        """Return (prefix, operator, region) for the longest matching range, or None"""
+        digits = _digits(number)
+        if not digits:
+            return None
+
+        padded = int(digits.ljust(MAX_DIGITS, '0'))
+        keys, parents = self.keys, self.parents
+        index = bisect_right(keys, (padded << LENGTH_BITS) | MAX_DIGITS) - 1
+
+        # The longest match is the nearest ancestor of the closest key below
+        while index >= 0:
+            key = keys[index]
+            length = key & 0xF
+            scale = _POW10[MAX_DIGITS - length]
+            if length <= len(digits) and padded // scale == (key >> LENGTH_BITS) // scale:
+                break
+            index = parents[index]
+        else:
+            return None
+
+        prefix = digits[:self.keys[index] & 0xF]
+        operator = region = ''
+        while index >= 0 and not (operator and region):
+            operator = operator or self.labels[self.operators[index]]
+            region = region or self.labels[self.regions[index]]
+            index = parents[index]
+        return prefix, operator, region
+
+    def lookup_many(self, numbers):
+        """Lookup a batch of numbers, yielding results in order"""
+        lookup = self.lookup
+        for number in numbers:
+            yield lookup(number)
+
+
+def build(sources=None, include_phonenumbers=True, output=DEFAULT_COMPILED):
+    """Compile CSV sources (and optionally phonenumbers data) to a binary table"""
+    rows = []
+    version = ''
+    if include_phonenumbers:
+        try:
+            rows.extend(phonenumbers_ranges())
+            version = phonenumbers_version()
+        except ImportError:
+            pass
+
+    # Local data files override the bundled ranges
+    for source in sources or [DEFAULT_SOURCE]:
+        if os.path.exists(source):
+            rows.extend(read_csv(source))
+
+    table = NumberRangeTable.compile(rows, version)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    table.save(output)
+    return table
+
+
+_table = None
+
+
+def get_table(path=DEFAULT_COMPILED, source=DEFAULT_SOURCE):
+    """Shared table, rebuilt when missing, older than the source CSV or
+    compiled from another phonenumbers version
+
+    Tables built without phonenumbers data record no version and are only
+    rebuilt for the CSV.
+    """
+    global _table
+    if _table is None:
+        stale = not os.path.exists(path) or (
+            os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(path))
+        if not stale:
+            version = NumberRangeTable.compiled_version(path)
+            stale = version is None or (version and version != phonenumbers_version())
+        _table = build([source], output=path) if stale else NumberRangeTable.load(path)
+    return _table
+
+
+def main():
+    usage = "Usage: number_ranges.py build [--no-phonenumbers] [csv ...] | lookup <number> ..."
+    args = sys.argv[1:]
+    if not args:
+        print(usage)
+        return
+
+    if args[0] == 'build':
+        sources = [a for a in args[1:] if not a.startswith('--')]
+        start = time.time()
+        table = build(sources or None, include_phonenumbers='--no-phonenumbers' not in args)
+        print(f"✅ Compiled {len(table)} ranges to {DEFAULT_COMPILED} in {time.time() - start:.1f}s")
+    elif args[0] == 'lookup':
+        table = get_table()
+        for number in args[1:]:
+            match = table.lookup(number)
+            if match:
+                prefix, operator, region = match
+                print(f"{number}: +{prefix} | {operator or 'Unknown operator'} | {region or 'Unknown region'}")
+            else:
+                print(f"{number}: no matching range")
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
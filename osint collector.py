@@ -6,7 +6,6 @@ Educational & Authorized Use Only
 
 import os
 import sys
-import json
 import time
 import logging
 from datetime import datetime, timedelta
@@ -15,7 +14,24 @@ import hashlib
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import metrics
+import profiling
+import serialize
+import secure_store
+import phone_normalize
+from report_store import count_reports, has_flat_reports, iter_report_entries, iter_reports, migrate_reports
+from report_writer import flush_writer, get_writer
+from result_cache import get_cache
+from batch_jobs import BatchJob, list_jobs, make_job_id
+from dedup import ascii_email, canonical, canonical_email
+from platforms import get_registry
+from freshness import get_scheduler, report_domains, reset_scheduler
+from profiling import profiled
+from work_queue import DEFAULT_QUEUE, WorkQueue, Worker
+
 class OSINTCollector:
+    REPORT_LISTING_LIMIT = 50
+
     def __init__(self):
         self.version = "2.0"
         self.author = "OSINT Research Team"
@@ -44,18 +60,23 @@ class OSINTCollector:
         
     def setup_directories(self):
         """Create necessary directories"""
-        directories = ['reports', 'exports', 'cache', 'tmp']
+        directories = ['reports', 'exports', 'cache', 'tmp', 'jobs']
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
+
+        # Reports saved before sharding move into reports/<type>/<date>/
+        if has_flat_reports():
+            self.logger.info(f"Migrated {migrate_reports()} reports into sharded layout")
             
     def check_dependencies(self):
         """Verify all required packages are installed"""
         required = ['phonenumbers', 'requests', 'dnspython', 'cryptography']
+        import_names = {'dnspython': 'dns'}
         missing = []
         
         for package in required:
             try:
-                __import__(package.replace('-', '_'))
+                __import__(import_names.get(package, package.replace('-', '_')))
                 self.logger.info(f"✓ {package} loaded")
             except ImportError:
                 missing.append(package)
@@ -145,34 +166,32 @@ class OSINTCollector:
             print("4. 🌐 Domain & Website Recon")
             print("5. 📱 Social Media Lookup")
             print("6. 📄 Generate Comprehensive Report")
-            print("7. ⚙️  Settings & Configuration")
-            print("8. 📖 View Documentation")
-            print("9. 🚪 Exit")
+            print("7. 📦 Batch Analysis (resumable)")
+            print("8. ⚙️  Settings & Configuration")
+            print("9. 📖 View Documentation")
+            print("10. 🚪 Exit")
             print("═" * 70)
             
             try:
-                choice = input("\n➤ Select option (1-9): ").strip()
+                choice = input("\n➤ Select option (1-10): ").strip()
                 
-                if choice == '1':
-                    self.phone_intelligence()
-                elif choice == '2':
-                    self.email_analysis()
-                elif choice == '3':
-                    self.username_investigation()
-                elif choice == '4':
-                    self.domain_recon()
-                elif choice == '5':
-                    self.social_media_lookup()
-                elif choice == '6':
-                    self.generate_report()
-                elif choice == '7':
-                    self.settings_menu()
-                elif choice == '8':
-                    self.show_documentation()
-                elif choice == '9':
-                    self.exit_program()
-                else:
+                actions = {
+                    '1': self.phone_intelligence,
+                    '2': self.email_analysis,
+                    '3': self.username_investigation,
+                    '4': self.domain_recon,
+                    '5': self.social_media_lookup,
+                    '6': self.generate_report,
+                    '7': self.batch_analysis,
+                    '8': self.settings_menu,
+                    '9': self.show_documentation,
+                    '10': self.exit_program,
+                }
+                action = actions.get(choice)
+                if action is None:
                     print("❌ Invalid selection")
+                    continue
+                action()
                     
             except KeyboardInterrupt:
                 print("\n\n⚠️  Interrupted by user")
@@ -189,7 +208,6 @@ class OSINTCollector:
         
         try:
             import phonenumbers
-            from phonenumbers import carrier, geocoder, timezone
             
             phone = input("\n➤ Enter phone number (with country code): ").strip()
             
@@ -203,35 +221,19 @@ class OSINTCollector:
             
             # Format phone
             original = phone
-            if phone.startswith('0'):
-                phone = '+94' + phone[1:]  # Default Sri Lanka
-            elif not phone.startswith('+'):
-                phone = '+' + phone
+            phone = self.normalize_phone_input(phone)
                 
             print(f"\n🔍 Analyzing: {phone}")
             print("─" * 40)
             
-            # Parse and validate
-            parsed = phonenumbers.parse(phone, None)
+            # Parse, validate and extract information
+            with profiled('phone_intelligence'):
+                info = self.cached_analysis('phone', original, lambda: self.analyze_phone(original))
             
-            if not phonenumbers.is_valid_number(parsed):
+            if info is None:
                 print("❌ Invalid phone number")
                 return
                 
-            # Extract information
-            info = {
-                'original': original,
-                'formatted': phone,
-                'national': phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL),
-                'international': phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
-                'country': geocoder.description_for_number(parsed, 'en'),
-                'carrier': carrier.name_for_number(parsed, 'en') or 'Unknown',
-                'timezone': timezone.time_zones_for_number(parsed),
-                'type': self.get_number_type(phonenumbers.number_type(parsed)),
-                'valid': True,
-                'timestamp': datetime.now().isoformat()
-            }
-            
             # Display results
             print(f"\n✅ VALID PHONE NUMBER DETECTED")
             print(f"📱 National Format: {info['national']}")
@@ -259,6 +261,48 @@ class OSINTCollector:
             print(f"❌ Analysis error: {e}")
             self.logger.error(f"Phone analysis error: {e}")
             
+    def normalize_phone_input(self, phone):
+        """Add a country code to user input"""
+        normalized = phone_normalize.normalize(phone)
+        if normalized.e164:
+            return normalized.e164
+        return phone if phone.startswith('+') else '+' + phone
+        
+    def analyze_phone(self, phone):
+        """Parse and enrich a phone number, None if invalid"""
+        import phonenumbers
+        from phonenumbers import carrier, geocoder, timezone
+        
+        original = phone
+        with metrics.timed('phone_normalize'):
+            normalized = phone_normalize.normalize(phone)
+        
+        # Obvious garbage never reaches the full parser
+        if normalized.status == phone_normalize.INVALID:
+            return None
+        phone = normalized.e164
+        
+        with metrics.timed('phone_parse'):
+            parsed = phonenumbers.parse(phone, None)
+            valid = phonenumbers.is_valid_number(parsed)
+        
+        if not valid:
+            return None
+            
+        with metrics.timed('phone_metadata'):
+            return {
+                'original': original,
+                'formatted': phone,
+                'national': phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL),
+                'international': phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
+                'country': geocoder.description_for_number(parsed, 'en'),
+                'carrier': carrier.name_for_number(parsed, 'en') or 'Unknown',
+                'timezone': timezone.time_zones_for_number(parsed),
+                'type': self.get_number_type(phonenumbers.number_type(parsed)),
+                'valid': True,
+                'timestamp': datetime.now().isoformat()
+            }
+        
     def get_number_type(self, num_type):
         """Convert numeric type to readable format"""
         types = {
@@ -278,11 +322,9 @@ class OSINTCollector:
         
     def generate_phone_patterns(self, phone):
         """Generate email patterns from phone"""
-        clean = phone.replace('+', '').replace(' ', '')
-        
-        # Remove country code if present
-        if clean.startswith('94'):
-            clean = clean[2:]  # Sri Lanka
+        # National number, without the country code
+        normalized = phone_normalize.normalize(phone)
+        clean = normalized.national or phone.replace('+', '').replace(' ', '')
         
         print(f"\n📧 POSSIBLE EMAIL PATTERNS:")
         print(f"  • {clean}@gmail.com")
@@ -300,9 +342,8 @@ class OSINTCollector:
         filename = f"reports/phone_{timestamp}.json"
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(info, f, indent=2, default=str)
-                
+            filename = get_writer().save(filename, info)
+
             print(f"✅ Report saved: {filename}")
             self.logger.info(f"Phone report saved: {filename}")
             
@@ -331,7 +372,8 @@ class OSINTCollector:
         print(f"\n🔍 Analyzing: {email}")
         print("─" * 40)
         
-        # Validate format
+        # Validate format (IDN domains are checked in punycode form)
+        email = ascii_email(email)
         email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         
         if not re.match(email_regex, email):
@@ -340,22 +382,17 @@ class OSINTCollector:
             
         username, domain = email.split('@')
         
-        # Check disposable emails
-        disposable = self.is_disposable_email(domain)
+        mailbox = canonical_email(email)
+        if mailbox != email:
+            print(f"🔗 Canonical mailbox: {mailbox}")
         
-        # Check MX records
-        mx_info = self.check_mx_records(domain)
-        
-        # Generate report
-        info = {
-            'email': email,
-            'username': username,
-            'domain': domain,
-            'disposable': disposable,
-            'mx_records': mx_info,
-            'social_profiles': self.generate_social_links(username),
-            'timestamp': datetime.now().isoformat()
-        }
+        # Disposable check, MX records and social links (cached per mailbox)
+        with profiled('email_analysis'):
+            info = self.cached_analysis('email', email, lambda: self.analyze_email(email),
+                                        store=self.email_complete)
+        info = self.restamp_email(info, email)
+        disposable = info['disposable']
+        mx_info = info['mx_records']
         
         # Display results
         print(f"\n✅ EMAIL ANALYSIS COMPLETE")
@@ -380,6 +417,58 @@ class OSINTCollector:
         if save == 'y':
             self.save_email_report(info)
             
+    def analyze_email(self, email):
+        """Build the email analysis result"""
+        username, domain = email.split('@')
+        return {
+            'email': email,
+            'username': username,
+            'domain': domain,
+            'disposable': self.is_disposable_email(domain),
+            'mx_records': self.check_mx_records(domain),
+            'social_profiles': self.generate_social_links(username),
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    def restamp_email(self, info, email):
+        """A cached email result under the spelling that was asked for
+        
+        Cache entries are shared by every spelling of a mailbox, so a hit may
+        carry another spelling's address, username and profile links.
+        """
+        if 'error' in info or info['email'] == email:
+            return info
+        username, domain = email.split('@')
+        return dict(info, email=email, username=username, domain=domain,
+                    social_profiles=self.generate_social_links(username))
+        
+    def restamp(self, analysis, target, result):
+        """A shared result (cache hit or duplicate spelling) for the target as it was given"""
+        if not isinstance(result, dict) or 'error' in result:
+            return result
+        if analysis == 'email':
+            return self.restamp_email(result, ascii_email(target.strip().lower()))
+        if analysis == 'phone' and result['original'] != target:
+            return dict(result, original=target)
+        return result
+        
+    def cached_analysis(self, analysis, target, compute, store=None, verbose=True):
+        """Return a fresh cached result, or compute one and cache it"""
+        cache = get_cache()
+        entry = cache.get_entry(analysis, target)
+        if entry is not None:
+            if verbose:
+                print(f"♻️  Cached result from {int(cache.age(entry) // 60)} min ago")
+            return entry['result']
+            
+        result = compute()
+        if result is not None and (store is None or store(result)):
+            try:
+                cache.put(analysis, target, result)
+            except Exception as e:
+                self.logger.warning(f"Cache write failed: {e}")
+        return result
+        
     def is_disposable_email(self, domain):
         """Check if email domain is disposable"""
         disposable_domains = [
@@ -390,34 +479,71 @@ class OSINTCollector:
         
         return any(d in domain.lower() for d in disposable_domains)
         
-    def check_mx_records(self, domain):
+    def check_mx_records(self, domain, deadline=None):
         """Check domain MX records"""
         try:
-            import dns.resolver
+            from dns_tools import AUTHORITATIVE_ERRORS, get_resolver
             
             mx_info = {
                 'has_mx': False,
-                'servers': []
+                'servers': [],
+                'degraded': False,
+                'failed': False
             }
             
-            answers = dns.resolver.resolve(domain, 'MX')
+            with metrics.timed('dns_mx'):
+                answers = get_resolver().resolve(domain, 'MX', deadline)
             mx_info['has_mx'] = True
-            mx_info['servers'] = [str(r.exchange) for r in answers]
+            # Preference order, so a reshuffled answer doesn't look like a change
+            mx_info['servers'] = [str(r.exchange) for r in sorted(answers, key=lambda r: (r.preference, str(r.exchange)))]
+            mx_info['ttl'] = answers.rrset.ttl
+            self.record_freshness(domain, mx_info['ttl'])
             
             return mx_info
             
-        except:
-            return {'has_mx': False, 'servers': []}
+        except Exception as e:
+            # A definite "no MX" (NXDOMAIN/NoAnswer) is cached like any answer; anything
+            # else (SERVFAIL, no reachable nameserver, deadline) is failed and never cached
+            failed = not isinstance(e, AUTHORITATIVE_ERRORS)
+            self.record_freshness(domain, None, ok=not failed)
+            # Deadline hits are flagged so "no MX" and "ran out of time" stay distinguishable
+            return {'has_mx': False, 'servers': [], 'degraded': getattr(e, 'degraded', False),
+                    'failed': failed}
+            
+    def record_freshness(self, domain, ttl, ok=True):
+        """Note when domain's DNS data expires, for the freshness scheduler"""
+        try:
+            get_scheduler().observe(domain, ttl, ok)
+        except Exception as e:
+            self.logger.warning(f"Freshness tracking failed: {e}")
+            
+    def refresh_domain(self, domain):
+        """Re-verify one expired domain; returns True if its data changed"""
+        recon = self.lookup_domain(domain)
+        if not self.recon_complete(recon):
+            return False
+        return get_cache().put('domain', domain, recon)
+        
+    def refresh_expired(self, budget=None, seed=False):
+        """Re-verify expired domains within a DNS query budget"""
+        from dns_tools import get_resolver
+        
+        scheduler = get_scheduler()
+        if seed:
+            added = scheduler.seed(report_domains(iter_reports()))
+            print(f"🌱 Tracking {added} more domains from saved reports")
+            
+        resolver = get_resolver()
+        print(f"\n⏳ Refreshing expired domains ({scheduler.count_due()} due)...")
+        stats = scheduler.refresh(self.refresh_domain, budget, queries=lambda: resolver.stats['queries'])
+        print(f"✅ Refreshed {stats['refreshed']} domains with {stats['queries']} queries, "
+              f"{stats['changed']} changed, {stats['remaining']} still due")
+        self.logger.info(f"Freshness refresh: {stats}")
+        return stats
             
     def generate_social_links(self, username):
         """Generate social media profile links"""
-        return {
-            'Twitter': f"https://twitter.com/{username}",
-            'Instagram': f"https://instagram.com/{username}",
-            'GitHub': f"https://github.com/{username}",
-            'Reddit': f"https://reddit.com/user/{username}",
-            'LinkedIn': f"https://linkedin.com/in/{username}"
-        }
+        return get_registry().links(username)
         
     def save_email_report(self, info):
         """Save email analysis report"""
@@ -425,9 +551,8 @@ class OSINTCollector:
         filename = f"reports/email_{timestamp}.json"
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(info, f, indent=2, default=str)
-                
+            filename = get_writer().save(filename, info)
+
             print(f"✅ Report saved: {filename}")
             self.logger.info(f"Email report saved: {filename}")
             
@@ -454,18 +579,8 @@ class OSINTCollector:
         print("─" * 40)
         
         # Platform list for checking
-        platforms = {
-            'Twitter': f"https://twitter.com/{username}",
-            'Instagram': f"https://instagram.com/{username}",
-            'GitHub': f"https://github.com/{username}",
-            'Reddit': f"https://reddit.com/user/{username}",
-            'Pinterest': f"https://pinterest.com/{username}",
-            'TikTok': f"https://tiktok.com/@{username}",
-            'Twitch': f"https://twitch.tv/{username}",
-            'YouTube': f"https://youtube.com/@{username}",
-            'Steam': f"https://steamcommunity.com/id/{username}",
-            'Spotify': f"https://open.spotify.com/user/{username}"
-        }
+        with profiled('username_investigation'):
+            platforms = self.generate_social_links(username)
         
         print("\n🌐 PLATFORM LINKS:")
         for platform, url in platforms.items():
@@ -494,9 +609,8 @@ class OSINTCollector:
         }
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
-                
+            filename = get_writer().save(filename, report)
+
             print(f"✅ Report saved: {filename}")
             self.logger.info(f"Username report saved: {filename}")
             
@@ -525,23 +639,43 @@ class OSINTCollector:
         
         # Basic DNS check
         try:
-            import dns.resolver
+            with profiled('domain_recon'):
+                recon = self.cached_analysis('domain', domain, lambda: self.lookup_domain(domain),
+                                             store=self.recon_complete)
+                auth = self.cached_analysis('spf', domain, lambda: self.lookup_email_auth(domain),
+                                            store=self.email_auth_complete)
+            mx_info = recon['mx_records']
             
             print("\n🔗 DNS INFORMATION:")
             
-            # Check A record
-            try:
-                answers = dns.resolver.resolve(domain, 'A')
-                print(f"  • A Records: {', '.join([str(r) for r in answers])}")
-            except:
-                print(f"  • A Records: Not found")
+            if recon['a_records']:
+                print(f"  • A Records: {', '.join(recon['a_records'])}")
+            else:
+                print(f"  • A Records: {'Timed out' if recon['a_degraded'] else 'Not found'}")
                 
-            # Check MX records
-            mx_info = self.check_mx_records(domain)
             if mx_info['has_mx']:
                 print(f"  • MX Records: Found ({len(mx_info['servers'])})")
             else:
-                print(f"  • MX Records: Not found")
+                print(f"  • MX Records: {'Timed out' if mx_info['degraded'] else 'Not found'}")
+                
+            if recon['degraded']:
+                print(f"  ⏱️  Some lookups hit the {recon['budget']:.1f}s budget")
+                
+            spf, dmarc = auth['spf'], auth['dmarc']
+            
+            print("\n🛡️ EMAIL AUTHENTICATION:")
+            if spf['record']:
+                print(f"  • SPF: {spf['status']} ({spf['lookups']}/10 DNS lookups, {spf['all'] or 'no all'})")
+                if spf['includes']:
+                    print(f"    Includes: {', '.join(spf['includes'])}")
+                for error in spf['errors']:
+                    print(f"    ⚠️  {error}")
+            else:
+                print(f"  • SPF: {'Timed out' if spf['status'] == 'temperror' else 'Not found'}")
+            if dmarc['record']:
+                print(f"  • DMARC: p={dmarc['policy']} (subdomains {dmarc['subdomain_policy']}, {dmarc['pct']}%)")
+            else:
+                print(f"  • DMARC: {'Timed out' if dmarc['status'] == 'temperror' else 'Not found'}")
                 
         except ImportError:
             print("❌ DNS module not available")
@@ -552,6 +686,213 @@ class OSINTCollector:
         print(f"  • http://www.{domain}")
         print(f"  • https://www.{domain}")
         
+    def lookup_domain(self, domain):
+        """A and MX lookups for a domain under one shared DNS budget"""
+        from dns_tools import AUTHORITATIVE_ERRORS, get_resolver
+        
+        resolver = get_resolver()
+        deadline = resolver.budget()
+        a_records, a_degraded, a_failed = [], False, False
+        
+        try:
+            with metrics.timed('dns_a'):
+                answers = resolver.resolve(domain, 'A', deadline)
+            a_records = [str(r) for r in answers]
+        except Exception as e:
+            a_degraded = getattr(e, 'degraded', False)
+            a_failed = not isinstance(e, AUTHORITATIVE_ERRORS)
+            
+        mx_info = self.check_mx_records(domain, deadline)
+        return {
+            'domain': domain,
+            'a_records': a_records,
+            'a_degraded': a_degraded,
+            'mx_records': mx_info,
+            'degraded': a_degraded or mx_info['degraded'],
+            'failed': a_failed or mx_info['failed'],
+            'budget': resolver.config.target_budget,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    def lookup_email_auth(self, domain):
+        """SPF include chain and DMARC policy; includes are shared across the run"""
+        from spf import get_auditor
+        
+        with metrics.timed('spf_audit'):
+            return get_auditor().audit_domain(domain)
+        
+    @staticmethod
+    def email_complete(info):
+        """Cacheable: the MX lookup got an answer or a definite NXDOMAIN/NoAnswer"""
+        return 'error' not in info and not info['mx_records']['failed']
+        
+    @staticmethod
+    def recon_complete(recon):
+        return not recon['failed']
+        
+    @staticmethod
+    def email_auth_complete(auth):
+        return 'temperror' not in (auth['spf']['status'], auth['dmarc']['status'])
+        
+    def batch_analyzers(self):
+        """Non-interactive analyzer and cache policy per batch analysis type"""
+        return {
+            'phone': (self.analyze_phone, None),
+            'email': (self.analyze_email_target, self.email_complete),
+            'domain': (self.lookup_domain, self.recon_complete),
+            'spf': (self.lookup_email_auth, self.email_auth_complete),
+        }
+        
+    def analyze_email_target(self, email):
+        """Validate and analyze one email address from a batch"""
+        import re
+        
+        email = ascii_email(email.strip().lower())
+        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+            return {'email': email, 'error': 'Invalid email format'}
+        return self.analyze_email(email)
+        
+    def run_batch_job(self, analysis, input_path, job_id=None, progress=None):
+        """Run (or resume) a batch job, consulting the result cache per target"""
+        job = BatchJob(analysis, input_path, job_id)
+        with profiled(f"batch_{job.job_id}"):
+            stats = job.run(lambda target: self.analyze_target(analysis, target), progress,
+                            canonical=lambda target: canonical(analysis, target),
+                            restamp=lambda target, result: self.restamp(analysis, target, result))
+        return job, stats
+        
+    def analyze_target(self, analysis, target):
+        """Quietly analyze one target through the result cache"""
+        analyze, store = self.batch_analyzers()[analysis]
+        result = self.cached_analysis(analysis, target, lambda: analyze(target), store, verbose=False)
+        return self.restamp(analysis, target, result)
+        
+    def batch_analysis(self):
+        """Bulk analysis from a file with checkpointed, resumable progress"""
+        print("\n" + "─" * 70)
+        print("📦 BATCH ANALYSIS")
+        print("─" * 70)
+        
+        jobs = list_jobs()
+        if jobs:
+            print("\n📋 Existing jobs:")
+            for job in jobs[-10:]:
+                print(f"  • {job['job_id']}: {job['analysis']}, {job['completed']} done ({job['input']})")
+                
+        analysis = input("\n➤ Analysis type (phone/email/domain/spf): ").strip().lower()
+        if analysis not in self.batch_analyzers():
+            print("❌ Unknown analysis type")
+            return
+            
+        input_path = input("➤ Input file (one target per line): ").strip()
+        if not os.path.isfile(input_path):
+            print("❌ Input file not found")
+            return
+            
+        job_id = input("➤ Job ID (blank for default): ").strip() or None
+        self.start_batch(analysis, input_path, job_id)
+        
+    def start_batch(self, analysis, input_path, job_id=None):
+        """Run a batch job with progress output; Ctrl-C keeps completed work"""
+        job_id = job_id or make_job_id(analysis, input_path)
+        print(f"\n📦 Job ID: {job_id}")
+        
+        def progress(job, target):
+            if job.stats['done'] % 100 == 0:
+                print(f"  ⏳ {job.stats['done']} analyzed this run ({job.completed} total)")
+                
+        try:
+            job, stats = self.run_batch_job(analysis, input_path, job_id, progress)
+        except KeyboardInterrupt:
+            print("\n⚠️  Batch interrupted - completed targets are checkpointed")
+            print(f"💡 Rerun with job ID {job_id} to resume")
+            self.logger.info(f"Batch {analysis} interrupted: {input_path}")
+            return
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+            
+        print(f"\n✅ Batch {job.job_id} complete")
+        print(f"📊 {stats['done']} analyzed ({stats['duplicates']} duplicate spellings), "
+              f"{stats['skipped']} already done, {stats['errors']} errors")
+        print(f"📁 Results: {job.directory}")
+        self.logger.info(f"Batch {job.job_id}: {stats}")
+        
+    def queue_command(self, args):
+        """enqueue / worker / status / export commands for the shared work queue"""
+        usage = ("Usage: --queue enqueue <phone|email|domain|spf> <file> | worker [--processes N] | "
+                 "status [--watch] | export  [--name QUEUE]")
+        name = args[args.index('--name') + 1] if '--name' in args else DEFAULT_QUEUE
+        command = args[0] if args else None
+        queue = WorkQueue(queue=name)
+        
+        if command == 'enqueue':
+            if len(args) < 3 or args[1] not in self.batch_analyzers() or not os.path.isfile(args[2]):
+                print(usage)
+                return
+            with open(args[2], 'r', encoding='utf-8', errors='replace') as f:
+                added = queue.enqueue(args[1], f)
+            print(f"✅ Queued {added} new {args[1]} targets in '{name}'")
+            self.logger.info(f"Queue {name}: enqueued {added} {args[1]} targets")
+            
+        elif command == 'worker':
+            processes = int(args[args.index('--processes') + 1]) if '--processes' in args else 1
+            if processes > 1:
+                import multiprocessing
+                workers = [multiprocessing.Process(target=self.queue_worker, args=(name,))
+                           for _ in range(processes)]
+                for process in workers:
+                    process.start()
+                for process in workers:
+                    process.join()
+            else:
+                self.queue_worker(name)
+                
+        elif command == 'status':
+            while True:
+                self.print_queue_status(queue.status())
+                if '--watch' not in args:
+                    break
+                time.sleep(2)
+                
+        elif command == 'export':
+            f, path = secure_store.open_for_write(
+                f"exports/queue_{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+            with f:
+                count = 0
+                for analysis, target, result in queue.iter_results(restamp=self.restamp):
+                    f.write(serialize.dumps({'analysis': analysis, 'target': target, 'result': result}) + '\n')
+                    count += 1
+            print(f"✅ Exported {count} results: {path}")
+            
+        else:
+            print(usage)
+            
+    def queue_worker(self, name=DEFAULT_QUEUE):
+        """Run one worker until the queue is drained"""
+        worker = Worker(WorkQueue(queue=name), self.analyze_target)
+        print(f"👷 Worker {worker.worker_id} started on '{name}'")
+        try:
+            stats = worker.run()
+        except KeyboardInterrupt:
+            print(f"\n⚠️  Worker {worker.worker_id} stopped - unfinished leases released")
+            return
+        print(f"✅ Worker {worker.worker_id}: {stats['done']} done, {stats['failed']} failed, "
+              f"{stats['lost']} lost to expired leases")
+        self.logger.info(f"Queue worker {worker.worker_id}: {stats}")
+        
+    def print_queue_status(self, status):
+        """Print task counts and live workers for a queue"""
+        total = status['pending'] + status['leased'] + status['done'] + status['failed']
+        print(f"\n🗃️  Queue '{status['queue']}': {status['done']}/{total} done, "
+              f"{status['leased']} leased, {status['pending']} pending, {status['failed']} failed "
+              f"({status['open_groups']} open groups)")
+        now = time.time()
+        for worker in status['workers']:
+            print(f"  👷 {worker['worker_id']} @ {worker['host']}: {worker['done']} done, "
+                  f"{worker['failed']} failed, group {worker['group_key'] or '-'}, "
+                  f"heartbeat {now - worker['heartbeat']:.0f}s ago")
+        
     def social_media_lookup(self):
         """Social media intelligence gathering"""
         print("\n" + "─" * 70)
@@ -571,17 +912,8 @@ class OSINTCollector:
         print("─" * 40)
         
         # Social media search links
-        searches = {
-            'Google': f"https://www.google.com/search?q={target}",
-            'Facebook': f"https://www.facebook.com/search/top/?q={target}",
-            'LinkedIn': f"https://www.linkedin.com/search/results/all/?keywords={target}",
-            'Twitter': f"https://twitter.com/search?q={target}",
-            'Instagram': f"https://www.instagram.com/web/search/topsearch/?query={target}",
-            'GitHub': f"https://github.com/search?q={target}&type=users",
-            'Reddit': f"https://www.reddit.com/search/?q={target}",
-            'YouTube': f"https://www.youtube.com/results?search_query={target}",
-            'TikTok': f"https://www.tiktok.com/search?q={target}"
-        }
+        with profiled('social_media_lookup'):
+            searches = get_registry().links(target, 'search')
         
         print("\n🔗 SEARCH LINKS:")
         for platform, url in searches.items():
@@ -602,23 +934,73 @@ class OSINTCollector:
         print("\nAvailable reports in 'reports/' directory:")
         
         try:
-            import glob
-            
-            reports = glob.glob('reports/*.json')
-            
-            if not reports:
+            with profiled('generate_report'):
+                flush_writer()
+                total = 0
+                for total, entry in enumerate(iter_report_entries(), 1):
+                    if total <= self.REPORT_LISTING_LIMIT:
+                        print(f"  {total:2}. {entry.name} ({entry.stat().st_size} bytes)")
+
+            if not total:
                 print("  No reports found")
                 return
-                
-            for i, report in enumerate(reports, 1):
-                filename = os.path.basename(report)
-                size = os.path.getsize(report)
-                print(f"  {i:2}. {filename} ({size} bytes)")
-                
-            print(f"\n📁 Total reports: {len(reports)}")
-            
+            if total > self.REPORT_LISTING_LIMIT:
+                print(f"  ... and {total - self.REPORT_LISTING_LIMIT} more")
+
+            print(f"\n📁 Total reports: {total}")
+
         except Exception as e:
             print(f"❌ Error listing reports: {e}")
+            return
+
+        if input("\n📊 Show rollup analytics? (y/n): ").lower() == 'y':
+            with profiled('analytics'):
+                self.show_analytics()
+
+        export = input("\n📄 Export PDF summary? (y/n): ").lower()
+        if export == 'y':
+            with profiled('pdf_report'):
+                self.export_pdf_report()
+
+    def show_analytics(self):
+        """Per-domain and per-country rollups over stored results"""
+        try:
+            from analytics import run_analytics
+
+            flush_writer()
+            summary, path = run_analytics()
+            print(f"\n✅ Rollups saved: {path} ({summary['seconds']}s)")
+            self.logger.info(f"Analytics saved: {path}")
+
+        except ImportError:
+            print("❌ Missing module: pandas")
+            print("Install with: pip install pandas")
+        except Exception as e:
+            print(f"❌ Analytics error: {e}")
+            self.logger.error(f"Analytics error: {e}")
+
+    def export_pdf_report(self):
+        """Build a PDF summary of all saved reports"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"exports/report_summary_{timestamp}.pdf"
+
+        try:
+            from pdf_report import generate_pdf_report
+
+            start = time.time()
+            stream, filename = secure_store.open_for_write(filename, 'wb')
+            with stream:
+                builder = generate_pdf_report(stream)
+
+            print(f"✅ PDF saved: {filename} ({builder.total} reports, {time.time() - start:.1f}s)")
+            self.logger.info(f"PDF report saved: {filename}")
+
+        except ImportError:
+            print("❌ Missing module: reportlab")
+            print("Install with: pip install reportlab")
+        except Exception as e:
+            print(f"❌ PDF error: {e}")
+            self.logger.error(f"PDF report error: {e}")
             
     def settings_menu(self):
         """Settings and configuration"""
@@ -630,7 +1012,10 @@ class OSINTCollector:
         print("2. 🧹 Clear Cache & Temporary Files")
         print("3. 📁 Open Reports Directory")
         print("4. 📜 View Activity Logs")
-        print("5. 🔙 Back to Main Menu")
+        print("5. 🔐 Encryption at Rest")
+        print("6. 📈 Stage Timing Metrics")
+        print("7. ♻️  Result Cache")
+        print("8. 🔙 Back to Main Menu")
         
         choice = input("\n➤ Select option: ").strip()
         
@@ -642,6 +1027,12 @@ class OSINTCollector:
             self.open_reports_dir()
         elif choice == '4':
             self.view_logs()
+        elif choice == '5':
+            self.encryption_settings()
+        elif choice == '6':
+            self.metrics_menu()
+        elif choice == '7':
+            self.cache_settings()
             
     def system_info(self):
         """Display system information"""
@@ -655,8 +1046,102 @@ class OSINTCollector:
         print(f"Python: {platform.python_version()}")
         print(f"Processor: {platform.processor()}")
         print(f"Directory: {os.getcwd()}")
-        print(f"Reports: {len(os.listdir('reports')) if os.path.exists('reports') else 0}")
+        print(f"Reports: {count_reports()}")
+        
+        cache_stats = get_cache().summary()
+        print(f"Result cache: {cache_stats['hits']}/{cache_stats['lookups']} hits"
+              f"{' (bypassed)' if cache_stats['bypass'] else ''}")
+        
+        print("\n⏱️  Stage timings:")
+        metrics.print_stage_summary()
+        
+        if 'dns_tools' in sys.modules:
+            dns_stats = sys.modules['dns_tools'].get_resolver().summary()
+            print(f"\n🧭 DNS: {dns_stats['queries']} queries, {dns_stats['hedged']} hedged "
+                  f"({dns_stats['hedge_wins']} won), {dns_stats['degraded']} degraded by deadline")
+            print(f"   Upstreams: {', '.join(dns_stats['upstreams'])} | hedge after {dns_stats['hedge_delay_ms']} ms")
+            
+        if 'rate_limit' in sys.modules:
+            rates = sys.modules['rate_limit'].get_limiter().rates()
+            if rates:
+                print("🚦 Upstream rates: " + ", ".join(f"{name} {rate}/s" for name, rate in rates.items()))
         
+    def metrics_menu(self):
+        """Show stage timings and export metrics"""
+        print("\n" + "─" * 40)
+        print("📈 STAGE TIMING METRICS")
+        print("─" * 40)
+        
+        metrics.print_stage_summary()
+        
+        if not metrics.REGISTRY.has_data():
+            return
+            
+        export = input("\n💾 Export metrics to logs/? (y/n): ").lower()
+        if export == 'y':
+            self.export_metrics()
+            
+    def export_metrics(self):
+        """Write Prometheus and JSON metric files to logs/"""
+        try:
+            for path in metrics.REGISTRY.export('logs'):
+                print(f"✅ Metrics saved: {path}")
+                self.logger.info(f"Metrics exported: {path}")
+        except Exception as e:
+            print(f"❌ Metrics export error: {e}")
+            self.logger.error(f"Metrics export error: {e}")
+        
+    def encryption_settings(self):
+        """Toggle AES-GCM encryption for reports, exports and cache"""
+        enabled = secure_store.encryption_enabled()
+        print(f"\n🔐 Encryption at rest: {'✅ Enabled' if enabled else '❌ Disabled'}")
+        print(f"🔑 Key file: {secure_store.key_file_path()}")
+
+        toggle = input(f"\n{'Disable' if enabled else 'Enable'} encryption? (y/n): ").lower()
+        if toggle != 'y':
+            return
+
+        try:
+            if not enabled and secure_store.load_key() is None:
+                path = secure_store.generate_key()
+                print(f"✅ New key created: {path}")
+                print("⚠️  Back up this key - encrypted files cannot be recovered without it")
+
+            secure_store.set_encryption_enabled(not enabled)
+            print(f"✅ Encryption {'disabled' if enabled else 'enabled'} for this session")
+            print(f"💡 Set {secure_store.ENABLE_ENV}=1 to enable it by default")
+            self.logger.info(f"Encryption at rest {'disabled' if enabled else 'enabled'}")
+
+        except Exception as e:
+            print(f"❌ Encryption error: {e}")
+            self.logger.error(f"Encryption settings error: {e}")
+
+    def cache_settings(self):
+        """Show result cache statistics and toggle bypass"""
+        cache = get_cache()
+        stats = cache.summary()
+        print(f"\n♻️  Result cache: {'⏭️  Bypassed' if cache.bypass else '✅ Active'}")
+        print(f"📊 {stats['hits']} hits, {stats['misses']} misses, {stats['stale']} stale "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['evicted']} evicted")
+        print("⏳ TTLs: " + ", ".join(f"{name} {int(ttl)}s" for name, ttl in sorted(cache.ttls.items())))
+
+        freshness = get_scheduler().summary()
+        next_due = freshness['next_due_in']
+        print(f"🕒 Domains tracked: {freshness['tracked']}, {freshness['due']} expired"
+              + (f", next expiry in {int(next_due)}s" if next_due else ""))
+        if freshness['due']:
+            refresh = input("\nRe-verify expired domains now? (y/n): ").lower()
+            if refresh == 'y':
+                with profiled('refresh'):
+                    self.refresh_expired()
+
+        toggle = input(f"\n{'Use' if cache.bypass else 'Bypass'} cached results? (y/n): ").lower()
+        if toggle == 'y':
+            cache.bypass = not cache.bypass
+            print(f"✅ Cache {'bypassed' if cache.bypass else 'enabled'} for this session")
+            print("💡 Set OSINT_CACHE_BYPASS=1 or pass --no-cache to bypass it by default")
+            self.logger.info(f"Result cache {'bypassed' if cache.bypass else 'enabled'}")
+
     def clear_cache(self):
         """Clear cache and temporary files"""
         confirm = input("\n⚠️  Clear all cache files? (y/n): ").lower()
@@ -666,6 +1151,8 @@ class OSINTCollector:
                 import shutil
                 
                 if os.path.exists('cache'):
+                    get_cache().clear()
+                    reset_scheduler()
                     shutil.rmtree('cache')
                     os.makedirs('cache')
                     print("✅ Cache cleared")
@@ -686,9 +1173,11 @@ class OSINTCollector:
             print(f"\n📁 Reports directory: {reports_dir}")
             print("\nFiles:")
             
-            files = os.listdir(reports_dir)
-            for file in files:
-                print(f"  • {file}")
+            for shown, entry in enumerate(iter_report_entries(reports_dir), 1):
+                if shown > self.REPORT_LISTING_LIMIT:
+                    print("  ...")
+                    break
+                print(f"  • {os.path.relpath(entry.path, reports_dir)}")
         else:
             print("❌ Reports directory not found")
             
@@ -724,7 +1213,8 @@ class OSINTCollector:
         OSINT COLLECTOR - USER GUIDE
         
         1. PHONE ANALYSIS
-           • Enter phone with country code (+94 for Sri Lanka)
+           • Enter phone with country code, or in national format
+             for the default region (OSINT_DEFAULT_REGION, default LK)
            • Get carrier, location, and timezone
            • Generate associated email patterns
         
@@ -737,6 +1227,8 @@ class OSINTCollector:
         3. USERNAME INVESTIGATION
            • Check username across 10+ platforms
            • Get direct profile links
+           • Platforms and URL templates live in data/platforms.csv
+           • Many usernames at once: python platforms.py expand <file>
            • Manual verification required
         
         4. DOMAIN RECON
@@ -749,9 +1241,21 @@ class OSINTCollector:
            • Manual investigation required
            • Ethical use mandatory
         
+        6. BATCH ANALYSIS
+           • One phone/email/domain per line in an input file (spf audits a domain's SPF/DMARC)
+           • Progress is checkpointed; rerun with the same job ID to resume
+           • Headless: --batch <phone|email|domain|spf> <file> [--job-id ID]
+           • Shared queue for many workers/hosts (jobs/queue.sqlite):
+             --queue enqueue <type> <file> | worker [--processes N] | status [--watch] | export
+           • Re-verify only domains whose DNS TTL expired:
+             --refresh [--budget QUERIES] [--seed]  (--seed adds domains from saved reports)
+           • Rollups over stored results (pandas): --analytics
+           • Profile any action: --profile [cpu|memory|all] (writes logs/profile_*, logs/memory_*)
+        
         SECURITY FEATURES:
         • All searches are logged
         • Reports are saved with timestamps
+        • Optional AES-256-GCM encryption at rest (Settings → 5)
         • No automatic data collection
         • Manual verification required
         
@@ -762,10 +1266,11 @@ class OSINTCollector:
         • Delete data after legitimate use
         
         Directory Structure:
-        • /reports/ - Saved analysis reports
+        • /reports/ - Saved analysis reports (<type>/<YYYY>/<MM>/<DD>/)
         • /logs/    - Activity and search logs
-        • /cache/   - Temporary data
+        • /cache/   - Cached results (TTL per analysis, OSINT_CACHE_BYPASS=1 to skip)
         • /exports/ - Export files
+        • /jobs/    - Batch job journals and results
         
         Version: 2.0 | Educational Use Only
         """
@@ -783,7 +1288,14 @@ class OSINTCollector:
         print("• Respect privacy and data protection laws")
         print("• Delete sensitive data after use")
         print("• Report any issues or concerns")
+
+        writer = flush_writer()
+        if writer is not None and writer.errors:
+            print(f"\n⚠️  {len(writer.errors)} report(s) could not be written, see logs/")
         
+        if metrics.REGISTRY.has_data():
+            self.export_metrics()
+            
         self.logger.info("Program exited normally")
         sys.exit(0)
 
@@ -793,6 +1305,16 @@ def main():
         # Create collector instance
         collector = OSINTCollector()
         
+        if '--no-cache' in sys.argv:
+            get_cache().bypass = True
+        
+        # Profiling: --profile [cpu|memory|all] wraps each action
+        try:
+            profiling.configure(argv=sys.argv)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
         # Display banner
         collector.display_banner()
         
@@ -805,6 +1327,35 @@ def main():
         if not collector.get_legal_consent():
             return
             
+        # Headless batch: --batch <phone|email|domain|spf> <input file> [--job-id ID]
+        if '--batch' in sys.argv:
+            args = sys.argv[sys.argv.index('--batch') + 1:]
+            job_id = args[args.index('--job-id') + 1] if '--job-id' in args else None
+            if len(args) < 2 or args[0] not in collector.batch_analyzers():
+                print("Usage: --batch <phone|email|domain|spf> <input file> [--job-id ID]")
+                return
+            collector.start_batch(args[0], args[1], job_id)
+            return
+            
+        # Freshness: --refresh [--budget N] [--seed]
+        if '--refresh' in sys.argv:
+            budget = sys.argv[sys.argv.index('--budget') + 1] if '--budget' in sys.argv else None
+            with profiled('refresh'):
+                collector.refresh_expired(budget, seed='--seed' in sys.argv)
+            return
+            
+        # Rollups over stored results: --analytics
+        if '--analytics' in sys.argv:
+            with profiled('analytics'):
+                collector.show_analytics()
+            return
+            
+        # Shared work queue: --queue enqueue|worker|status|export ...
+        if '--queue' in sys.argv:
+            with profiled('queue'):
+                collector.queue_command(sys.argv[sys.argv.index('--queue') + 1:])
+            return
+            
         # Enter main menu
         collector.main_menu()
         
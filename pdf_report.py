@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+📄 PDF Report Builder
+Streams saved reports into a paginated PDF summary
+"""
+
+import os
+from datetime import datetime
+from functools import lru_cache
+
+from report_store import iter_reports, report_type
+
+ROWS_PER_TABLE = 40
+COLUMN_WIDTHS = (40, 60, 150, 200, 90)
+HEADER = ['#', 'Type', 'Target', 'Details', 'Date']
+
+
+@lru_cache(maxsize=None)
+def get_styles():
+    """Paragraph styles, built once per process"""
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=None)
+def get_table_style(font='Helvetica'):
+    """Shared table style for every entry table"""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    return TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), font),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2f4f6f')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#eef2f5')]),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
+
+
+@lru_cache(maxsize=None)
+def register_font(path):
+    """Register a TTF font once and return its name"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    pdfmetrics.registerFont(TTFont(name, path))
+    return name
+
+
+def _clip(value, limit):
+    text = str(value) if value is not None else ''
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+def summarize_report(kind, data):
+    """Return (target, details, date) for one report"""
+    if kind == 'phone':
+        target = data.get('international') or data.get('formatted', '')
+        details = f"{data.get('country', '')} | {data.get('carrier', '')} | {data.get('type', '')}"
+        date = data.get('timestamp', '')
+    elif kind == 'email':
+        mx = data.get('mx_records') or {}
+        target = data.get('email', '')
+        details = f"disposable={data.get('disposable')} | mx={len(mx.get('servers', []))}"
+        date = data.get('timestamp') or data.get('analysis_date', '')
+    elif kind == 'username':
+        target = data.get('username', '')
+        details = f"{len(data.get('platforms', {}))} platforms"
+        date = data.get('check_date', '')
+    else:
+        target = ''
+        details = ', '.join(list(data)[:5]) if isinstance(data, dict) else ''
+        date = ''
+    return _clip(target, 40), _clip(details, 60), _clip(date, 19)
+
+
+class _FlowableStream(list):
+    """List facade that pulls flowables from a generator as the doc consumes them"""
+
+    def __init__(self, source, window=16):
+        list.__init__(self)
+        self._source = iter(source)
+        self._window = window
+        self._refill()
+
+    def _refill(self):
+        while self._source is not None and list.__len__(self) < self._window:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._refill()
+        return list.__len__(self)
+
+
+class PDFReportBuilder:
+    def __init__(self, output_path, title="OSINT Collector - Report Summary", font_path=None):
+        self.output_path = output_path
+        self.title = title
+        self.font_path = font_path or os.environ.get('OSINT_PDF_FONT')
+        self.counts = {}
+        self.total = 0
+        self._font = 'Helvetica'
+
+    def _table(self, rows):
+        from reportlab.platypus import Table
+
+        table = Table([HEADER] + rows, colWidths=COLUMN_WIDTHS, repeatRows=1)
+        table.setStyle(get_table_style(self._font))
+        return table
+
+    def _flowables(self, reports):
+        from reportlab.platypus import Paragraph, Spacer
+
+        styles = get_styles()
+        yield Paragraph(self.title, styles['Title'])
+        yield Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
+        yield Spacer(1, 12)
+
+        rows = []
+        for path, data in reports:
+            kind = report_type(path, data)
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            self.total += 1
+            target, details, date = summarize_report(kind, data)
+            rows.append([str(self.total), kind, target, details, date])
+
+            if len(rows) == ROWS_PER_TABLE:
+                yield self._table(rows)
+                rows = []
+
+        if rows:
+            yield self._table(rows)
+
+        # Totals are only known once the stream is exhausted
+        yield Spacer(1, 12)
+        yield Paragraph("Summary", styles['Heading2'])
+        yield Paragraph(f"Total reports: {self.total}", styles['Normal'])
+        for kind, count in sorted(self.counts.items()):
+            yield Paragraph(f"{kind}: {count}", styles['Normal'])
+
+    def _draw_page_footer(self, canv, doc):
+        canv.saveState()
+        canv.setFont(self._font, 7)
+        canv.drawRightString(doc.pagesize[0] - doc.rightMargin, 20, f"Page {doc.page}")
+        canv.drawString(doc.leftMargin, 20, "Educational & Authorized Use Only")
+        canv.restoreState()
+
+    def build(self, reports):
+        """Render an iterable of (path, report) pairs to the output PDF"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate
+
+        self._font = register_font(self.font_path) if self.font_path else 'Helvetica'
+
+        doc = SimpleDocTemplate(
+            self.output_path,
+            pagesize=A4,
+            title=self.title,
+            pageCompression=1,
+        )
+        doc.build(
+            _FlowableStream(self._flowables(reports)),
+            onFirstPage=self._draw_page_footer,
+            onLaterPages=self._draw_page_footer,
+        )
+        return self.output_path
+
+
+def generate_pdf_report(output_path, reports_dir='reports'):
+    """Build a PDF summary of every saved report in reports_dir"""
+    builder = PDFReportBuilder(output_path)
+    builder.build(iter_reports(reports_dir))
+    return builder
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+☎️ Phone Pre-normalizer
+Cheap cleanup of raw phone input before any full phonenumbers parse
+
+Well-formed E.164 ("+94 77 123 4567") and national-format numbers
+("077-123-4567") are rewritten to E.164 with string operations only,
+obvious garbage is rejected, and only the remaining ambiguous inputs
+fall back to phonenumbers.parse.
+
+The default region for national numbers comes from OSINT_DEFAULT_REGION
+(ISO 3166 code, default LK).
+"""
+
+import os
+import re
+from collections import namedtuple
+
+DEFAULT_REGION = os.environ.get('OSINT_DEFAULT_REGION', 'LK').upper()
+
+MIN_DIGITS = 5
+MAX_DIGITS = 15
+
+# Status values
+E164 = 'e164'
+NATIONAL = 'national'
+PARSED = 'parsed'
+INVALID = 'invalid'
+
+Normalized = namedtuple('Normalized', 'raw e164 country_code national status')
+
+# Formatting characters people type between digit groups
+_SEPARATORS = re.compile(r'[\s().\-/]+')
+_E164 = re.compile(r'\+[1-9]\d{6,14}')
+_NATIONAL = re.compile(r'\d{%d,%d}' % (MIN_DIGITS, MAX_DIGITS))
+_DIGITS = re.compile(r'\d')
+
+# Used when phonenumbers is not installed
+_FALLBACK_REGIONS = {'LK': (94, '0', '00'), 'IN': (91, '0', '00'), 'GB': (44, '0', '00'),
+                     'AU': (61, '0', '0011'), 'US': (1, '1', '011'), 'CA': (1, '1', '011'),
+                     'DE': (49, '0', '00'), 'FR': (33, '0', '00')}
+
+_region_info = {}
+_country_codes = None
+
+
+def set_default_region(region):
+    """Change the region used for national-format numbers"""
+    global DEFAULT_REGION
+    DEFAULT_REGION = region.upper()
+
+
+def region_info(region=None):
+    """(calling code, national trunk prefix, international dial prefix) for a region"""
+    region = (region or DEFAULT_REGION).upper()
+    if region not in _region_info:
+        try:
+            import phonenumbers
+            metadata = phonenumbers.PhoneMetadata.metadata_for_region(region)
+            if metadata is None:
+                raise ValueError(f"Unknown region: {region}")
+            # Regions with several dial-out prefixes store a pattern; only plain digits are used
+            dial_out = metadata.international_prefix or ''
+            _region_info[region] = (metadata.country_code, metadata.national_prefix or '',
+                                    dial_out if dial_out.isdigit() else '')
+        except ImportError:
+            if region not in _FALLBACK_REGIONS:
+                raise ValueError(f"Unknown region: {region}")
+            _region_info[region] = _FALLBACK_REGIONS[region]
+    return _region_info[region]
+
+
+def _known_country_codes():
+    global _country_codes
+    if _country_codes is None:
+        try:
+            from phonenumbers import COUNTRY_CODE_TO_REGION_CODE
+            _country_codes = frozenset(COUNTRY_CODE_TO_REGION_CODE)
+        except ImportError:
+            _country_codes = frozenset(info[0] for info in _FALLBACK_REGIONS.values())
+    return _country_codes
+
+
+def split_country_code(e164):
+    """Split '+94771234567' into (94, '771234567'); (None, digits) if unknown"""
+    digits = e164.lstrip('+')
+    codes = _known_country_codes()
+    # Calling codes are prefix-free and at most three digits long
+    for size in (1, 2, 3):
+        code = int(digits[:size]) if digits[:size].isdigit() else None
+        if code in codes:
+            return code, digits[size:]
+    return None, digits
+
+
+def _slow_parse(raw, clean, region):
+    """Full phonenumbers parse for inputs the fast path can't decide"""
+    try:
+        import phonenumbers
+    except ImportError:
+        return None
+
+    # Bare digits were historically treated as international numbers
+    candidates = ['+' + clean, raw] if clean.isdigit() else [raw]
+    for candidate in candidates:
+        try:
+            parsed = phonenumbers.parse(candidate, region)
+        except phonenumbers.NumberParseException:
+            continue
+        if phonenumbers.is_possible_number(parsed):
+            return parsed.country_code, str(parsed.national_number)
+    return None
+
+
+def _classify(raw, clean, region, country_code, trunk, dial_out):
+    if dial_out and clean.startswith(dial_out) and clean.isdigit():
+        clean = '+' + clean[len(dial_out):]
+
+    if _E164.fullmatch(clean):
+        code, national = split_country_code(clean)
+        if code is not None:
+            return Normalized(raw, clean, code, national, E164)
+    elif trunk and clean.startswith(trunk) and _NATIONAL.fullmatch(clean):
+        national = clean[len(trunk):]
+        return Normalized(raw, f"+{country_code}{national}", country_code, national, NATIONAL)
+
+    # Garbage: too few/many digits to be any phone number
+    digit_count = len(_DIGITS.findall(clean))
+    if digit_count < MIN_DIGITS or digit_count > MAX_DIGITS + 6:
+        return Normalized(raw, None, None, None, INVALID)
+
+    parsed = _slow_parse(raw, clean, region)
+    if parsed is None:
+        return Normalized(raw, None, None, None, INVALID)
+    code, national = parsed
+    return Normalized(raw, f"+{code}{national}", code, national, PARSED)
+
+
+def normalize(phone, region=None):
+    """Normalize one phone number"""
+    # Same steps as normalize_many, without the generator and join for a single value
+    raw = str(phone).strip()
+    region = region or DEFAULT_REGION
+    country_code, trunk, dial_out = region_info(region)
+    clean = _SEPARATORS.sub('', raw.replace('\0', ''))
+    return _classify(raw, clean, region, country_code, trunk, dial_out)
+
+
+def normalize_many(phones, region=None):
+    """Normalize a column of phone numbers, yielding Normalized in order
+
+    Separators are stripped from the whole column with a single regex
+    pass over the joined text rather than one re.sub per number.
+    """
+    raw = [str(p).strip() for p in phones]
+    if not raw:
+        return
+
+    region = region or DEFAULT_REGION
+    country_code, trunk, dial_out = region_info(region)
+    cleaned = _SEPARATORS.sub('', '\0'.join(p.replace('\0', '') for p in raw)).split('\0')
+
+    for original, clean in zip(raw, cleaned):
+        yield _classify(original, clean, region, country_code, trunk, dial_out)
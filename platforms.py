@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+🌐 Platform Registry
+Profile and search URL templates for social platforms, loaded from
+data/platforms.csv and compiled once
+
+A template holds exactly one placeholder: {username} is encoded as a
+path segment, {query} as a query string value. Compiling splits each
+template around its placeholder, so building a URL is two string
+concatenations. expand() turns a column of usernames into a URL table
+(one column per platform), encoding each distinct value once.
+
+    python platforms.py expand usernames.txt [--kind search] [--out exports/urls.csv]
+"""
+
+import os
+import re
+import sys
+import csv
+from datetime import datetime
+from urllib.parse import quote, quote_plus
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_SOURCE = os.path.join(DATA_DIR, 'platforms.csv')
+
+# Most usernames need no escaping, and matching that is cheaper than quote()
+_unreserved = re.compile(r'[A-Za-z0-9_.~-]*\Z').match
+
+ENCODERS = {
+    '{username}': lambda value: value if _unreserved(value) else quote(value, safe=''),
+    '{query}': lambda value: value if _unreserved(value) else quote_plus(value, safe=''),
+}
+
+CHUNK_SIZE = 10000
+
+
+class PlatformTemplate:
+    def __init__(self, platform, kind, template):
+        self.platform = platform
+        self.kind = kind
+        self.template = template
+        for placeholder, encoder in ENCODERS.items():
+            if template.count(placeholder) == 1:
+                self.placeholder = placeholder
+                self.encode = encoder
+                self.prefix, _, self.suffix = template.partition(placeholder)
+                break
+        else:
+            raise ValueError(f"{platform} ({kind}): template needs one {{username}} or {{query}}")
+
+    def url(self, value):
+        return self.prefix + self.encode(str(value).strip()) + self.suffix
+
+
+class PlatformRegistry:
+    def __init__(self, templates):
+        self.kinds = {}
+        self._subsets = {}
+        for template in templates:
+            self.kinds.setdefault(template.kind, []).append(template)
+
+    @classmethod
+    def load(cls, path=DEFAULT_SOURCE):
+        templates = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith('#') or row[0] == 'platform':
+                    continue
+                platform, kind, template = (cell.strip() for cell in row[:3])
+                templates.append(PlatformTemplate(platform, kind, template))
+        return cls(templates)
+
+    def platforms(self, kind='profile'):
+        return [t.platform for t in self.kinds.get(kind, [])]
+
+    def links(self, value, kind='profile', only=None):
+        """{platform: url} for one username or search term (optionally only some platforms)
+
+        The value is encoded once per placeholder type, not once per platform.
+        """
+        value = str(value).strip()
+        encoded = {}
+        links = {}
+        for t in self.kinds.get(kind, []) if only is None else self._subset(kind, tuple(only)):
+            if t.placeholder not in encoded:
+                encoded[t.placeholder] = t.encode(value)
+            links[t.platform] = t.prefix + encoded[t.placeholder] + t.suffix
+        return links
+
+    def _subset(self, kind, only):
+        # Callers pass the same few platform tuples, so filter each once
+        key = (kind, only)
+        if key not in self._subsets:
+            self._subsets[key] = [t for t in self.kinds.get(kind, []) if t.platform in only]
+        return self._subsets[key]
+
+    def expand(self, values, kind='profile'):
+        """URL table for a column of values: {'value': [...], platform: [...], ...}
+
+        Values are stripped and encoded once per distinct value and
+        placeholder type, then every platform column is built from the
+        encoded column in one pass.
+        """
+        values = [str(v).strip() for v in values]
+        templates = self.kinds.get(kind, [])
+        encoded = {}
+        for placeholder in {t.placeholder for t in templates}:
+            encode = ENCODERS[placeholder]
+            cache = {}
+            encoded[placeholder] = [cache[v] if v in cache else cache.setdefault(v, encode(v))
+                                    for v in values]
+
+        table = {'value': values}
+        for t in templates:
+            prefix, suffix = t.prefix, t.suffix
+            table[t.platform] = [prefix + e + suffix for e in encoded[t.placeholder]]
+        return table
+
+    def write_table(self, values, output, kind='profile', chunk_size=CHUNK_SIZE):
+        """Stream values (any iterable) into a URL table CSV; returns (rows, actual path)
+
+        The file goes through secure_store, so it is encrypted like other
+        exports when encryption at rest is on.
+        """
+        from secure_store import open_for_write
+
+        header = ['value'] + self.platforms(kind)
+        f, path = open_for_write(output, encoding='utf-8')
+        rows = 0
+        with f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(header)
+            chunk = []
+            for value in values:
+                chunk.append(value)
+                if len(chunk) >= chunk_size:
+                    rows += self._write_chunk(writer, header, chunk, kind)
+                    chunk = []
+            if chunk:
+                rows += self._write_chunk(writer, header, chunk, kind)
+        return rows, path
+
+    def _write_chunk(self, writer, header, values, kind):
+        table = self.expand(values, kind)
+        writer.writerows(zip(*(table[column] for column in header)))
+        return len(values)
+
+
+_registry = None
+
+
+def get_registry(path=DEFAULT_SOURCE):
+    """Shared registry, loaded on first use"""
+    global _registry
+    if _registry is None:
+        _registry = PlatformRegistry.load(path)
+    return _registry
+
+
+def read_values(path):
+    """Non-empty, non-comment lines of a text file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+def main():
+    usage = "Usage: platforms.py expand <file> [--kind profile|search] [--out exports/urls.csv]"
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] != 'expand':
+        print(usage)
+        return
+
+    kind = args[args.index('--kind') + 1] if '--kind' in args else 'profile'
+    output = (args[args.index('--out') + 1] if '--out' in args else
+              os.path.join('exports', f"platform_urls_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"))
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+    rows, path = get_registry().write_table(read_values(args[1]), output, kind)
+    print(f"✅ Wrote {rows} rows x {len(get_registry().platforms(kind))} platforms: {path}")
+
+
+if __name__ == "__main__":
+    main()
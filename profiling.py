@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+🔬 Profiling Hooks
+Wrap an action in cProfile and/or tracemalloc and write the results to logs/
+
+Off unless asked for, in which case entering a hook costs one check:
+
+    python "osint collector.py" --profile cpu|memory|all
+    OSINT_PROFILE=memory python "email hunter.py"
+
+Each profiled action (menu choice, batch job, headless command) writes
+    logs/profile_<action>_<ts>.pstats   open with: python -m pstats <file>
+    logs/memory_<action>_<ts>.txt       top allocations by line, plus peak
+
+Hooks nest: only the outermost active one records. cProfile sees the
+thread that entered the hook; tracemalloc sees every thread.
+
+Configuration (environment):
+    OSINT_PROFILE         cpu, memory or all (default off)
+    OSINT_PROFILE_DIR     output directory (default logs)
+    OSINT_PROFILE_TOP     allocation sites listed (default 25)
+    OSINT_PROFILE_FRAMES  traceback depth kept per allocation (default 1)
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+from functools import wraps
+
+MODES = {'cpu': {'cpu'}, 'memory': {'memory'}, 'all': {'cpu', 'memory'}}
+
+_modes = set()
+_active = False
+_lock = threading.Lock()
+
+
+def parse_mode(value):
+    """Set of profilers for 'cpu', 'memory', 'all' or a comma list of those"""
+    modes = set()
+    for part in str(value or '').lower().split(','):
+        part = part.strip()
+        if part in ('', 'off', 'none', '0'):
+            continue
+        if part not in MODES:
+            raise ValueError(f"Unknown profile mode {part!r} (use cpu, memory or all)")
+        modes |= MODES[part]
+    return modes
+
+
+def configure(mode=None, argv=None):
+    """Enable profilers from --profile [mode] in argv, else mode, else OSINT_PROFILE"""
+    global _modes
+    if argv and '--profile' in argv:
+        following = argv[argv.index('--profile') + 1:argv.index('--profile') + 2]
+        mode = following[0] if following and not following[0].startswith('-') else 'cpu'
+    elif mode is None:
+        mode = os.environ.get('OSINT_PROFILE', '')
+    _modes = parse_mode(mode)
+    return sorted(_modes)
+
+
+def enabled():
+    return bool(_modes)
+
+
+def _path(prefix, name, suffix):
+    directory = os.environ.get('OSINT_PROFILE_DIR', 'logs')
+    os.makedirs(directory, exist_ok=True)
+    safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in str(name))
+    stem = os.path.join(directory, f"{prefix}_{safe}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    path, n = stem + suffix, 1
+    while os.path.exists(path):
+        path, n = f"{stem}_{n}{suffix}", n + 1
+    return path
+
+
+def write_memory_report(snapshot, peak, path, title, top=None):
+    """Top allocation sites of a tracemalloc snapshot as text"""
+    import tracemalloc
+
+    top = top or int(os.environ.get('OSINT_PROFILE_TOP', 25))
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    ))
+    stats = snapshot.statistics('lineno')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"# {title}\n")
+        f.write(f"# peak traced: {peak / 1024:.1f} KiB, "
+                f"live at end: {sum(s.size for s in stats) / 1024:.1f} KiB\n\n")
+        for stat in stats[:top]:
+            frame = stat.traceback[0]
+            f.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8} blocks  {frame.filename}:{frame.lineno}\n")
+    return path
+
+
+class profiled:
+    """Profile an action as a context manager or decorator (no-op when disabled)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.paths = []
+        self._owner = False
+
+    def __call__(self, func):
+        name = self.name
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _modes:
+                return func(*args, **kwargs)
+            with profiled(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        global _active
+        if not _modes:
+            return self
+        with _lock:
+            if _active:
+                return self
+            _active = self._owner = True
+
+        self._modes = set(_modes)
+        self._profile = None
+        self._start = time.perf_counter()
+        if 'memory' in self._modes:
+            import tracemalloc
+            self._tracing = not tracemalloc.is_tracing()
+            if self._tracing:
+                tracemalloc.start(int(os.environ.get('OSINT_PROFILE_FRAMES', 1)))
+            tracemalloc.reset_peak()
+        if 'cpu' in self._modes:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        if not self._owner:
+            return False
+
+        try:
+            if self._profile is not None:
+                self._profile.disable()
+
+            if 'memory' in self._modes:
+                # Snapshot before writing the pstats file so its allocations aren't counted
+                import tracemalloc
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                if self._tracing:
+                    tracemalloc.stop()
+
+            if self._profile is not None:
+                path = _path('profile', self.name, '.pstats')
+                self._profile.dump_stats(path)
+                self.paths.append(path)
+
+            if 'memory' in self._modes:
+                title = f"{self.name}: {time.perf_counter() - self._start:.2f}s"
+                self.paths.append(write_memory_report(
+                    snapshot, peak, _path('memory', self.name, '.txt'), title))
+
+            print(f"🔬 Profile for {self.name}: {', '.join(self.paths)}")
+        except Exception as e:
+            print(f"⚠️  Profiling output failed: {e}")
+        finally:
+            self._owner = False
+            with _lock:
+                _active = False
+        return False
+
+
+try:
+    configure()
+except ValueError as e:
+    print(f"⚠️  OSINT_PROFILE ignored: {e}")
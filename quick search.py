@@ -5,31 +5,40 @@ Fast searches for emails, usernames, and phone info
 """
 
 import re
-import json
+import sys
 from datetime import datetime
 
+import profiling
+import serialize
+from number_ranges import get_table
+from platforms import get_registry
+from phone_normalize import normalize
+
+# Quick search stays quick: the full set is in the email hunter
+QUICK_PLATFORMS = ('Twitter', 'Instagram', 'GitHub')
+
 def quick_email_search(email):
     """Quick email analysis"""
-    print(f"\n📧 Quick Email Analysis: {email}")
-    print("-"*40)
+    # Output is collected and printed once, as in quick_phone_search
+    lines = [f"\n📧 Quick Email Analysis: {email}", "-"*40]
     
     # Extract username and domain
     if '@' in email:
         username, domain = email.split('@')
-        print(f"Username: {username}")
-        print(f"Domain: {domain}")
+        lines.append(f"Username: {username}")
+        lines.append(f"Domain: {domain}")
         
         # Common patterns
-        print(f"\n💡 Possible variations:")
-        print(f"  • {username}123@{domain}")
-        print(f"  • {username}.official@{domain}")
-        print(f"  • contact.{username}@{domain}")
+        lines.append(f"\n💡 Possible variations:")
+        lines.append(f"  • {username}123@{domain}")
+        lines.append(f"  • {username}.official@{domain}")
+        lines.append(f"  • contact.{username}@{domain}")
         
         # Social media
-        print(f"\n🌐 Social media check:")
-        print(f"  Twitter: https://twitter.com/{username}")
-        print(f"  Instagram: https://instagram.com/{username}")
-        print(f"  GitHub: https://github.com/{username}")
+        lines.append(f"\n🌐 Social media check:")
+        for platform, url in get_registry().links(username, only=QUICK_PLATFORMS).items():
+            lines.append(f"  {platform}: {url}")
+    print('\n'.join(lines))
     
     return {
         'email': email,
@@ -40,51 +49,48 @@ def quick_email_search(email):
 
 def quick_phone_search(phone):
     """Quick phone analysis"""
-    print(f"\n📞 Quick Phone Analysis: {phone}")
-    print("-"*40)
+    # Output is collected and printed once: per-line print calls cost as much as the lookup
+    lines = [f"\n📞 Quick Phone Analysis: {phone}", "-"*40]
     
-    # Clean phone
-    clean = re.sub(r'[^0-9+]', '', phone)
-    
-    # Sri Lankan prefixes
-    prefixes = {
-        '70': 'Mobitel - Colombo',
-        '71': 'Mobitel - Western',
-        '72': 'Dialog - Colombo',
-        '74': 'Dialog - Suburbs',
-        '75': 'Airtel - Urban',
-        '77': 'Dialog/Hutch - Urban',
-        '78': 'Hutch - Major Cities',
-        '81': 'Mobitel - Kandy'
-    }
+    # Clean phone (national formats use the default region)
+    normalized = normalize(phone)
+    clean = normalized.e164 or re.sub(r'[^0-9+]', '', phone)
     
-    if clean.startswith('+94'):
-        prefix = clean[3:5]
-        info = prefixes.get(prefix, 'Unknown operator')
-        print(f"Prefix: {prefix}")
-        print(f"Info: {info}")
+    # Operator and region from the compiled number range table
+    match = get_table().lookup(clean) if clean.startswith('+') else None
+    prefix = operator = region = None
+    if match:
+        prefix, operator, region = match
+        lines.append(f"Prefix: +{prefix}")
+        lines.append(f"Info: {operator or 'Unknown operator'} - {region or 'Unknown region'}")
     
     # Email patterns from phone
-    clean_num = clean.replace('+', '')
-    if clean_num.startswith('94'):
-        clean_num = clean_num[2:]
+    clean_num = normalized.national or clean.replace('+', '')
     
-    print(f"\n📧 Possible email patterns:")
-    print(f"  • {clean_num}@gmail.com")
-    print(f"  • whatsapp.{clean_num}@yahoo.com")
+    lines.append(f"\n📧 Possible email patterns:")
+    lines.append(f"  • {clean_num}@gmail.com")
+    lines.append(f"  • whatsapp.{clean_num}@yahoo.com")
     if len(clean_num) >= 7:
-        print(f"  • {clean_num[:7]}@outlook.com")
+        lines.append(f"  • {clean_num[:7]}@outlook.com")
+    print('\n'.join(lines))
     
     return {
         'phone': phone,
         'clean': clean,
-        'prefix': prefix if clean.startswith('+94') and len(clean) > 4 else None,
+        'prefix': prefix,
+        'operator': operator or None,
+        'region': region or None,
         'searched_at': datetime.now().isoformat()
     }
 
 def main():
     print("\n🔎 QUICK OSINT SEARCH TOOL")
     print("="*50)
+    try:
+        profiling.configure(argv=sys.argv)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
     
     while True:
         print("\nWhat to search?")
@@ -97,25 +103,27 @@ def main():
         if choice == '1':
             email = input("Enter email: ").strip()
             if '@' in email:
-                result = quick_email_search(email)
+                with profiling.profiled('quick_email_search'):
+                    result = quick_email_search(email)
                 
                 save = input("\nSave result? (y/n): ").lower()
                 if save == 'y':
                     filename = f"search_email_{email.replace('@', '_')}_{datetime.now().strftime('%H%M%S')}.json"
-                    with open(filename, 'w') as f:
-                        json.dump(result, f, indent=2)
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        serialize.dump(result, f)
                     print(f"✅ Saved to {filename}")
         
         elif choice == '2':
             phone = input("Enter phone: ").strip()
             if phone:
-                result = quick_phone_search(phone)
+                with profiling.profiled('quick_phone_search'):
+                    result = quick_phone_search(phone)
                 
                 save = input("\nSave result? (y/n): ").lower()
                 if save == 'y':
                     filename = f"search_phone_{phone.replace('+', '')}_{datetime.now().strftime('%H%M%S')}.json"
-                    with open(filename, 'w') as f:
-                        json.dump(result, f, indent=2)
+                    with open(filename, 'w', encoding='utf-8') as f:
+                        serialize.dump(result, f)
                     print(f"✅ Saved to {filename}")
         
         elif choice == '3':
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+🚦 Adaptive Rate Limiting
+Token bucket per upstream (resolver IP:port or HTTP host) with AIMD rates
+
+Healthy responses raise an upstream's rate additively, at most once per
+window; timeouts, SERVFAIL/REFUSED and HTTP 429/503 halve it, also at
+most once per window so one burst of failures counts as one congestion
+event. Current rates are exported as the osint_upstream_rate gauge.
+
+Configuration (environment):
+    OSINT_RATE_INITIAL   starting requests/second per upstream (default 20)
+    OSINT_RATE_MIN       floor (default 1)
+    OSINT_RATE_MAX       ceiling (default 200)
+    OSINT_RATE_BURST     bucket size (default 10)
+    OSINT_RATE_STEP      additive increase per window (default 5)
+    OSINT_RATE_WINDOW    adaptation window in seconds (default 1.0)
+"""
+
+import os
+import time
+import threading
+from urllib.parse import urlsplit
+
+import metrics
+
+try:
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    HTTPAdapter = None
+
+
+class LimiterConfig:
+    def __init__(self, initial=20.0, minimum=1.0, maximum=200.0, burst=10.0,
+                 step=5.0, decrease=0.5, window=1.0):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.burst = burst
+        self.step = step
+        self.decrease = decrease
+        self.window = window
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ.get
+        return cls(
+            initial=float(env('OSINT_RATE_INITIAL', 20.0)),
+            minimum=float(env('OSINT_RATE_MIN', 1.0)),
+            maximum=float(env('OSINT_RATE_MAX', 200.0)),
+            burst=float(env('OSINT_RATE_BURST', 10.0)),
+            step=float(env('OSINT_RATE_STEP', 5.0)),
+            window=float(env('OSINT_RATE_WINDOW', 1.0)),
+        )
+
+
+class AdaptiveBucket:
+    """Token bucket whose refill rate follows additive-increase/multiplicative-decrease"""
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.rate = min(max(config.initial, config.minimum), config.maximum)
+        self.tokens = config.burst
+        self.stats = {'acquired': 0, 'waited': 0, 'backoffs': 0}
+        self._updated = time.monotonic()
+        self._last_change = self._updated - config.window
+        self._lock = threading.Lock()
+        self._publish()
+
+    def _publish(self):
+        metrics.set_gauge('osint_upstream_rate', round(self.rate, 2), upstream=self.name)
+
+    def _refill(self, now):
+        self.tokens = min(self.config.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Take a token, sleeping until one is due; False if that's beyond timeout"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            if timeout is not None and wait > timeout:
+                self.tokens += 1
+                return False
+            self.stats['acquired'] += 1
+
+        if wait > 0:
+            # The token is reserved, so sleeping outside the lock keeps callers in order
+            self.stats['waited'] += 1
+            metrics.inc('osint_rate_limited_total', upstream=self.name)
+            time.sleep(wait)
+        return True
+
+    def success(self):
+        """Healthy response: ramp up once per window"""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate >= self.config.maximum or now - self._last_change < self.config.window:
+                return
+            self._refill(now)
+            self.rate = min(self.config.maximum, self.rate + self.config.step)
+            self._last_change = now
+        self._publish()
+
+    def congestion(self, pause=0.0):
+        """Timeout, SERVFAIL or throttling response: back off once per window"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_change < self.config.window and not pause:
+                return
+            self._refill(now)
+            self.rate = max(self.config.minimum, self.rate * self.config.decrease)
+            self._last_change = now
+            self.stats['backoffs'] += 1
+            if pause:
+                # Honour Retry-After by pushing the next token into the future at the new rate
+                self.tokens = min(self.tokens, -pause * self.rate)
+        metrics.inc('osint_upstream_backoff_total', upstream=self.name)
+        self._publish()
+
+
+class RateLimiter:
+    """Buckets keyed by upstream, created on first use"""
+
+    def __init__(self, config=None):
+        self.config = config or LimiterConfig.from_env()
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, upstream):
+        bucket = self._buckets.get(upstream)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(upstream)
+                if bucket is None:
+                    bucket = self._buckets[upstream] = AdaptiveBucket(upstream, self.config)
+        return bucket
+
+    def rates(self):
+        return {name: round(bucket.rate, 1) for name, bucket in sorted(self._buckets.items())}
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_limiter():
+    """Process-wide limiter shared by every network path"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter()
+        return _shared
+
+
+def reset_limiter(limiter=None):
+    """Replace the shared limiter (None rebuilds it from the environment)"""
+    global _shared
+    with _shared_lock:
+        _shared = limiter
+
+
+if HTTPAdapter is not None:
+    class RateLimitedAdapter(HTTPAdapter):
+        """requests adapter that paces each host and adapts to 429/503 and timeouts"""
+
+        THROTTLED = (429, 503)
+
+        def send(self, request, **kwargs):
+            import requests
+
+            bucket = get_limiter().bucket(f"http:{urlsplit(request.url).netloc}")
+            bucket.acquire()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                bucket.congestion()
+                raise
+
+            if response.status_code in self.THROTTLED:
+                retry_after = response.headers.get('Retry-After', '')
+                bucket.congestion(pause=float(retry_after) if retry_after.isdigit() else 0.0)
+            else:
+                bucket.success()
+            return response
+
+
+def install(session):
+    """Route every request made through a requests session via the shared limiter"""
+    if HTTPAdapter is not None:
+        adapter = RateLimitedAdapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+🗂️ Report Store
+Lazy access to saved analysis reports in 'reports/'
+
+Reports are sharded by type and date so no single directory grows
+without bound:
+
+    reports/<type>/<YYYY>/<MM>/<DD>/<type>_..._<YYYYMMDD>_<HHMMSS>.json
+
+Listing walks the tree with os.scandir generators and never builds the
+full list, so entries come in directory order. count_reports() walks a
+tree once and then keeps its total up to date as reports are saved. Flat files left by older versions are moved into the tree by
+migrate_reports() (run at startup, or `python report_store.py migrate`).
+"""
+
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+
+import serialize
+from metrics import timed
+from secure_store import (ENCRYPTED_SUFFIX, SecureStoreError, encryption_enabled, open_for_read,
+                          open_for_write)
+
+REPORTS_DIR = 'reports'
+REPORT_SUFFIXES = ('.json', '.json' + ENCRYPTED_SUFFIX)
+REPORT_TYPES = ('phone', 'email', 'username')
+
+_STAMP = re.compile(r'_(\d{4})(\d{2})(\d{2})_\d{6}')
+_made_dirs = set()
+_counts = {}
+_counts_lock = threading.Lock()
+
+
+def is_report_name(name):
+    return name.endswith(REPORT_SUFFIXES)
+
+
+def _walk(directory):
+    """Yield report file entries below directory, depth first, in directory order"""
+    try:
+        it = os.scandir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif is_report_name(entry.name):
+                yield entry
+
+
+def iter_report_paths(reports_dir=REPORTS_DIR):
+    """Yield saved report paths one at a time (directory order, not by date)"""
+    for entry in _walk(reports_dir):
+        yield entry.path
+
+
+def iter_report_entries(reports_dir=REPORTS_DIR):
+    """Yield os.DirEntry objects, so callers get sizes without extra lookups"""
+    return _walk(reports_dir)
+
+
+def count_reports(reports_dir=REPORTS_DIR):
+    """Number of saved reports; the tree is walked on the first call only"""
+    key = os.path.abspath(reports_dir)
+    with _counts_lock:
+        if key not in _counts:
+            _counts[key] = sum(1 for _ in _walk(reports_dir))
+        return _counts[key]
+
+
+def record_saved(path):
+    """Add a newly created report file to the counted trees it belongs to"""
+    if not is_report_name(path):
+        return
+    path = os.path.abspath(path)
+    with _counts_lock:
+        for directory in _counts:
+            if path.startswith(directory + os.sep):
+                _counts[directory] += 1
+
+
+def report_type(path, data=None):
+    """Guess report type from filename prefix or content"""
+    name = os.path.basename(path)
+    prefix = name.split('_', 1)[0]
+    if prefix in REPORT_TYPES:
+        return prefix
+    if data:
+        if 'international' in data:
+            return 'phone'
+        if 'email' in data:
+            return 'email'
+        if 'username' in data:
+            return 'username'
+    return 'unknown'
+
+
+def shard_path(name, reports_dir=REPORTS_DIR, when=None):
+    """Sharded location for a report file name
+
+    The date comes from the _YYYYMMDD_HHMMSS stamp in the name, else
+    from when (a datetime), else today.
+    """
+    name = os.path.basename(name)
+    stamps = _STAMP.findall(name)
+    if stamps:
+        year, month, day = stamps[-1]
+    else:
+        year, month, day = (when or datetime.now()).strftime('%Y %m %d').split()
+    return os.path.join(reports_dir, report_type(name), year, month, day, name)
+
+
+def _ensure_dir(directory, force=False):
+    directory = os.path.abspath(directory)
+    if force or directory not in _made_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _made_dirs.add(directory)
+
+
+def save_report(path, data):
+    """Write a report as JSON, encrypted when enabled; returns the actual path
+
+    Paths directly inside REPORTS_DIR are placed in their shard.
+    """
+    with timed('save'):
+        parent = os.path.dirname(path)
+        if os.path.normpath(parent) == os.path.normpath(REPORTS_DIR):
+            path = shard_path(path, parent)
+        _ensure_dir(os.path.dirname(path) or '.')
+        encrypt = encryption_enabled()
+        new = not os.path.exists(path + ENCRYPTED_SUFFIX if encrypt else path)
+        try:
+            f, path = open_for_write(path, encrypt=encrypt)
+        except FileNotFoundError:
+            # Shard directory removed since we last created it
+            _ensure_dir(os.path.dirname(path) or '.', force=True)
+            f, path = open_for_write(path, encrypt=encrypt)
+        with f:
+            serialize.dump(data, f)
+    if new:
+        record_saved(path)
+    return path
+
+
+def load_report(path):
+    """Load a single report, returning None if unreadable"""
+    try:
+        with open_for_read(path) as f:
+            return serialize.load(f)
+    except (OSError, ValueError, SecureStoreError):
+        return None
+
+
+def iter_reports(reports_dir=REPORTS_DIR):
+    """Yield (path, report) pairs without loading every report first"""
+    for path in iter_report_paths(reports_dir):
+        data = load_report(path)
+        if data is not None:
+            yield path, data
+
+
+def has_flat_reports(reports_dir=REPORTS_DIR):
+    """True if report files sit directly in reports_dir (pre-sharding layout)"""
+    try:
+        with os.scandir(reports_dir) as it:
+            return any(entry.is_file() and is_report_name(entry.name) for entry in it)
+    except FileNotFoundError:
+        return False
+
+
+def migrate_reports(reports_dir=REPORTS_DIR):
+    """Move flat report files into their shards; returns how many moved"""
+    moved = 0
+    try:
+        with os.scandir(reports_dir) as it:
+            for entry in it:
+                if not (entry.is_file() and is_report_name(entry.name)):
+                    continue
+                when = None
+                if not _STAMP.search(entry.name):
+                    when = datetime.fromtimestamp(entry.stat().st_mtime)
+                target = shard_path(entry.name, reports_dir, when)
+                if os.path.exists(target):
+                    continue
+                _ensure_dir(os.path.dirname(target))
+                os.replace(entry.path, target)
+                moved += 1
+    except FileNotFoundError:
+        pass
+    return moved
+
+
+def main():
+    args = sys.argv[1:]
+    reports_dir = args[1] if len(args) > 1 else REPORTS_DIR
+    if args[:1] == ['migrate']:
+        print(f"✅ Moved {migrate_reports(reports_dir)} reports into {reports_dir}/<type>/<YYYY>/<MM>/<DD>/")
+    elif args[:1] == ['count']:
+        print(f"📁 {count_reports(reports_dir)} reports in {reports_dir}")
+    else:
+        print("Usage: python report_store.py migrate|count [reports_dir]")
+
+
+if __name__ == "__main__":
+    main()
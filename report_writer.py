@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+✍️ Background Report Writer
+Saves reports off the analysis path with group commit
+
+save() returns as soon as the report is queued. A writer thread drains
+the bounded queue in groups: every report in a group is written to a
+temporary file and fsynced, then all of them are renamed into place
+atomically and each touched directory is fsynced once per group. (File
+data has no portable group fsync short of syncing the whole filesystem,
+so that part stays one fsync per report.) A full queue blocks save()
+(backpressure) rather than growing without bound. flush() waits until
+everything queued so far is on disk.
+
+Whether a report is encrypted is decided when it is queued, together
+with its file name, so toggling encryption never mislabels a file.
+
+Configuration (environment):
+    OSINT_WRITER_QUEUE   queued reports before save() blocks (default 1024)
+    OSINT_WRITER_GROUP   most reports committed per group (default 256)
+"""
+
+import os
+import queue
+import atexit
+import itertools
+import logging
+import threading
+
+import metrics
+import serialize
+from report_store import REPORTS_DIR, record_saved, shard_path
+from secure_store import ENCRYPTED_SUFFIX, encryption_enabled, open_for_write
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# Temporary names carry a sequence number: one group may hold the same path twice
+_sequence = itertools.count()
+
+
+class ReportWriter:
+    def __init__(self, max_queue=None, max_group=None):
+        max_queue = max_queue or int(os.environ.get('OSINT_WRITER_QUEUE', 1024))
+        self.max_group = max_group or int(os.environ.get('OSINT_WRITER_GROUP', 256))
+        self.stats = {'queued': 0, 'written': 0, 'groups': 0, 'errors': 0}
+        self.errors = []
+        self._queue = queue.Queue(max_queue)
+        self._made_dirs = set()
+        self._thread = threading.Thread(target=self._run, name='report-writer', daemon=True)
+        self._thread.start()
+
+    def save(self, path, data, timeout=None):
+        """Queue a report; returns the path it will have once written
+
+        Blocks while the queue is full (raises queue.Full after timeout).
+        """
+        if os.path.normpath(os.path.dirname(path)) == os.path.normpath(REPORTS_DIR):
+            path = shard_path(path, os.path.dirname(path))
+        encrypt = encryption_enabled()
+        if encrypt:
+            path += ENCRYPTED_SUFFIX
+        # Serialize now so later changes to data by the caller can't leak in
+        payload = serialize.dumps(data, pretty=not serialize.get_serializer().compact)
+        self._queue.put((path, payload, encrypt), timeout=timeout)
+        self.stats['queued'] += 1
+        metrics.set_gauge('osint_writer_queue_depth', self._queue.qsize())
+        return path
+
+    def flush(self):
+        """Wait until every report queued so far has been committed"""
+        self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            group = [self._queue.get()]
+            # Take whatever else is already waiting, up to one group
+            while len(group) < self.max_group:
+                try:
+                    group.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in group
+            records = [item for item in group if item is not _STOP]
+            try:
+                if records:
+                    self._commit(records)
+            finally:
+                for _ in group:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _commit(self, records):
+        """Write, fsync and rename one group of (path, payload, encrypt) records"""
+        with metrics.timed('save'):
+            staged = []
+            for path, payload, encrypt in records:
+                try:
+                    staged.append((self._stage(path, payload, encrypt), path))
+                except Exception as e:
+                    self._failed(path, e)
+
+            committed = set()
+            for tmp, path in staged:
+                try:
+                    fd = os.open(tmp, os.O_RDONLY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                    new = not os.path.exists(path)
+                    os.replace(tmp, path)
+                    if new:
+                        record_saved(path)
+                    committed.add(os.path.dirname(path) or '.')
+                    self.stats['written'] += 1
+                except OSError as e:
+                    self._failed(path, e)
+
+            # One directory fsync per group makes every rename in it durable
+            for directory in committed:
+                _fsync_dir(directory)
+
+        self.stats['groups'] += 1
+        metrics.inc('osint_writer_groups_total')
+        metrics.set_gauge('osint_writer_queue_depth', self._queue.qsize())
+
+    def _stage(self, path, payload, encrypt):
+        """Write payload next to path under a hidden, unique temporary name"""
+        directory, name = os.path.split(path)
+        directory = directory or '.'
+        if directory not in self._made_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._made_dirs.add(directory)
+
+        # open_for_write appends the encryption suffix itself
+        base = name[:-len(ENCRYPTED_SUFFIX)] if name.endswith(ENCRYPTED_SUFFIX) else name
+        tmp = os.path.join(directory, f".{base}.{os.getpid()}-{next(_sequence)}.tmp")
+        f, tmp = open_for_write(tmp, encrypt=encrypt)
+        with f:
+            f.write(payload)
+        return tmp
+
+    def _failed(self, path, error):
+        self.stats['errors'] += 1
+        self.errors.append((path, str(error)))
+        metrics.inc('osint_writer_errors_total')
+        logger.error(f"Report write failed for {path}: {error}")
+
+
+def _fsync_dir(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_writer():
+    """Process-wide writer, flushed automatically at interpreter exit"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ReportWriter()
+            atexit.register(_shared.close)
+        return _shared
+
+
+def flush_writer():
+    """Flush the shared writer if one was started"""
+    with _shared_lock:
+        writer = _shared
+    if writer is not None:
+        writer.flush()
+    return writer
+
+
+def reset_writer():
+    """Stop the shared writer after committing everything queued"""
+    global _shared
+    with _shared_lock:
+        writer, _shared = _shared, None
+    if writer is not None:
+        writer.close()
+        atexit.unregister(writer.close)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+♻️ Result Cache
+Finished analysis results keyed by canonical target, stored in 'cache/'
+
+Each entry lives at cache/results/<analysis>/<sha256 of target>.json
+(encrypted like reports when encryption at rest is enabled) and records
+when it was stored plus a content digest of the result, so callers can
+tell a changed result from a refreshed one.
+
+Configuration (environment):
+    OSINT_CACHE_TTL        per-analysis TTLs in seconds, e.g. "domain=600,phone=86400"
+    OSINT_CACHE_MAX_MB     size bound for all entries (default 50)
+    OSINT_CACHE_BYPASS     1 to ignore cached results (fresh results are still stored)
+"""
+
+import os
+import time
+import hashlib
+import threading
+
+import metrics
+import serialize
+from secure_store import ENCRYPTED_SUFFIX, SecureStoreError, open_for_read, open_for_write
+
+CACHE_DIR = os.path.join('cache', 'results')
+
+DEFAULT_TTLS = {
+    'phone': 7 * 86400,        # numbering plans rarely change
+    'email': 86400,
+    'email_intel': 86400,
+    'domain': 3600,            # DNS answers move fastest
+    'spf': 3600,
+}
+DEFAULT_TTL = 86400
+DEFAULT_MAX_MB = 50
+
+# Lookup metadata that differs on every run without the answer changing
+VOLATILE_KEYS = ('timestamp', 'budget')
+
+# Evict down to this fraction of the bound so puts don't evict one at a time
+EVICT_TARGET = 0.9
+
+
+def parse_ttls(text):
+    """'domain=600,phone=86400' -> {'domain': 600.0, 'phone': 86400.0}"""
+    ttls = {}
+    for item in (text or '').split(','):
+        name, _, seconds = item.partition('=')
+        if name.strip() and seconds.strip():
+            ttls[name.strip()] = float(seconds)
+    return ttls
+
+
+def normalize_target(analysis, target):
+    """Canonical cache key text for a target (one entry per real identity)"""
+    from dedup import canonical
+    return canonical(analysis, target)
+
+
+def content_digest(result):
+    """Stable hash of a result's content, ignoring when and how it was looked up"""
+    if isinstance(result, dict):
+        result = {key: value for key, value in result.items() if key not in VOLATILE_KEYS}
+    return hashlib.sha256(serialize.dumpb(result, sort_keys=True)).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=CACHE_DIR, ttls=None, max_bytes=None, bypass=None):
+        self.directory = directory
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(parse_ttls(os.environ.get('OSINT_CACHE_TTL')))
+        self.ttls.update(ttls or {})
+        if max_bytes is None:
+            max_bytes = float(os.environ.get('OSINT_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = int(max_bytes)
+        if bypass is None:
+            bypass = os.environ.get('OSINT_CACHE_BYPASS', '').lower() in ('1', 'true', 'yes', 'on')
+        self.bypass = bypass
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'stores': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._index = None  # path -> (mtime, size), built on first write
+        self._bytes = 0
+
+    def ttl(self, analysis):
+        return self.ttls.get(analysis, DEFAULT_TTL)
+
+    def path_for(self, analysis, target):
+        key = hashlib.sha256(normalize_target(analysis, target).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, analysis, key[:32] + '.json')
+
+    def _existing(self, path):
+        for candidate in (path, path + ENCRYPTED_SUFFIX):
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def _count(self, outcome, analysis):
+        self.stats[outcome] += 1
+        metrics.inc('osint_cache_total', analysis=analysis, outcome=outcome)
+
+    def get_entry(self, analysis, target):
+        """Return the stored entry dict if present and fresh, else None"""
+        if self.bypass:
+            self._count('misses', analysis)
+            return None
+
+        path = self._existing(self.path_for(analysis, target))
+        entry = None
+        if path:
+            try:
+                with open_for_read(path) as f:
+                    entry = serialize.load(f)
+            except (OSError, ValueError, SecureStoreError):
+                entry = None
+
+        if entry is None:
+            self._count('misses', analysis)
+            return None
+
+        if time.time() - entry.get('stored_at', 0) > self.ttl(analysis):
+            self._count('stale', analysis)
+            return None
+
+        self._count('hits', analysis)
+        return entry
+
+    def get(self, analysis, target):
+        """Cached result for target, or None when missing, stale or bypassed"""
+        entry = self.get_entry(analysis, target)
+        return entry['result'] if entry else None
+
+    def put(self, analysis, target, result):
+        """Store a result; returns True if its content differs from the previous entry"""
+        path = self.path_for(analysis, target)
+        digest = content_digest(result)
+
+        previous = self._existing(path)
+        changed = True
+        if previous:
+            try:
+                with open_for_read(previous) as f:
+                    changed = serialize.load(f).get('digest') != digest
+            except (OSError, ValueError, SecureStoreError):
+                pass
+
+        entry = {
+            'analysis': analysis,
+            'target': normalize_target(analysis, target),
+            'stored_at': time.time(),
+            'digest': digest,
+            'result': result,
+        }
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f, written = open_for_write(path)
+        with f:
+            serialize.dump(entry, f, pretty=False)
+
+        # Encryption may have been toggled since the previous write
+        if previous and previous != written:
+            with self._lock:
+                self._remove(previous)
+
+        self._count('stores', analysis)
+        self._track(written)
+        return changed
+
+    def age(self, entry):
+        return time.time() - entry.get('stored_at', 0)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        if self._index is not None and path in self._index:
+            self._bytes -= self._index.pop(path)[1]
+
+    def _scan(self):
+        index = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                index[path] = (st.st_mtime, st.st_size)
+        return index
+
+    def _track(self, path):
+        """Record a write and evict the oldest entries past the size bound"""
+        with self._lock:
+            if self._index is None:
+                self._index = self._scan()
+                self._bytes = sum(size for _, size in self._index.values())
+            try:
+                st = os.stat(path)
+            except OSError:
+                return
+            self._bytes += st.st_size - self._index.get(path, (0, 0))[1]
+            self._index[path] = (st.st_mtime, st.st_size)
+
+            if self._bytes <= self.max_bytes:
+                return
+
+            target = self.max_bytes * EVICT_TARGET
+            for old in sorted(self._index, key=lambda p: self._index[p][0]):
+                if self._bytes <= target:
+                    break
+                if old != path:
+                    self._remove(old)
+                    self.stats['evicted'] += 1
+
+    def clear(self):
+        import shutil
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._index = None
+            self._bytes = 0
+
+    def summary(self):
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['stale']
+        return dict(self.stats, lookups=lookups, bypass=self.bypass,
+                    hit_rate=round(self.stats['hits'] / lookups, 3) if lookups else 0.0)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide result cache"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ResultCache()
+        return _shared
+
+
+def reset_cache(cache=None):
+    """Replace the shared cache (None rebuilds it from the environment)"""
+    global _shared
+    with _shared_lock:
+        _shared = cache
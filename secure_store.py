@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+🔐 Secure Store
+Chunked AES-256-GCM encryption for reports, exports and cache at rest
+
+File layout:
+    header  = magic(4) | version(1) | chunk_size(4) | nonce_prefix(7)
+    chunk i = AES-GCM(key, nonce_prefix | i (4 bytes) | last (1 byte), data, aad=header)
+
+Every chunk except the last holds exactly chunk_size bytes of plaintext,
+so any chunk can be located and decrypted on its own. The last-chunk flag
+in the nonce stops truncated files from decrypting cleanly.
+"""
+
+import io
+import os
+import sys
+import base64
+import struct
+
+MAGIC = b'OSE1'
+VERSION = 1
+HEADER = struct.Struct('>4sBI7s')
+TAG_SIZE = 16
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+ENCRYPTED_SUFFIX = '.enc'
+
+KEY_ENV = 'OSINT_ENCRYPTION_KEY'
+KEY_FILE_ENV = 'OSINT_KEY_FILE'
+ENABLE_ENV = 'OSINT_ENCRYPT'
+DEFAULT_KEY_FILE = os.path.join(os.path.expanduser('~'), '.osint_collector.key')
+
+
+class SecureStoreError(Exception):
+    """Raised for malformed or tampered encrypted files"""
+
+
+def _aead(key):
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    return AESGCM(key)
+
+
+def _nonce(prefix, index, last):
+    return prefix + struct.pack('>IB', index, 1 if last else 0)
+
+
+def key_file_path():
+    return os.environ.get(KEY_FILE_ENV, DEFAULT_KEY_FILE)
+
+
+def generate_key(path=None):
+    """Create a new random 256-bit key file readable only by the owner"""
+    path = path or key_file_path()
+    key = os.urandom(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(base64.urlsafe_b64encode(key))
+    return path
+
+
+def load_key():
+    """Load the key from the environment or key file, or None"""
+    encoded = os.environ.get(KEY_ENV)
+    if not encoded:
+        try:
+            with open(key_file_path(), 'rb') as f:
+                encoded = f.read().strip()
+        except OSError:
+            return None
+
+    key = base64.urlsafe_b64decode(encoded)
+    if len(key) != 32:
+        raise SecureStoreError("Encryption key must be 32 bytes")
+    return key
+
+
+def encryption_enabled():
+    """True when at-rest encryption is switched on"""
+    return os.environ.get(ENABLE_ENV, '0').lower() in ('1', 'true', 'yes', 'on')
+
+
+def set_encryption_enabled(enabled):
+    os.environ[ENABLE_ENV] = '1' if enabled else '0'
+
+
+class EncryptedWriter(io.RawIOBase):
+    """Write-only stream that encrypts one chunk at a time"""
+
+    def __init__(self, fileobj, key, chunk_size=DEFAULT_CHUNK_SIZE):
+        self._file = fileobj
+        self._aead = _aead(key)
+        self._chunk_size = chunk_size
+        self._prefix = os.urandom(7)
+        self._header = HEADER.pack(MAGIC, VERSION, chunk_size, self._prefix)
+        self._buffer = bytearray(chunk_size)
+        self._filled = 0
+        self._index = 0
+        self._file.write(self._header)
+
+    def writable(self):
+        return True
+
+    def _emit(self, data, last):
+        nonce = _nonce(self._prefix, self._index, last)
+        self._file.write(self._aead.encrypt(nonce, data, self._header))
+        self._index += 1
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError("write to closed file")
+        data = memoryview(data).cast('B')
+        size = len(data)
+        chunk_size = self._chunk_size
+        pos = 0
+
+        # A full chunk is only encrypted once more data arrives,
+        # so close() can still mark the final chunk as last
+        while pos < size:
+            if self._filled == chunk_size:
+                self._emit(self._buffer, False)
+                self._filled = 0
+            take = min(chunk_size - self._filled, size - pos)
+            self._buffer[self._filled:self._filled + take] = data[pos:pos + take]
+            self._filled += take
+            pos += take
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._emit(memoryview(self._buffer)[:self._filled], True)
+            self._file.close()
+        super().close()
+
+
+class EncryptedReader(io.RawIOBase):
+    """Seekable read-only stream that decrypts chunks on demand"""
+
+    def __init__(self, fileobj, key):
+        self._file = fileobj
+        self._aead = _aead(key)
+        self._header = fileobj.read(HEADER.size)
+        if len(self._header) != HEADER.size:
+            raise SecureStoreError("Truncated header")
+
+        magic, version, chunk_size, self._prefix = HEADER.unpack(self._header)
+        if magic != MAGIC or version != VERSION:
+            raise SecureStoreError("Not an encrypted OSINT file")
+        # The header is not authenticated until the first chunk decrypts
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise SecureStoreError(f"Invalid chunk size {chunk_size}")
+
+        self._chunk_size = chunk_size
+        body = fileobj.seek(0, io.SEEK_END) - HEADER.size
+        stored = chunk_size + TAG_SIZE
+        self._chunks = max(1, -(-body // stored))
+        self._size = body - self._chunks * TAG_SIZE
+        if self._size < 0:
+            raise SecureStoreError("Truncated file")
+
+        self._pos = 0
+        self._cached_index = None
+        self._cached = b''
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def chunk_count(self):
+        return self._chunks
+
+    def read_chunk(self, index):
+        """Decrypt and return plaintext chunk number index"""
+        if not 0 <= index < self._chunks:
+            raise IndexError("chunk index out of range")
+        if index == self._cached_index:
+            return self._cached
+
+        stored = self._chunk_size + TAG_SIZE
+        self._file.seek(HEADER.size + index * stored)
+        last = index == self._chunks - 1
+        data = self._file.read(stored)
+
+        from cryptography.exceptions import InvalidTag
+        try:
+            plain = self._aead.decrypt(_nonce(self._prefix, index, last), data, self._header)
+        except InvalidTag:
+            raise SecureStoreError(f"Chunk {index} failed authentication")
+
+        self._cached_index, self._cached = index, plain
+        return plain
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def readinto(self, buffer):
+        out = memoryview(buffer).cast('B')
+        written = 0
+        while written < len(out) and self._pos < self._size:
+            index, offset = divmod(self._pos, self._chunk_size)
+            chunk = memoryview(self.read_chunk(index))
+            take = min(len(chunk) - offset, len(out) - written)
+            out[written:written + take] = chunk[offset:offset + take]
+            written += take
+            self._pos += take
+        return written
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_encrypted(path, mode='rb', key=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+    """Open an encrypted file like the builtin open() ('r', 'rb', 'w', 'wb')"""
+    key = key or load_key()
+    if key is None:
+        raise SecureStoreError("No encryption key configured")
+
+    if mode.startswith('r'):
+        raw = EncryptedReader(open(path, 'rb'), key)
+        stream = io.BufferedReader(raw, buffer_size=chunk_size)
+    elif mode.startswith('w'):
+        # The writer buffers a whole chunk itself
+        stream = EncryptedWriter(open(path, 'wb'), key, chunk_size)
+    else:
+        raise ValueError(f"Unsupported mode: {mode}")
+
+    if 'b' in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding)
+
+
+def open_for_write(path, mode='w', encoding='utf-8', encrypt=None):
+    """Open path for writing, encrypting when enabled (or when encrypt says so);
+    returns (file, actual_path)"""
+    if encryption_enabled() if encrypt is None else encrypt:
+        path += ENCRYPTED_SUFFIX
+        return open_encrypted(path, mode, encoding=encoding), path
+    if 'b' in mode:
+        return open(path, mode), path
+    return open(path, mode, encoding=encoding), path
+
+
+def open_for_read(path, mode='r', encoding='utf-8'):
+    """Open a possibly encrypted file for reading based on its suffix"""
+    if path.endswith(ENCRYPTED_SUFFIX):
+        return open_encrypted(path, mode, encoding=encoding)
+    if 'b' in mode:
+        return open(path, mode)
+    return open(path, mode, encoding=encoding)
+
+
+def _copy(src, dst, chunk_size=DEFAULT_CHUNK_SIZE):
+    while True:
+        data = src.read(chunk_size)
+        if not data:
+            break
+        dst.write(data)
+
+
+def encrypt_file(src_path, dst_path=None, key=None):
+    """Encrypt a file with constant memory"""
+    dst_path = dst_path or src_path + ENCRYPTED_SUFFIX
+    with open(src_path, 'rb') as src, open_encrypted(dst_path, 'wb', key=key) as dst:
+        _copy(src, dst)
+    return dst_path
+
+
+def decrypt_file(src_path, dst_path=None, key=None):
+    """Decrypt a file with constant memory"""
+    if dst_path is None:
+        dst_path = src_path[:-len(ENCRYPTED_SUFFIX)] if src_path.endswith(ENCRYPTED_SUFFIX) else src_path + '.dec'
+    with open_encrypted(src_path, 'rb', key=key) as src, open(dst_path, 'wb') as dst:
+        _copy(src, dst)
+    return dst_path
+
+
+def main():
+    usage = "Usage: secure_store.py keygen | encrypt <file> | decrypt <file.enc>"
+    if len(sys.argv) < 2:
+        print(usage)
+        return
+
+    command = sys.argv[1]
+    if command == 'keygen':
+        print(f"✅ Key written to: {generate_key()}")
+    elif command == 'encrypt' and len(sys.argv) > 2:
+        print(f"✅ Encrypted: {encrypt_file(sys.argv[2])}")
+    elif command == 'decrypt' and len(sys.argv) > 2:
+        print(f"✅ Decrypted: {decrypt_file(sys.argv[2])}")
+    else:
+        print(usage)
+
+
+if __name__ == "__main__":
+    main()
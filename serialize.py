@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+🧾 Serialization
+One JSON layer for reports, cache entries, batch output and exports
+
+Uses orjson or msgspec when installed and the stdlib json module
+otherwise; every backend produces the same documents. Project types are
+encoded explicitly (datetimes as ISO 8601, tuples and namedtuples as
+lists, sets as sorted lists, phone numbers as E.164) instead of falling
+back to str() for everything.
+
+Configuration (environment):
+    OSINT_JSON_BACKEND   auto (default), orjson, msgspec or json
+    OSINT_JSON_COMPACT   1 to write reports without indentation
+"""
+
+import os
+import json
+import datetime
+import decimal
+import enum
+import pathlib
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKENDS = ('orjson', 'msgspec', 'json')
+
+
+def encode_default(obj):
+    """Encoder for types the JSON backends don't handle natively"""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, tuple):
+        return list(obj)
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (decimal.Decimal, pathlib.PurePath)):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', 'replace')
+    if type(obj).__name__ == 'PhoneNumber':
+        import phonenumbers
+        return phonenumbers.format_number(obj, phonenumbers.PhoneNumberFormat.E164)
+    # Anything else (exceptions, resolver answers) is kept as its text
+    return str(obj)
+
+
+def available_backends():
+    return [name for name, module in zip(BACKENDS, (orjson, msgspec, json)) if module is not None]
+
+
+class Serializer:
+    def __init__(self, backend=None, compact=None):
+        backend = backend or os.environ.get('OSINT_JSON_BACKEND', 'auto')
+        if backend == 'auto':
+            backend = available_backends()[0]
+        if backend not in available_backends():
+            raise ValueError(f"JSON backend not available: {backend}")
+        self.backend = backend
+        if compact is None:
+            compact = os.environ.get('OSINT_JSON_COMPACT', '0').lower() in ('1', 'true', 'yes', 'on')
+        self.compact = compact
+
+        if backend == 'msgspec':
+            self._encoder = msgspec.json.Encoder(enc_hook=encode_default)
+            self._sorted_encoder = msgspec.json.Encoder(enc_hook=encode_default, order='sorted')
+            self._decoder = msgspec.json.Decoder()
+
+    def dumpb(self, obj, pretty=False, sort_keys=False):
+        """Encode obj as UTF-8 JSON bytes"""
+        if self.backend == 'orjson':
+            option = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=encode_default, option=option)
+
+        if self.backend == 'msgspec':
+            encoder = self._sorted_encoder if sort_keys else self._encoder
+            data = encoder.encode(obj)
+            return msgspec.json.format(data, indent=2) if pretty else data
+
+        return self.dumps(obj, pretty, sort_keys).encode('utf-8')
+
+    def dumps(self, obj, pretty=False, sort_keys=False):
+        """Encode obj as a JSON string"""
+        if self.backend != 'json':
+            return self.dumpb(obj, pretty, sort_keys).decode('utf-8')
+        return json.dumps(obj, default=encode_default, ensure_ascii=False,
+                          sort_keys=sort_keys, indent=2 if pretty else None,
+                          separators=(',', ': ') if pretty else (',', ':'))
+
+    def loads(self, data):
+        if self.backend == 'orjson':
+            return orjson.loads(data)
+        if self.backend == 'msgspec':
+            try:
+                return self._decoder.decode(data.encode('utf-8') if isinstance(data, str) else data)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+        return json.loads(data)
+
+    def dump(self, obj, f, pretty=None):
+        """Write obj to a text file; pretty defaults to the report setting"""
+        f.write(self.dumps(obj, pretty=not self.compact if pretty is None else pretty))
+
+    def load(self, f):
+        return self.loads(f.read())
+
+
+_shared = None
+
+
+def get_serializer():
+    global _shared
+    if _shared is None:
+        _shared = Serializer()
+    return _shared
+
+
+def reset_serializer(serializer=None):
+    """Replace the shared serializer (None rebuilds it from the environment)"""
+    global _shared
+    _shared = serializer
+
+
+def dumps(obj, pretty=False, sort_keys=False):
+    return get_serializer().dumps(obj, pretty, sort_keys)
+
+
+def dumpb(obj, pretty=False, sort_keys=False):
+    return get_serializer().dumpb(obj, pretty, sort_keys)
+
+
+def loads(data):
+    return get_serializer().loads(data)
+
+
+def dump(obj, f, pretty=None):
+    get_serializer().dump(obj, f, pretty)
+
+
+def load(f):
+    return get_serializer().load(f)
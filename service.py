@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+🛰️ Analysis Service
+Long-running local HTTP/JSON API over the analyzers (asyncio, stdlib only)
+
+Keeps the DNS resolver, result cache and phonenumbers metadata warm
+between calls. Concurrent requests for the same canonical target share
+one in-flight computation; each caller gets a copy re-stamped with the
+spelling it asked for.
+
+    python service.py --accept-terms [--host 127.0.0.1] [--port 8765]
+
+    GET  /v1/<phone|email|domain|mx|spf>?target=...
+    POST /v1/batch      {"analysis": "email", "targets": [...]}
+    GET  /health | /stats | /metrics
+
+Configuration (environment):
+    OSINT_SERVICE_THREADS   analyzer threads (default 16)
+    OSINT_SERVICE_MAX_BATCH largest accepted batch (default 10000)
+"""
+
+import os
+import sys
+import asyncio
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import metrics
+import serialize
+from dedup import canonical
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BODY = 10 * 1024 * 1024
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisService:
+    def __init__(self, analyzers, threads=None, max_batch=None, restamp=None):
+        self.analyzers = analyzers  # name -> blocking callable(target)
+        self.restamp = restamp      # (analysis, target, shared result) -> result for that spelling
+        threads = threads or int(os.environ.get('OSINT_SERVICE_THREADS', 16))
+        self.max_batch = max_batch or int(os.environ.get('OSINT_SERVICE_MAX_BATCH', 10000))
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix='analyzer')
+        self.stats = {'requests': 0, 'computed': 0, 'coalesced': 0, 'errors': 0}
+        self._inflight = {}
+
+    async def analyze(self, analysis, target):
+        """Result for one target, joining an identical in-flight computation if any"""
+        if analysis not in self.analyzers:
+            raise HTTPError(404, f"Unknown analysis: {analysis}")
+
+        key = (analysis, canonical(analysis, target))
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            metrics.inc('osint_service_coalesced_total', analysis=analysis)
+            result = await asyncio.shield(future)
+            return result if self.restamp is None else self.restamp(analysis, target, result)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._compute, analysis, target)
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._inflight.pop(key, None)
+            else:
+                # Our caller went away; drop the entry once the work finishes
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+    def _compute(self, analysis, target):
+        self.stats['computed'] += 1
+        with metrics.timed(f"service_{analysis}"):
+            return self.analyzers[analysis](target)
+
+    async def analyze_many(self, analysis, targets):
+        """Results in input order; duplicate identities are computed once"""
+        async def one(target):
+            try:
+                return {'target': target, 'result': await self.analyze(analysis, target)}
+            except HTTPError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                return {'target': target, 'error': str(e)}
+
+        return await asyncio.gather(*(one(str(t)) for t in targets))
+
+    async def handle(self, method, path, query, body):
+        """Route one request; returns (status, payload)"""
+        self.stats['requests'] += 1
+        parts = [p for p in path.split('/') if p]
+
+        if parts == ['health']:
+            return 200, {'status': 'ok', 'analyzers': sorted(self.analyzers)}
+        if parts == ['stats']:
+            return 200, dict(self.stats, inflight=len(self._inflight))
+        if parts == ['metrics']:
+            return 200, metrics.REGISTRY.to_prometheus()
+
+        if len(parts) == 2 and parts[0] == 'v1' and parts[1] == 'batch':
+            if method != 'POST':
+                raise HTTPError(405, "Use POST for batches")
+            try:
+                request = serialize.loads(body or b'{}')
+            except ValueError:
+                raise HTTPError(400, "Body must be JSON")
+            targets = request.get('targets')
+            if not isinstance(targets, list):
+                raise HTTPError(400, "'targets' must be a list")
+            if len(targets) > self.max_batch:
+                raise HTTPError(413, f"At most {self.max_batch} targets per batch")
+            results = await self.analyze_many(request.get('analysis', ''), targets)
+            return 200, {'analysis': request.get('analysis'), 'results': results}
+
+        if len(parts) == 2 and parts[0] == 'v1':
+            target = (query.get('target') or [''])[0].strip()
+            if not target:
+                raise HTTPError(400, "Missing 'target' parameter")
+            return 200, {'analysis': parts[1], 'target': target,
+                         'result': await self.analyze(parts[1], target)}
+
+        raise HTTPError(404, f"No route for {path}")
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = serialize.dumpb(payload), 'application/json'
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _client(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it closes"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'Malformed request line'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0) or 0)
+                keep_alive = (headers.get('connection', '').lower() != 'close'
+                              and version.upper() == 'HTTP/1.1')
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': 'Body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                url = urlsplit(target)
+                try:
+                    status, payload = await self.handle(method.upper(), url.path, parse_qs(url.query), body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    status, payload = 500, {'error': str(e)}
+
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self._client, host, port)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+def load_script(module_name, filename):
+    """Import one of the top-level scripts (their filenames contain spaces)"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_analyzers(collector, hunter):
+    """Service analyzers backed by the collector (cached) and the email hunter"""
+    def email(target):
+        result = collector.analyze_target('email', target)
+        if 'error' not in result:
+            result = dict(result,
+                          provider=hunter.classify_provider(
+                              result['domain'], result['mx_records'].get('servers')),
+                          role_account=hunter.is_role_account(result['email']))
+        return result
+
+    return {
+        'phone': lambda target: collector.analyze_target('phone', target),
+        'email': email,
+        'domain': lambda target: collector.analyze_target('domain', target),
+        'mx': collector.check_mx_records,
+        'spf': lambda target: collector.analyze_target('spf', target),
+    }
+
+
+def build_restamp(collector, hunter):
+    """Rewrite a coalesced result for another spelling of the same target"""
+    def restamp(analysis, target, result):
+        respelled = collector.restamp(analysis, target, result)
+        if analysis == 'email' and respelled is not result:
+            respelled = dict(respelled, role_account=hunter.is_role_account(respelled['email']))
+        return respelled
+
+    return restamp
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    collector = load_script('osint_collector', 'osint collector.py').OSINTCollector()
+    hunter = load_script('email_hunter', 'email hunter.py').EmailHunter()
+    service = AnalysisService(build_analyzers(collector, hunter), restamp=build_restamp(collector, hunter))
+
+    # Load phonenumbers metadata and the DNS resolver before taking traffic
+    await asyncio.gather(service.analyze('phone', '+94771234567'), return_exceptions=True)
+
+    server = await service.start(host, port)
+    print(f"🛰️  Analysis service listening on http://{host}:{port}")
+    collector.logger.info(f"Service started on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    args = sys.argv[1:]
+    if '--accept-terms' not in args:
+        print("⚠️  Educational & authorized use only.")
+        print("Run with --accept-terms to confirm you have permission to research the targets you submit.")
+        return
+
+    host = args[args.index('--host') + 1] if '--host' in args else DEFAULT_HOST
+    port = int(args[args.index('--port') + 1]) if '--port' in args else DEFAULT_PORT
+    try:
+        asyncio.run(serve(host, port))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+🛡️ SPF & DMARC Audit
+Resolve SPF include/redirect chains and DMARC policies for many domains
+
+Names are fetched a level at a time: every TXT record the current
+frontier needs (each domain, its _dmarc name, then the includes and
+redirects those records name) is resolved concurrently, and each record
+is fetched at most once per memo TTL, even when several audits ask for
+it at the same moment. Shared provider includes such as _spf.google.com
+therefore cost one query for the whole batch, and an audit costs about
+one query per distinct record. Expired records are dropped from the memo
+as new fetches come in, so a long-lived auditor stays bounded by what it
+fetched within one TTL.
+
+Evaluation follows RFC 7208 limits: at most 10 DNS-querying terms
+(include, a, mx, ptr, exists, redirect) across the whole chain and at
+most 2 void lookups; loops and include targets without SPF are errors.
+
+    python spf.py audit domains.txt [--out exports/spf_audit.jsonl]
+    python spf.py example.com
+
+Configuration (environment):
+    OSINT_SPF_WORKERS   concurrent TXT lookups (default 16)
+    OSINT_SPF_MEMO_TTL  seconds a fetched record is reused (default 3600)
+"""
+
+import os
+import sys
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+import metrics
+import serialize
+
+LOOKUP_LIMIT = 10
+VOID_LIMIT = 2
+DNS_TERMS = ('include', 'a', 'mx', 'ptr', 'exists', 'redirect')
+QUALIFIERS = '+-~?'
+
+# Record states in the memo
+MISSING = 'missing'    # NXDOMAIN / no answer: a void lookup
+FAILED = 'failed'      # timeout or SERVFAIL: temperror
+
+
+def parse_spf(text):
+    """(terms, modifiers) of an SPF record; terms are (qualifier, mechanism, value)"""
+    terms, modifiers = [], {}
+    for token in text.split()[1:]:
+        name, eq, value = token.partition('=')
+        if eq and ':' not in name and '/' not in name:
+            modifiers[name.lower()] = value
+            continue
+        qualifier = token[0] if token[0] in QUALIFIERS else '+'
+        mechanism, _, value = token.lstrip(QUALIFIERS).partition(':')
+        mechanism, slash, cidr = mechanism.partition('/')
+        terms.append((qualifier, mechanism.lower(), value or (slash + cidr if slash else '')))
+    return terms, modifiers
+
+
+def parse_dmarc(text):
+    """Tag dict of a DMARC record"""
+    tags = {}
+    for part in text.split(';'):
+        name, eq, value = part.partition('=')
+        if eq:
+            tags[name.strip().lower()] = value.strip()
+    return tags
+
+
+def _txt_strings(answers):
+    return [b''.join(r.strings).decode('utf-8', 'replace') for r in answers]
+
+
+class SPFAuditor:
+    """Memoized, concurrent SPF/DMARC resolution shared across a batch"""
+
+    def __init__(self, resolve=None, workers=None, memo_ttl=None):
+        if resolve is None:
+            from dns_tools import get_resolver
+            resolve = lambda name: get_resolver().resolve(name, 'TXT')
+        self.resolve = resolve
+        self.workers = workers or int(os.environ.get('OSINT_SPF_WORKERS', 16))
+        self.memo_ttl = memo_ttl or float(os.environ.get('OSINT_SPF_MEMO_TTL', 3600))
+        self.records = {}   # name -> list of TXT strings, MISSING or FAILED
+        self._fetched = {}  # name -> monotonic time of the fetch, oldest first
+        self._inflight = {}  # name -> Future set once its fetch is memoized
+        self.stats = {'queries': 0, 'memo_hits': 0, 'domains': 0}
+        self._lock = threading.Lock()
+
+    def _fetch(self, name):
+        from dns_tools import AUTHORITATIVE_ERRORS
+
+        try:
+            with metrics.timed('dns_txt'):
+                return _txt_strings(self.resolve(name))
+        except AUTHORITATIVE_ERRORS:
+            return MISSING
+        except Exception:
+            return FAILED
+
+    def _evict(self, now):
+        """Drop memo entries older than the TTL (caller holds the lock)"""
+        expired = []
+        for name, fetched in self._fetched.items():
+            if now - fetched < self.memo_ttl:
+                break
+            expired.append(name)
+        for name in expired:
+            del self._fetched[name]
+            self.records.pop(name, None)
+
+    def fetch_all(self, names):
+        """Resolve every name not already memoized or being fetched, concurrently
+
+        Returns {name: record} for the names as of this call, so an audit
+        keeps its records even if the memo evicts them before evaluation.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            found, wanted, waiting = {}, [], {}
+            for name in dict.fromkeys(names):
+                # Failures are retried; answers are reused until the memo TTL
+                record = self.records.get(name, FAILED)
+                if record is not FAILED:
+                    self.stats['memo_hits'] += 1
+                    found[name] = record
+                elif name in self._inflight:
+                    # Another audit is fetching it: wait for that answer instead of asking again
+                    self.stats['memo_hits'] += 1
+                    waiting[name] = self._inflight[name]
+                else:
+                    wanted.append(name)
+                    self._inflight[name] = Future()
+            self.stats['queries'] += len(wanted)
+
+        results = []
+        try:
+            if len(wanted) == 1:
+                results = [self._fetch(wanted[0])]
+            elif wanted:
+                with ThreadPoolExecutor(min(self.workers, len(wanted)), thread_name_prefix='spf') as pool:
+                    results = list(pool.map(self._fetch, wanted))
+        finally:
+            with self._lock:
+                now = time.monotonic()
+                for name, result in zip(wanted, results):
+                    self.records[name] = result
+                    # Re-insert so _fetched stays in fetch order for _evict
+                    self._fetched.pop(name, None)
+                    self._fetched[name] = now
+                done = [self._inflight.pop(name) for name in wanted]
+            for future, result in zip(done, results + [FAILED] * (len(done) - len(results))):
+                future.set_result(result)
+        found.update(zip(wanted, results))
+        for name, future in waiting.items():
+            found[name] = future.result()
+        return found
+
+    def spf_record(self, name, records=None):
+        """The name's SPF record text, MISSING, FAILED, or a list if it has several"""
+        strings = (self.records if records is None else records).get(name)
+        if strings in (MISSING, FAILED, None):
+            return strings
+        spf = [s for s in strings if s.lower() == 'v=spf1' or s.lower().startswith('v=spf1 ')]
+        if not spf:
+            return MISSING
+        return spf[0] if len(spf) == 1 else spf
+
+    def _targets(self, name, records):
+        """include/redirect names a fetched SPF record points at"""
+        record = self.spf_record(name, records)
+        if not isinstance(record, str):
+            return []
+        terms, modifiers = parse_spf(record)
+        targets = [value for _, mechanism, value in terms if mechanism == 'include' and value]
+        if 'redirect' in modifiers:
+            targets.append(modifiers['redirect'])
+        # Macros need a sender to expand; they are counted but not followed
+        return [t.rstrip('.').lower() for t in targets if '%' not in t]
+
+    def prefetch(self, domains):
+        """Fetch SPF chains (to the depth limit) and DMARC records for domains
+
+        Returns the records fetched or reused, for evaluating these domains.
+        """
+        frontier = list(domains) + [f"_dmarc.{d}" for d in domains]
+        seen = set(frontier)
+        records = {}
+        for _ in range(LOOKUP_LIMIT + 1):
+            records.update(self.fetch_all(frontier))
+            frontier = [t for name in frontier if not name.startswith('_dmarc.')
+                        for t in self._targets(name, records) if t not in seen]
+            seen.update(frontier)
+            if not frontier:
+                break
+        return records
+
+    def _walk(self, name, records, state, stack, top=False):
+        """Count lookups under one SPF record, collecting includes and errors"""
+        record = self.spf_record(name, records)
+        if record is FAILED or record is None:
+            state['errors'].append(f"temperror: {name} could not be resolved")
+            state['temperror'] = True
+            return
+        if record is MISSING:
+            return
+        if isinstance(record, list):
+            state['errors'].append(f"permerror: {name} has {len(record)} SPF records")
+            return
+
+        terms, modifiers = parse_spf(record)
+        for qualifier, mechanism, value in terms:
+            if mechanism in DNS_TERMS:
+                state['lookups'] += 1
+            if mechanism == 'all' and top:
+                state['all'] = qualifier + 'all'
+            if mechanism in ('ip4', 'ip6'):
+                state[mechanism] += 1
+            if mechanism == 'include':
+                self._follow(name, value, records, state, stack)
+
+        redirect = modifiers.get('redirect')
+        if redirect and not any(m == 'all' for _, m, _ in terms):
+            state['lookups'] += 1
+            self._follow(name, redirect, records, state, stack, top)
+
+    def _follow(self, parent, target, records, state, stack, top=False):
+        target = target.rstrip('.').lower()
+        if '%' in target:
+            state['macros'] += 1
+            return
+        if target in stack:
+            state['errors'].append(f"permerror: include loop at {target}")
+            return
+        if target not in state['includes']:
+            state['includes'].append(target)
+        if self.spf_record(target, records) is MISSING:
+            state['void'] += 1
+            state['errors'].append(f"permerror: {parent} includes {target}, which has no SPF record")
+            return
+        if state['lookups'] > LOOKUP_LIMIT:
+            # Already a permerror; evaluation stops here like a receiver's would
+            return
+        self._walk(target, records, state, stack + (target,), top)
+
+    def evaluate_spf(self, domain, records=None):
+        """SPF result from an audit's prefetched records, fetching them if not given"""
+        if records is None:
+            records = self.prefetch([domain])
+        record = self.spf_record(domain, records)
+        state = {'lookups': 0, 'void': 0, 'macros': 0, 'ip4': 0, 'ip6': 0, 'all': None,
+                 'includes': [], 'errors': [], 'temperror': False}
+        if record is not MISSING:
+            self._walk(domain, records, state, (domain,), top=True)
+        if state['lookups'] > LOOKUP_LIMIT:
+            state['errors'].append(f"permerror: {state['lookups']} DNS lookups (limit {LOOKUP_LIMIT})")
+        if state['void'] > VOID_LIMIT:
+            state['errors'].append(f"permerror: {state['void']} void lookups (limit {VOID_LIMIT})")
+
+        if record is MISSING:
+            status = 'none'
+        elif any(e.startswith('permerror') for e in state['errors']):
+            status = 'permerror'
+        elif state['temperror']:
+            status = 'temperror'
+        else:
+            status = 'ok'
+        return {
+            'record': record if isinstance(record, str) else None,
+            'status': status,
+            'lookups': state['lookups'],
+            'void_lookups': state['void'],
+            'all': state['all'],
+            'includes': state['includes'],
+            'ip4': state['ip4'],
+            'ip6': state['ip6'],
+            'macros': state['macros'],
+            'errors': state['errors'],
+        }
+
+    def evaluate_dmarc(self, domain, records=None):
+        if records is None:
+            records = self.fetch_all([f"_dmarc.{domain}"])
+        strings = records.get(f"_dmarc.{domain}")
+        if strings is FAILED:
+            return {'record': None, 'status': 'temperror', 'policy': None}
+        records = [] if strings in (MISSING, None) else [
+            s for s in strings if s.replace(' ', '').lower().startswith('v=dmarc1')]
+        if not records:
+            return {'record': None, 'status': 'none', 'policy': None}
+        if len(records) > 1:
+            return {'record': None, 'status': 'permerror', 'policy': None,
+                    'errors': [f"{len(records)} DMARC records"]}
+
+        tags = parse_dmarc(records[0])
+        policy = tags.get('p', '').lower() or None
+        return {
+            'record': records[0],
+            'status': 'ok' if policy in ('none', 'quarantine', 'reject') else 'permerror',
+            'policy': policy,
+            'subdomain_policy': tags.get('sp', policy),
+            'pct': int(tags['pct']) if tags.get('pct', '').isdigit() else 100,
+            'rua': [uri.strip() for uri in tags.get('rua', '').split(',') if uri.strip()],
+        }
+
+    def audit(self, domains):
+        """SPF and DMARC results for every domain, in input order"""
+        domains = [d.strip().rstrip('.').lower() for d in domains if d.strip()]
+        # Evaluate from this audit's own snapshot: other audits may evict memo entries meanwhile
+        records = self.prefetch(domains)
+        with self._lock:
+            self.stats['domains'] += len(domains)
+        return [{
+            'domain': domain,
+            'spf': self.evaluate_spf(domain, records),
+            'dmarc': self.evaluate_dmarc(domain, records),
+            'timestamp': datetime.now().isoformat(),
+        } for domain in domains]
+
+    def audit_domain(self, domain):
+        return self.audit([domain])[0]
+
+    def forget(self, name=None):
+        """Drop memoized records (all of them, or one name) so they are re-fetched"""
+        with self._lock:
+            if name is None:
+                self.records.clear()
+                self._fetched.clear()
+            else:
+                self.records.pop(name, None)
+                self._fetched.pop(name, None)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_auditor():
+    """Process-wide auditor so includes are memoized across a whole batch"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SPFAuditor()
+        return _shared
+
+
+def reset_auditor(auditor=None):
+    """Replace the shared auditor (None builds a fresh one on next use)"""
+    global _shared
+    with _shared_lock:
+        _shared = auditor
+
+
+def print_audit(result):
+    spf, dmarc = result['spf'], result['dmarc']
+    print(f"\n🛡️  {result['domain']}")
+    if spf['record']:
+        print(f"  • SPF: {spf['status']} ({spf['lookups']}/{LOOKUP_LIMIT} lookups, {spf['all'] or 'no all'})")
+        if spf['includes']:
+            print(f"    Includes: {', '.join(spf['includes'])}")
+    else:
+        print(f"  • SPF: {'Lookup failed' if spf['status'] == 'temperror' else 'Not found'}")
+    for error in spf['errors']:
+        print(f"    ⚠️  {error}")
+    if dmarc['record']:
+        print(f"  • DMARC: p={dmarc['policy']} sp={dmarc['subdomain_policy']} pct={dmarc['pct']}")
+    else:
+        print(f"  • DMARC: {'Lookup failed' if dmarc['status'] == 'temperror' else 'Not found'}")
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: spf.py audit <domains file> [--out file.jsonl] | spf.py <domain> ...")
+        return
+
+    auditor = get_auditor()
+    if args[0] != 'audit':
+        for result in auditor.audit(args):
+            print_audit(result)
+        return
+
+    from platforms import read_values
+    from secure_store import open_for_write
+
+    output = (args[args.index('--out') + 1] if '--out' in args else
+              os.path.join('exports', f"spf_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"))
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+
+    results = auditor.audit(read_values(args[1]))
+    f, path = open_for_write(output)
+    with f:
+        for result in results:
+            f.write(serialize.dumps(result) + '\n')
+
+    statuses = {}
+    for result in results:
+        statuses[result['spf']['status']] = statuses.get(result['spf']['status'], 0) + 1
+    print(f"✅ Audited {len(results)} domains with {auditor.stats['queries']} TXT queries: {statuses}")
+    print(f"📁 Results: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Chunked pandas rollups over stored email and phone results
+"""
+
+from collections import Counter
+
+import serialize
+from analytics import iter_records, rollup, run_analytics
+from batch_jobs import BatchJob
+from mail_providers import ProviderIndex
+from report_store import save_report
+
+PROVIDERS = ProviderIndex([('Google', 'domain', 'gmail.com'), ('Microsoft', 'domain', 'outlook.com'),
+                           ('Microsoft 365', 'mx', '*.mail.protection.outlook.com')])
+ROLES = ('admin', 'info', 'support')
+
+
+def email(address, disposable=False, has_mx=True):
+    username, domain = address.split('@')
+    servers = [domain.replace('.', '-') + '.mail.protection.outlook.com.'] if has_mx else []
+    return {'email': address, 'username': username, 'domain': domain, 'disposable': disposable,
+            'mx_records': {'has_mx': has_mx, 'servers': servers}}
+
+
+def phone(country, carrier, valid=True):
+    return {'international': '+94 77 123 4567', 'country': country, 'carrier': carrier,
+            'type': 'Mobile', 'valid': valid}
+
+
+def test_chunked_rollup_matches_plain_counts():
+    records = []
+    for i in range(257):
+        domain = ('gmail.com', 'corp.example', 'outlook.com', 'temp-mail.org')[i % 4]
+        local = ('admin', 'jane', 'info.desk', 'bob')[i % 3]
+        records.append(('email', email(f"{local}{i}@{domain}", domain == 'temp-mail.org', i % 5 != 0)))
+        records.append(('phone', phone(('Sri Lanka', 'India', '')[i % 3], ('Dialog', 'Airtel')[i % 2], i % 7 != 0)))
+
+    summary = rollup(records, chunk_rows=50, providers=PROVIDERS, role_keywords=ROLES).result(top=10)
+    emails = [r for kind, r in records if kind == 'email']
+    phones = [r for kind, r in records if kind == 'phone']
+
+    assert summary['emails']['total'] == 257
+    assert summary['emails']['domains'] == 4
+    assert summary['emails']['disposable_rate'] == round(sum(r['disposable'] for r in emails) / 257, 4)
+    assert summary['emails']['mx_coverage'] == round(sum(r['mx_records']['has_mx'] for r in emails) / 257, 4)
+    roles = sum(any(k in r['username'] for k in ROLES) for r in emails)
+    assert summary['emails']['role_rate'] == round(roles / 257, 4)
+    assert summary['emails']['providers'] == dict(Counter(
+        PROVIDERS.classify(r['domain'], r['mx_records']['servers']) for r in emails))
+    assert summary['emails']['providers']['Microsoft 365'] > 0
+    top = summary['emails']['top_domains'][0]
+    assert top['domain'] == 'gmail.com' and top['count'] == 65
+
+    assert summary['phones']['total'] == 257
+    assert summary['phones']['valid_rate'] == round(sum(r['valid'] for r in phones) / 257, 4)
+    assert summary['phones']['countries'] == dict(Counter(r['country'] or 'Unknown' for r in phones))
+    assert summary['phones']['carriers'] == {'Dialog': 129, 'Airtel': 128}
+
+
+def test_records_come_from_reports_and_batch_jobs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_report('reports/email_20240102_030405.json', email('admin@gmail.com'))
+    save_report('reports/phone_20240102_030405.json', phone('Sri Lanka', 'Dialog'))
+    save_report('reports/username_bob_20240102_030405.json', {'username': 'bob'})
+
+    targets = tmp_path / 'targets.txt'
+    targets.write_text('jane@corp.example\nbroken\n')
+    job = BatchJob('email', str(targets))
+    job.run(lambda t: email(t) if '@' in t else {'email': t, 'error': 'Invalid email format'})
+
+    assert sorted(kind for kind, _ in iter_records()) == ['email', 'email', 'phone']
+
+    summary, path = run_analytics(top=5)
+    assert summary['emails']['total'] == 2
+    assert summary['phones']['countries'] == {'Sri Lanka': 1}
+    with open(path, encoding='utf-8') as f:
+        assert serialize.load(f)['emails']['domains'] == 2
@@ -0,0 +1,134 @@
+"""
+Checkpointed batch jobs resume where they stopped
+"""
+
+import pytest
+
+from batch_jobs import BatchJob, RECORD
+
+
+def write_input(tmp_path, lines):
+    path = tmp_path / 'targets.txt'
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+def test_rerun_skips_completed_targets(tmp_path):
+    input_path = write_input(tmp_path, ['a', '# comment', 'b', '', 'c'])
+    jobs_dir = str(tmp_path / 'jobs')
+    seen = []
+
+    def analyze(target):
+        seen.append(target)
+        if target == 'b':
+            raise KeyboardInterrupt
+        return {'target': target.upper()}
+
+    job = BatchJob('email', input_path, 'job1', jobs_dir)
+    with pytest.raises(KeyboardInterrupt):
+        job.run(analyze)
+
+    job = BatchJob('email', input_path, 'job1', jobs_dir)
+    stats = job.run(lambda t: seen.append(t) or {'target': t.upper()})
+
+    assert seen == ['a', 'b', 'b', 'c']
+    assert stats['done'] == 2
+    assert dict(job.iter_results()) == {t: {'target': t.upper()} for t in 'abc'}
+
+
+def test_torn_journal_record_and_lost_output_are_redone(tmp_path):
+    input_path = write_input(tmp_path, ['a', 'b', 'c'])
+    jobs_dir = str(tmp_path / 'jobs')
+    job = BatchJob('phone', input_path, 'job2', jobs_dir)
+    job.run(lambda t: {'n': t})
+
+    # Simulate a crash: half a journal record and the last output line lost
+    with open(job.journal.path, 'ab') as f:
+        f.write(b'\x01' * (RECORD.size // 2))
+    results = tmp_path / 'jobs' / 'job2' / 'results-0.jsonl'
+    lines = results.read_text().splitlines(keepends=True)
+    results.write_text(''.join(lines[:2]))
+
+    seen = []
+    job = BatchJob('phone', input_path, 'job2', jobs_dir)
+    assert job.completed == 2
+    job.run(lambda t: seen.append(t) or {'n': t})
+
+    assert seen == ['c']
+    assert sorted(t for t, _ in job.iter_results()) == ['a', 'b', 'c']
+
+
+def test_job_id_is_tied_to_analysis_type(tmp_path):
+    input_path = write_input(tmp_path, ['a'])
+    BatchJob('email', input_path, 'job3', str(tmp_path / 'jobs'))
+
+    with pytest.raises(ValueError):
+        BatchJob('domain', input_path, 'job3', str(tmp_path / 'jobs'))
+
+
+def test_collector_batch_uses_cache(tmp_path, collector, stub_dns):
+    input_path = write_input(tmp_path, ['John@Gmail.com', 'not-an-email', 'john@gmail.com'])
+
+    job, stats = collector.run_batch_job('email', input_path)
+
+    results = list(job.iter_results())
+    assert stats['done'] == 3
+    assert results[0][1]['mx_records']['has_mx']
+    assert results[1][1]['error'] == 'Invalid email format'
+    assert results[2][1] == results[0][1]
+
+
+def test_duplicate_spellings_reuse_the_first_result(tmp_path):
+    input_path = write_input(tmp_path, ['a.b@gmail.com', 'ab+x@gmail.com', 'c@example.com'])
+    from dedup import canonical_email
+    seen = []
+
+    job = BatchJob('email', input_path, 'job4', str(tmp_path / 'jobs'))
+    stats = job.run(lambda t: seen.append(t) or {'n': t, 'mx': 'shared'}, canonical=canonical_email,
+                    restamp=lambda target, result: dict(result, n=target))
+
+    assert seen == ['a.b@gmail.com', 'c@example.com']
+    assert stats['duplicates'] == 1
+    assert dict(job.iter_results())['ab+x@gmail.com'] == {'n': 'ab+x@gmail.com', 'mx': 'shared'}
+
+
+def test_collector_batch_keeps_each_spelling(tmp_path, collector, stub_dns):
+    input_path = write_input(tmp_path, ['a.b@gmail.com', 'ab@gmail.com', 'A.B+x@gmail.com'])
+
+    job, stats = collector.run_batch_job('email', input_path)
+
+    results = dict(job.iter_results())
+    assert stats['duplicates'] == 2
+    for target, email, username in [('a.b@gmail.com', 'a.b@gmail.com', 'a.b'),
+                                    ('ab@gmail.com', 'ab@gmail.com', 'ab'),
+                                    ('A.B+x@gmail.com', 'a.b+x@gmail.com', 'a.b+x')]:
+        assert (results[target]['email'], results[target]['username']) == (email, username)
+        assert results[target]['social_profiles'] == collector.generate_social_links(username)
+    assert results['ab@gmail.com']['mx_records'] == results['a.b@gmail.com']['mx_records']
+
+
+def test_failed_targets_are_retried_on_resume(tmp_path):
+    input_path = write_input(tmp_path, ['a', 'b', 'c'])
+    jobs_dir = str(tmp_path / 'jobs')
+    seen = []
+
+    def flaky(target):
+        seen.append(target)
+        if target == 'a':
+            raise RuntimeError('resolver timeout')
+        if target == 'b':
+            return {'error': 'Invalid email format'}
+        return {'target': target.upper()}
+
+    job = BatchJob('email', input_path, 'job1', jobs_dir)
+    stats = job.run(flaky, canonical=str.lower)
+    assert stats['errors'] == 1 and stats['done'] == 2
+    assert dict(job.iter_results()) == {'b': {'error': 'Invalid email format'}, 'c': {'target': 'C'}}
+
+    job = BatchJob('email', input_path, 'job1', jobs_dir)
+    stats = job.run(lambda t: seen.append(t) or {'target': t.upper()}, canonical=str.lower)
+
+    assert seen == ['a', 'b', 'c', 'a']
+    assert stats['done'] == 1 and stats['skipped'] == 2 and stats['errors'] == 0
+    assert dict(job.iter_results()) == {'a': {'target': 'A'}, 'b': {'error': 'Invalid email format'},
+                                        'c': {'target': 'C'}}
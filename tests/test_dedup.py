@@ -0,0 +1,33 @@
+"""
+Canonical identities and the spill-to-disk dedup store
+"""
+
+from dedup import DedupStore, canonical, canonical_email
+
+
+def test_provider_rules_collapse_spellings():
+    spellings = ['John.Doe+news@Gmail.com', ' johndoe@googlemail.com', 'j.o.h.n.doe@gmail.com.']
+    assert {canonical_email(e) for e in spellings} == {'johndoe@gmail.com'}
+
+    assert canonical_email('Jane+x@Outlook.com') == 'jane@outlook.com'
+    assert canonical_email('jane.doe+x@example.com') == 'jane.doe+x@example.com'
+
+
+def test_idn_and_punycode_are_the_same_domain():
+    assert canonical_email('info@Bücher.de') == canonical_email('INFO@xn--bcher-kva.de')
+    assert canonical('domain', 'Bücher.de.') == 'xn--bcher-kva.de'
+
+
+def test_phone_spellings_share_e164():
+    assert canonical('phone', '077-123-4567') == canonical('phone', '+94 77 123 4567')
+
+
+def test_store_spills_to_disk(tmp_path):
+    store = DedupStore(max_memory_keys=10, path=str(tmp_path / 'seen.sqlite'))
+    for i in range(25):
+        assert store.add(f'key{i}', {'i': i})
+
+    assert not store.add('key3')
+    assert store.get('key24') == {'i': 24}
+    assert len(store) == 25
+    store.close()
@@ -0,0 +1,103 @@
+"""
+Deadline and hedging behaviour against local stub nameservers
+"""
+
+import time
+
+import dns.resolver
+import pytest
+
+from dns_stub import StubDNSServer
+from dns_tools import DeadlineExceeded, DeadlineResolver, ResolverConfig
+
+ZONES = {'example.com': {'A': ['93.184.216.34'], 'MX': ['10 mx1.example.com.']}}
+
+
+def make_resolver(*servers, **config):
+    config.setdefault('query_timeout', 1.0)
+    config.setdefault('hedge_delay', 0.05)
+    return DeadlineResolver(ResolverConfig(nameservers=[s.address for s in servers], **config))
+
+
+def test_fast_primary_is_not_hedged():
+    with StubDNSServer(ZONES) as primary, StubDNSServer(ZONES) as secondary:
+        resolver = make_resolver(primary, secondary)
+        answer = resolver.resolve('example.com', 'A')
+
+    assert [str(r) for r in answer] == ['93.184.216.34']
+    assert resolver.stats['hedged'] == 0
+    assert secondary.queries == 0
+
+
+def test_slow_primary_is_hedged_to_secondary():
+    with StubDNSServer(ZONES, delay=0.8) as primary, StubDNSServer(ZONES) as secondary:
+        resolver = make_resolver(primary, secondary)
+        start = time.monotonic()
+        answer = resolver.resolve('example.com', 'MX')
+        elapsed = time.monotonic() - start
+
+    assert [str(r.exchange) for r in answer] == ['mx1.example.com.']
+    assert elapsed < 0.5
+    assert resolver.stats['hedged'] == 1
+    assert resolver.stats['hedge_wins'] == 1
+
+
+def test_servfail_hedges_immediately():
+    with StubDNSServer(ZONES, servfail=True) as primary, StubDNSServer(ZONES) as secondary:
+        resolver = make_resolver(primary, secondary, hedge_delay=5.0)
+        start = time.monotonic()
+        resolver.resolve('example.com', 'A')
+
+    assert time.monotonic() - start < 1.0
+    assert resolver.stats['hedge_wins'] == 1
+
+
+def test_nxdomain_is_final():
+    with StubDNSServer(ZONES) as primary, StubDNSServer(ZONES) as secondary:
+        resolver = make_resolver(primary, secondary)
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            resolver.resolve('missing.example', 'A')
+
+    assert secondary.queries == 0
+
+
+def test_dropped_packets_hit_the_query_deadline():
+    with StubDNSServer(ZONES, drop=True) as primary:
+        resolver = make_resolver(primary, query_timeout=0.3)
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            resolver.resolve('example.com', 'A')
+
+    assert time.monotonic() - start < 0.8
+    assert resolver.stats['degraded'] == 1
+
+
+def test_target_budget_is_shared_across_lookups():
+    with StubDNSServer(ZONES, drop=True) as primary:
+        resolver = make_resolver(primary, query_timeout=1.0)
+        budget = resolver.budget(0.3)
+        with pytest.raises(DeadlineExceeded):
+            resolver.resolve('example.com', 'A', budget)
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            resolver.resolve('example.com', 'MX', budget)
+
+    assert time.monotonic() - start < 0.05
+    assert resolver.stats['degraded'] == 2
+
+
+def test_hedge_delay_tracks_latency_percentile():
+    with StubDNSServer(ZONES) as primary:
+        resolver = make_resolver(primary, hedge_percentile=0.5, hedge_delay=1.0)
+        for _ in range(25):
+            resolver.resolve('example.com', 'A')
+
+    assert resolver.hedge_delay() < 1.0
+
+
+def test_stubbed_collector_sees_mx_servers(stub_dns, collector):
+    mx_info = collector.check_mx_records('gmail.com')
+
+    assert mx_info['has_mx']
+    assert sorted(mx_info['servers']) == ['alt1.gmail-smtp-in.l.google.com.', 'gmail-smtp-in.l.google.com.']
@@ -0,0 +1,82 @@
+"""
+Streaming extractor: prefiltered scanning, range boundaries, dedup and pooling
+"""
+
+import json
+
+from extractor import extract, run_extraction, scan_emails, scan_phones
+
+TEXT = (b"Contact John.Doe@Example.com or sales@company.com. Not an address: x@ y, @z.com, "
+        b"a@b@c.org, bob+tag@mail.example.org.\n")
+
+
+def test_scanner_finds_addresses_with_offsets():
+    hits = list(scan_emails(TEXT, 0, len(TEXT)))
+
+    assert [value for _, value in hits] == [b'John.Doe@Example.com', b'sales@company.com',
+                                            b'b@c.org', b'bob+tag@mail.example.org']
+    assert all(TEXT[offset:offset + len(value)] == value for offset, value in hits)
+
+
+def test_ranges_split_anywhere_give_the_same_hits():
+    full = list(scan_emails(TEXT, 0, len(TEXT)))
+    for cut in range(len(TEXT)):
+        assert list(scan_emails(TEXT, 0, cut)) + list(scan_emails(TEXT, cut, len(TEXT))) == full
+
+
+def test_extract_streams_deduplicated_hits_across_processes(tmp_path):
+    corpus = tmp_path / 'corpus'
+    (corpus / 'nested').mkdir(parents=True)
+    (corpus / 'a.txt').write_bytes(TEXT * 50)
+    (corpus / 'nested' / 'b.log').write_bytes(b"seen again: john.doe@example.com\nnew: alice@example.org\n")
+    (corpus / 'empty.txt').write_bytes(b'')
+
+    stats = {}
+    hits = list(extract([str(corpus)], workers=2, range_size=1000, stats=stats))
+
+    assert [h['value'] for h in hits] == ['John.Doe@Example.com', 'sales@company.com', 'b@c.org',
+                                          'bob+tag@mail.example.org', 'alice@example.org']
+    assert hits[-1]['file'].endswith('b.log') and hits[-1]['offset'] == 38
+    assert stats['hits'] == 4 * 50 + 2 and stats['files'] == 2
+
+    everything = list(extract([str(corpus)], workers=1, unique=False, range_size=333))
+    assert len(everything) == stats['hits']
+
+
+def test_run_extraction_writes_jsonl(tmp_path):
+    source = tmp_path / 'dump.txt'
+    source.write_bytes(TEXT)
+    stats, path = run_extraction([str(source)], str(tmp_path / 'out' / 'hits.jsonl'), workers=1)
+
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert stats['unique'] == len(lines) == 4
+    assert lines[0] == {'file': str(source), 'offset': 8, 'kind': 'email', 'value': 'John.Doe@Example.com'}
+
+
+PHONE_TEXT = (b"Call 077 123 4567 or +44 7911 123456. Order 2024-01-02 total 12345.67, "
+              b"id 12345678901234567890123; (071) 234-5678, 0771234567 / 0712345678, "
+              b"dial 0094771234567.\n")
+
+
+def test_phone_scanner_agrees_with_phonenumber_matcher():
+    import phonenumbers
+
+    hits = list(scan_phones(PHONE_TEXT, 0, len(PHONE_TEXT), 'LK'))
+    naive = [(m.start, phonenumbers.format_number(m.number, phonenumbers.PhoneNumberFormat.E164))
+             for m in phonenumbers.PhoneNumberMatcher(PHONE_TEXT.decode(), 'LK')]
+
+    assert hits == naive
+    assert [value for _, value in hits] == ['+94771234567', '+447911123456', '+94712345678',
+                                            '+94771234567', '+94712345678', '+94771234567']
+    for cut in range(len(PHONE_TEXT)):
+        assert list(scan_phones(PHONE_TEXT, 0, cut, 'LK')) + \
+            list(scan_phones(PHONE_TEXT, cut, len(PHONE_TEXT), 'LK')) == hits
+
+
+def test_extract_phones_in_worker_processes(tmp_path):
+    (tmp_path / 'calls.txt').write_bytes(PHONE_TEXT * 20)
+    hits = list(extract([str(tmp_path)], 'phone', workers=2, range_size=200, region='LK'))
+
+    assert [h['value'] for h in hits] == ['+94771234567', '+447911123456', '+94712345678']
+    assert hits[1]['offset'] == 21 and hits[1]['kind'] == 'phone'
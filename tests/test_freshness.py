@@ -0,0 +1,87 @@
+"""
+Freshness scheduler: TTL-based expiry, staleness order and query budgets
+"""
+
+import time
+
+from freshness import FreshnessScheduler
+
+
+def make_scheduler(tmp_path):
+    return FreshnessScheduler(str(tmp_path / 'freshness.sqlite'), min_ttl=60, max_ttl=3600)
+
+
+def test_expiry_follows_ttl_and_staleness_order(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    now = time.time()
+    scheduler.observe('Fresh.example', ttl=300, checked_at=now)
+    scheduler.observe('old.example', ttl=300, checked_at=now - 1000)
+    scheduler.observe('older.example', ttl=10, checked_at=now - 2000)      # clamped up to 60s
+    scheduler.observe('huge-ttl.example', ttl=10 ** 6, checked_at=now - 4000)  # clamped to 3600s
+
+    assert scheduler.due(now) == ['older.example', 'old.example', 'huge-ttl.example']
+    assert scheduler.due(now + 301) == ['older.example', 'old.example', 'huge-ttl.example', 'fresh.example']
+    assert scheduler.summary()['tracked'] == 4
+
+
+def test_failures_back_off_exponentially(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    now = time.time()
+    for _ in range(3):
+        scheduler.observe('flaky.example', ok=False, checked_at=now)
+    scheduler.flush()
+
+    expires_at, failures = scheduler.db.execute(
+        "SELECT expires_at, failures FROM domains WHERE domain = 'flaky.example'").fetchone()
+    assert failures == 3  # failures inside one buffer window all count
+    assert expires_at == now + 240
+
+    scheduler.observe('flaky.example', ok=False, checked_at=now)
+    scheduler.flush()
+    assert scheduler.db.execute("SELECT expires_at FROM domains").fetchone()[0] == now + 480
+
+    # A success resets the streak, even when it is still buffered
+    scheduler.observe('flaky.example', ttl=300, checked_at=now)
+    scheduler.observe('flaky.example', ok=False, checked_at=now)
+    scheduler.flush()
+    assert scheduler.db.execute("SELECT failures, expires_at FROM domains").fetchone() == (1, now + 60)
+
+
+def test_refresh_reports_only_real_changes(stub_dns, collector):
+    assert collector.refresh_domain('example.com')
+    assert not collector.refresh_domain('example.com')
+
+
+def test_refresh_stops_at_query_budget(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    past = time.time() - 10000
+    scheduler.seed((f"d{i}.example", past + i) for i in range(10))
+    verified = []
+
+    def verify(domain):
+        verified.append(domain)
+        scheduler.observe(domain, ttl=300)
+        return domain == 'd0.example'
+
+    stats = scheduler.refresh(verify, budget=6)
+
+    assert verified == ['d0.example', 'd1.example', 'd2.example']
+    assert stats == {'due': 10, 'refreshed': 3, 'changed': 1, 'queries': 6, 'remaining': 7}
+
+
+def test_collector_tracks_mx_ttl_and_refreshes_expired(stub_dns, collector):
+    from freshness import get_scheduler
+
+    collector.check_mx_records('gmail.com')
+    scheduler = get_scheduler()
+    assert scheduler.due() == []
+    assert scheduler.db.execute("SELECT ttl FROM domains").fetchone()[0] == 300
+
+    past = time.time() - 10000
+    scheduler.seed([('example.com', past), ('company.com', past + 1), ('missing.invalid', past + 2)])
+    stats = collector.refresh_expired(budget=4)
+
+    assert stats['refreshed'] == 2 and stats['queries'] == 4
+    assert scheduler.due() == ['missing.invalid']
+    assert collector.cached_analysis('domain', 'example.com', lambda: None, verbose=False)['a_records'] == \
+        ['93.184.216.34']
@@ -0,0 +1,64 @@
+"""
+Stub DNS failure injection and the open-loop load-test harness
+"""
+
+import os
+import random
+
+import dns.exception
+import dns.message
+import dns.query
+import dns.rcode
+import pytest
+
+from dns_stub import StubDNSServer, parse_latency, synthetic_zones
+from loadtest import TargetPicker, percentile, run_loadtest
+
+
+def ask(server, name):
+    query = dns.message.make_query(name, 'MX')
+    try:
+        return dns.query.udp(query, server.host, timeout=0.3, port=server.port).rcode()
+    except dns.exception.Timeout:
+        return None
+
+
+def test_stub_injects_failures_and_latency():
+    zones = synthetic_zones(10)
+    assert zones['d0.test']['MX'] == ['1 aspmx.l.google.com.', '5 alt1.aspmx.l.google.com.']
+    assert zones['d1.test']['MX'] == ['0 d1-test.mail.protection.outlook.com.']
+
+    with StubDNSServer(zones, servfail_rate=0.3, nxdomain_rate=0.3, drop_rate=0.2, seed=3) as server:
+        rcodes = [ask(server, f"d{n % 10}.test") for n in range(60)]
+    assert rcodes.count(None) == server.stats['dropped'] > 0
+    assert rcodes.count(dns.rcode.SERVFAIL) == server.stats['servfail'] > 0
+    assert rcodes.count(dns.rcode.NXDOMAIN) == server.stats['nxdomain'] > 0
+    assert rcodes.count(dns.rcode.NOERROR) == server.stats['answered'] > 0
+
+    rng = random.Random(1)
+    assert parse_latency('fixed:0.25')(rng) == 0.25
+    assert 0.01 <= parse_latency('uniform:0.01,0.02')(rng) <= 0.02
+    assert parse_latency(None) is None
+    with pytest.raises(ValueError):
+        parse_latency('gamma:1')
+
+
+def test_picker_and_percentiles():
+    picker = TargetPicker(['a', 'b', 'c'], zipf=2.0, seed=1)
+    picks = [picker.pick() for _ in range(1000)]
+    assert picks.count('a') > picks.count('b') > picks.count('c') > 0
+    assert percentile([1, 2, 3, 4], 0.5) == 2 and percentile([1, 2, 3, 4], 0.99) == 4
+
+
+def test_loadtest_reports_throughput_latency_and_cache_hits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    report = run_loadtest('domain', qps=100, duration=0.5, domains=20, unknown=0.1,
+                          latency='fixed:0.002', no_limit=True, seed=5)
+
+    assert report['offered'] == report['completed'] == 50
+    assert report['outcomes'].get('ok', 0) == 50
+    assert 0 < report['p50_ms'] <= report['p99_ms']
+    assert 0 < report['cache_hit_ratio'] < 1
+    assert report['servers'][0]['queries'] == report['resolver']['queries'] > 0
+    # Runs in a scratch directory
+    assert os.getcwd() == str(tmp_path) and os.listdir(tmp_path) == []
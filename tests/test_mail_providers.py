@@ -0,0 +1,37 @@
+"""
+Mail provider classification from domains and resolved MX hosts
+"""
+
+import pytest
+
+from mail_providers import ProviderIndex, get_index
+
+
+def test_consumer_domains_and_mx_suffixes():
+    index = get_index()
+    assert index.classify('GMail.com') == 'Google'
+    assert index.classify('company.com', ['aspmx.l.google.com.']) == 'Google Workspace'
+    assert index.classify('contoso.com', ['contoso-com.mail.protection.outlook.com.']) == 'Microsoft 365'
+    assert index.classify('shop.example', ['mx1.shop.example.', 'mx00.gmx.net']) == 'GMX'
+    assert index.classify('example.com', ['mx1.example.com.']) == 'Unknown'
+    assert index.classify('example.com') == 'Unknown'
+
+
+def test_wildcards_and_longest_suffix_win():
+    index = ProviderIndex([
+        ('Outlook', 'mx', 'outlook.com'),
+        ('Microsoft 365', 'mx', '*.mail.protection.outlook.com'),
+    ])
+    assert index.match_mx('a-b.mail.protection.outlook.com.') == 'Microsoft 365'
+    # "*." matches only hosts under the suffix, not the suffix itself
+    assert index.match_mx('mail.protection.outlook.com') == 'Outlook'
+    assert index.match_mx('notoutlook.com') is None
+    assert index.match_mx('') is None
+
+    with pytest.raises(ValueError):
+        ProviderIndex([('Broken', 'spf', 'example.com')])
+
+
+def test_hunter_classifies_from_resolved_mx(hunter, stub_dns):
+    assert hunter.simulate_email_verification('jane@company.com')['provider'] == 'Google Workspace'
+    assert hunter.simulate_email_verification('jane@example.com')['provider'] == 'Unknown'
@@ -0,0 +1,78 @@
+"""
+Stage metrics: histogram quantiles, Prometheus text and the timed() helper
+"""
+
+import pytest
+
+from metrics import STAGE_SECONDS, STAGE_TOTAL, Histogram, MetricsRegistry, timed
+
+
+def test_histogram_quantile_is_upper_bucket_bound():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    assert histogram.quantile(0.5) == 0.0
+
+    for value in (0.005, 0.01, 0.05, 0.05, 0.5, 0.5, 0.5, 0.9, 2.0, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 2, 4, 2]  # bounds are inclusive, the last slot is +Inf
+    assert histogram.quantile(0.2) == 0.01
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(0.8) == 1.0
+    assert histogram.quantile(0.95) == float('inf')
+    assert histogram.sum == pytest.approx(7.515)
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.inc('osint_dns_queries_total', upstream='127.0.0.1:53')
+    registry.inc('osint_dns_queries_total', upstream='127.0.0.1:53')
+    registry.set_gauge('osint_upstream_rate', 12.5, upstream='dns:127.0.0.1:53')
+    registry.record_stage('dns_mx', 0.003)
+    registry.record_stage('dns_mx', 0.2, 'error')
+
+    lines = registry.to_prometheus().splitlines()
+
+    assert '# TYPE osint_dns_queries_total counter' in lines
+    assert 'osint_dns_queries_total{upstream="127.0.0.1:53"} 2' in lines
+    assert '# TYPE osint_upstream_rate gauge' in lines
+    assert 'osint_upstream_rate{upstream="dns:127.0.0.1:53"} 12.5' in lines
+    assert f'# TYPE {STAGE_SECONDS} histogram' in lines
+    assert f'{STAGE_SECONDS}_bucket{{stage="dns_mx",le="0.0025"}} 0' in lines
+    assert f'{STAGE_SECONDS}_bucket{{stage="dns_mx",le="0.005"}} 1' in lines
+    assert f'{STAGE_SECONDS}_bucket{{stage="dns_mx",le="+Inf"}} 2' in lines
+    assert f'{STAGE_SECONDS}_sum{{stage="dns_mx"}} 0.203000' in lines
+    assert f'{STAGE_SECONDS}_count{{stage="dns_mx"}} 2' in lines
+    assert f'{STAGE_TOTAL}{{outcome="error",stage="dns_mx"}} 1' in lines
+    assert lines.count(f'# TYPE {STAGE_SECONDS} histogram') == 1
+
+
+def test_timed_records_outcomes_as_context_manager_and_decorator():
+    registry = MetricsRegistry()
+
+    @timed('parse', registry)
+    def parse(value):
+        if value is None:
+            raise ValueError("nothing to parse")
+        return value * 2
+
+    assert parse(21) == 42
+    assert parse.__name__ == 'parse'
+    with pytest.raises(ValueError):
+        parse(None)
+    with timed('save', registry):
+        pass
+    with pytest.raises(KeyError):
+        with timed('save', registry):
+            raise KeyError('boom')
+
+    counters = {(name, dict(labels)['stage'], dict(labels)['outcome']): value
+                for (name, labels), value in registry.counters.items()}
+    assert counters == {
+        (STAGE_TOTAL, 'parse', 'ok'): 1, (STAGE_TOTAL, 'parse', 'error'): 1,
+        (STAGE_TOTAL, 'save', 'ok'): 1, (STAGE_TOTAL, 'save', 'error'): 1,
+    }
+    assert [(stage, count) for stage, count, *_ in sorted(registry.stage_summary())] == [('parse', 2), ('save', 2)]
+
+    registry.reset()
+    parse(1)
+    assert registry.stage_summary()[0][:2] == ('parse', 1)
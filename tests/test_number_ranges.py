@@ -0,0 +1,70 @@
+"""
+Longest-prefix lookups on the compiled number range table
+"""
+
+from number_ranges import NumberRangeTable
+
+ROWS = [
+    ('94', '', 'Sri Lanka'),
+    ('9470', 'Mobitel', ''),
+    ('94701', '', 'Colombo'),
+    ('9471', 'Mobitel', 'Western'),
+    ('1415', '', 'San Francisco, CA'),
+]
+
+
+def test_longest_prefix_wins_and_inherits_fields():
+    table = NumberRangeTable.compile(ROWS)
+
+    assert table.lookup('+94701234567') == ('94701', 'Mobitel', 'Colombo')
+    assert table.lookup('+94709999999') == ('9470', 'Mobitel', 'Sri Lanka')
+    assert table.lookup('+94 71 555 0000') == ('9471', 'Mobitel', 'Western')
+    assert table.lookup('+94720000000') == ('94', '', 'Sri Lanka')
+    assert table.lookup('+14155552671') == ('1415', '', 'San Francisco, CA')
+    assert table.lookup('+4420') is None
+
+
+def test_short_numbers_do_not_match_longer_ranges():
+    table = NumberRangeTable.compile(ROWS)
+
+    assert table.lookup('9470') == ('9470', 'Mobitel', 'Sri Lanka')
+    assert table.lookup('947') == ('94', '', 'Sri Lanka')
+
+
+def test_binary_roundtrip(tmp_path):
+    path = str(tmp_path / 'ranges.bin')
+    NumberRangeTable.compile(ROWS).save(path)
+    table = NumberRangeTable.load(path)
+
+    assert len(table) == len(ROWS)
+    assert table.lookup('+94701234567') == ('94701', 'Mobitel', 'Colombo')
+
+
+def test_save_uses_its_own_temp_file(tmp_path):
+    path = tmp_path / 'ranges.bin'
+    leftover = tmp_path / 'ranges.bin.tmp'
+    leftover.write_bytes(b'another writer')
+
+    NumberRangeTable.compile(ROWS).save(str(path))
+
+    assert leftover.read_bytes() == b'another writer'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['ranges.bin', 'ranges.bin.tmp']
+
+
+def test_table_is_rebuilt_when_phonenumbers_changes(tmp_path, monkeypatch):
+    import number_ranges
+
+    path = str(tmp_path / 'ranges.bin')
+    source = str(tmp_path / 'missing.csv')
+    NumberRangeTable.compile(ROWS, version='8.0.0').save(path)
+    rebuilt = []
+    monkeypatch.setattr(number_ranges, 'build',
+                        lambda sources, output: rebuilt.append(output) or NumberRangeTable.compile(ROWS))
+
+    for installed, expected in (('8.0.0', []), ('9.0.0', [path])):
+        monkeypatch.setattr(number_ranges, '_table', None)
+        monkeypatch.setattr(number_ranges, 'phonenumbers_version', lambda: installed)
+        table = number_ranges.get_table(path, source)
+        assert rebuilt == expected
+        assert table.lookup('+94701234567') == ('94701', 'Mobitel', 'Colombo')
+    assert NumberRangeTable.load(path).version == '8.0.0'
@@ -0,0 +1,50 @@
+"""
+PDF summary built by streaming saved reports
+"""
+
+import re
+
+import pytest
+
+from pdf_report import ROWS_PER_TABLE, generate_pdf_report
+from report_store import save_report
+
+pytest.importorskip('reportlab')
+
+
+def page_count(path):
+    with open(path, 'rb') as f:
+        return len(re.findall(rb'/Type\s*/Page\b(?!s)', f.read()))
+
+
+def save_reports(count):
+    for i in range(count):
+        if i % 2:
+            save_report(f'reports/phone_202401{i % 28 + 1:02d}_{i:06d}.json',
+                        {'international': f'+94 77 {i:07d}', 'country': 'Sri Lanka', 'type': 'Mobile'})
+        else:
+            save_report(f'reports/email_202401{i % 28 + 1:02d}_{i:06d}.json',
+                        {'email': f'user{i}@example.com', 'mx_records': {'servers': ['mx1.example.com.']}})
+
+
+def test_build_writes_a_pdf_of_saved_reports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_reports(2)
+
+    builder = generate_pdf_report('summary.pdf')
+
+    with open('summary.pdf', 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+    assert page_count('summary.pdf') == 1
+    assert builder.total == 2 and builder.counts == {'email': 1, 'phone': 1}
+
+
+def test_many_reports_paginate(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_reports(6 * ROWS_PER_TABLE)
+
+    builder = generate_pdf_report('summary.pdf')
+
+    # About 35 rows fit on an A4 page, so tables split and 240 rows span seven pages
+    assert builder.total == 6 * ROWS_PER_TABLE
+    assert page_count('summary.pdf') == 7
@@ -0,0 +1,46 @@
+"""
+Fast-path phone normalization and its slow-path fallback
+"""
+
+import pytest
+
+import phone_normalize
+from phone_normalize import normalize, normalize_many
+
+
+@pytest.fixture(autouse=True)
+def default_region():
+    region = phone_normalize.DEFAULT_REGION
+    phone_normalize.set_default_region('LK')
+    yield
+    phone_normalize.set_default_region(region)
+
+
+def test_common_formats_skip_full_parse():
+    results = list(normalize_many(['+94 77 123 4567', '077-123-4567', '(077) 1234567', '0094771234567']))
+
+    assert {r.e164 for r in results} == {'+94771234567'}
+    assert [r.status for r in results] == ['e164', 'national', 'national', 'e164']
+    assert results[1].national == '771234567'
+    phones = ['+94 77 123 4567', '077-123-4567', ' 0094771234567 ', '94771234567', 'abc', 12345]
+    assert [normalize(p) for p in phones] == list(normalize_many(phones))
+
+
+def test_garbage_is_rejected():
+    for phone in ['', 'abc', '12', 'call me']:
+        assert normalize(phone).status == phone_normalize.INVALID
+
+
+def test_ambiguous_input_uses_full_parse():
+    result = normalize('94771234567')
+
+    assert result.status == phone_normalize.PARSED
+    assert result.e164 == '+94771234567'
+
+
+def test_default_region_is_configurable():
+    phone_normalize.set_default_region('us')
+
+    assert normalize('1 (415) 555-2671').e164 == '+14155552671'
+    assert normalize('011 44 7911 123456').e164 == '+447911123456'
+    assert normalize('077-123-4567', region='LK').e164 == '+94771234567'
@@ -0,0 +1,63 @@
+"""
+Platform registry: compiled templates, URL encoding and table expansion
+"""
+
+import csv
+
+import pytest
+
+from platforms import PlatformRegistry, PlatformTemplate, get_registry
+
+
+def test_links_encode_usernames_and_queries():
+    registry = get_registry()
+    profiles = registry.links('john doe/x')
+    searches = registry.links('a b&c@example.com', 'search')
+
+    assert profiles['GitHub'] == 'https://github.com/john%20doe%2Fx'
+    assert profiles['TikTok'] == 'https://tiktok.com/@john%20doe%2Fx'
+    assert searches['GitHub'] == 'https://github.com/search?q=a+b%26c%40example.com&type=users'
+    assert 'Google' in searches and 'Google' not in profiles
+
+
+def test_template_requires_one_placeholder():
+    with pytest.raises(ValueError):
+        PlatformTemplate('Broken', 'profile', 'https://example.com/{username}/{username}')
+    with pytest.raises(ValueError):
+        PlatformTemplate('Broken', 'profile', 'https://example.com/')
+
+
+def test_expand_matches_links_and_streams_to_csv(tmp_path):
+    registry = PlatformRegistry([
+        PlatformTemplate('A', 'profile', 'https://a.example/{username}'),
+        PlatformTemplate('B', 'profile', 'https://b.example/?u={query}'),
+    ])
+    values = ['alice', ' bob smith ', 'alice', 'ünï']
+    table = registry.expand(values)
+
+    assert table['value'] == ['alice', 'bob smith', 'alice', 'ünï']
+    assert [dict(A=a, B=b) for a, b in zip(table['A'], table['B'])] == \
+        [registry.links(v) for v in values]
+
+    rows, path = registry.write_table(iter(values), str(tmp_path / 'urls.csv'), chunk_size=3)
+    with open(path, encoding='utf-8', newline='') as f:
+        written = list(csv.reader(f))
+    assert rows == 4
+    assert written[0] == ['value', 'A', 'B']
+    assert written[2] == ['bob smith', 'https://a.example/bob%20smith', 'https://b.example/?u=bob+smith']
+
+
+def test_hunter_associated_accounts_use_registry(hunter):
+    accounts = hunter.find_associated_accounts('john.doe@example.com')
+
+    assert accounts['github'] == 'https://github.com/search?q=john.doe%40example.com&type=users'
+    assert accounts['profiles']['GitHub'] == 'https://github.com/john.doe'
+    assert accounts['gravatar'] == 'https://en.gravatar.com/8eb1b522f60d11fa897de1dc6351b7e8'
+
+
+def test_quick_email_search_lists_three_platforms(quick_search, capsys):
+    quick_search.quick_email_search('john.doe@example.com')
+    links = [line.strip() for line in capsys.readouterr().out.splitlines() if '://' in line]
+
+    assert links == ['Twitter: https://twitter.com/john.doe', 'Instagram: https://instagram.com/john.doe',
+                     'GitHub: https://github.com/john.doe']
@@ -0,0 +1,71 @@
+"""
+cProfile/tracemalloc hooks: off by default, nest, and write to the profile directory
+"""
+
+import os
+import pstats
+
+import pytest
+
+import profiling
+from profiling import profiled
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('OSINT_PROFILE_DIR', str(tmp_path))
+    yield tmp_path
+    profiling.configure('')
+
+
+def work():
+    return sum(len(str(i)) for i in range(20000))
+
+
+def test_disabled_hooks_write_nothing(profile_dir):
+    assert profiling.configure(argv=['collector']) == []
+    with profiled('idle') as hook:
+        work()
+    assert profiled('decorated')(work)() == work()
+    assert hook.paths == [] and os.listdir(profile_dir) == []
+
+
+def test_outermost_hook_writes_pstats_and_memory_report(profile_dir):
+    assert profiling.configure(argv=['collector', '--profile', 'all']) == ['cpu', 'memory']
+    with profiled('batch job/1') as outer:
+        with profiled('inner') as inner:
+            work()
+
+    assert inner.paths == []
+    stats_path, memory_path = outer.paths
+    assert os.path.basename(stats_path).startswith('profile_batch_job_1_')
+    assert any(func[2] == 'work' for func in pstats.Stats(stats_path).stats)
+    with open(memory_path, encoding='utf-8') as f:
+        assert f.readline().startswith('# batch job/1:')
+        assert 'peak traced' in f.readline()
+
+
+def test_configure_modes():
+    assert profiling.configure(argv=['x', '--profile', '--no-cache']) == ['cpu']
+    assert profiling.configure('memory') == ['memory']
+    with pytest.raises(ValueError):
+        profiling.configure('gpu')
+    profiling.configure('')
+    assert not profiling.enabled()
+
+
+def test_menu_actions_profile_the_analysis_not_the_prompts(profile_dir, stub_dns, collector, monkeypatch):
+    profiling.configure('cpu')
+    answers = iter(['john@example.com', 'n'])
+    prompted_while_profiling = []
+
+    def prompt(text=''):
+        prompted_while_profiling.append(profiling._active)
+        return next(answers)
+
+    monkeypatch.setattr('builtins.input', prompt)
+    collector.email_analysis()
+
+    assert prompted_while_profiling == [False, False]
+    assert [name.split('_2')[0] for name in os.listdir(profile_dir) if name.endswith('.pstats')] == [
+        'profile_email_analysis']
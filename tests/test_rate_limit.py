@@ -0,0 +1,129 @@
+"""
+AIMD token buckets for DNS and HTTP upstreams
+"""
+
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import dns.exception
+import pytest
+import requests
+
+import rate_limit
+from dns_stub import StubDNSServer
+from dns_tools import DeadlineResolver, ResolverConfig
+from rate_limit import AdaptiveBucket, LimiterConfig, RateLimiter
+
+
+@pytest.fixture
+def limiter():
+    shared = RateLimiter(LimiterConfig(initial=20, minimum=1, maximum=40, burst=2, step=10, window=0.05))
+    rate_limit.reset_limiter(shared)
+    yield shared
+    rate_limit.reset_limiter()
+
+
+def test_bucket_paces_after_burst():
+    bucket = AdaptiveBucket('test', LimiterConfig(initial=20, burst=2))
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert 0.15 < time.monotonic() - start < 0.4
+    assert not bucket.acquire(timeout=0.001)
+
+
+def test_rate_follows_aimd_once_per_window():
+    bucket = AdaptiveBucket('test', LimiterConfig(initial=20, minimum=5, maximum=30, step=5, window=0.05))
+
+    bucket.congestion()
+    bucket.congestion()
+    assert bucket.rate == 10
+
+    bucket.success()
+    assert bucket.rate == 10
+    time.sleep(0.06)
+    bucket.success()
+    bucket.success()
+    assert bucket.rate == 15
+
+    for _ in range(4):
+        time.sleep(0.06)
+        bucket.congestion()
+    assert bucket.rate == 5
+
+
+def test_servfail_backs_off_the_resolver(limiter):
+    zones = {'example.com': {'A': ['93.184.216.34']}}
+    with StubDNSServer(zones, servfail=True) as bad, StubDNSServer(zones) as good:
+        resolver = DeadlineResolver(ResolverConfig(nameservers=[bad.address, good.address], hedge_delay=0.05))
+        resolver.resolve('example.com', 'A')
+
+        rates = limiter.rates()
+        assert rates[f'dns:{bad.address}'] == 10
+        assert rates[f'dns:{good.address}'] == 30
+
+
+def test_token_wait_past_deadline_fails_fast_without_backoff():
+    shared = RateLimiter(LimiterConfig(initial=1, minimum=1, burst=1))
+    rate_limit.reset_limiter(shared)
+    try:
+        with StubDNSServer({'example.com': {'A': ['93.184.216.34']}}) as server:
+            resolver = DeadlineResolver(ResolverConfig(nameservers=[server.address], query_timeout=3))
+            bucket = shared.bucket(f"dns:{server.address}")
+            bucket.tokens = -5
+            start, cpu = time.monotonic(), time.process_time()
+            with pytest.raises(dns.exception.Timeout):
+                resolver.resolve('example.com', 'A')
+
+            assert time.monotonic() - start < 0.5
+            assert time.process_time() - cpu < 0.2
+            assert server.queries == 0
+            assert bucket.stats['backoffs'] == 0
+    finally:
+        rate_limit.reset_limiter()
+
+
+def test_pacing_wait_does_not_count_as_congestion():
+    shared = RateLimiter(LimiterConfig(initial=1.25, minimum=1, burst=1, step=0))
+    rate_limit.reset_limiter(shared)
+    try:
+        # The lookup waits 0.8s for its token, then still gets a full attempt
+        with StubDNSServer({'example.com': {'A': ['93.184.216.34']}}, delay=0.3) as server:
+            resolver = DeadlineResolver(ResolverConfig(nameservers=[server.address], query_timeout=2))
+            bucket = shared.bucket(f"dns:{server.address}")
+            bucket.tokens = 0
+            resolver.resolve('example.com', 'A')
+
+            assert bucket.stats['backoffs'] == 0
+            assert resolver.stats['degraded'] == 0
+    finally:
+        rate_limit.reset_limiter()
+
+
+def test_http_429_backs_off_and_honours_retry_after(limiter):
+    class Throttled(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Throttled)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        session = rate_limit.install(requests.Session())
+        host = f"127.0.0.1:{server.server_port}"
+        assert session.get(f"http://{host}/").status_code == 429
+        bucket = limiter.bucket(f"http:{host}")
+
+        assert bucket.rate == 10
+        assert 0.9 < -bucket.tokens / bucket.rate <= 1.1
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,62 @@
+"""
+Sharded report layout, lazy listing and migration of flat reports
+"""
+
+import os
+
+import report_store
+from report_store import (count_reports, iter_report_paths, iter_reports, migrate_reports,
+                          save_report, shard_path)
+
+
+def test_shard_path_uses_type_and_filename_date():
+    assert shard_path('reports/phone_20240131_235959.json') == os.path.join(
+        'reports', 'phone', '2024', '01', '31', 'phone_20240131_235959.json')
+    # Usernames may contain digits and underscores; the last stamp wins
+    assert shard_path('username_bob_20200101_000000_20230704_101010.json', 'r') == os.path.join(
+        'r', 'username', '2023', '07', '04', 'username_bob_20200101_000000_20230704_101010.json')
+
+
+def test_save_shards_flat_paths_and_listing_walks_tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    saved = save_report('reports/email_20240102_030405.json', {'email': 'a@example.com'})
+    save_report('reports/phone_20231231_000000.json', {'international': '+94 77 123 4567'})
+
+    assert saved == os.path.join('reports', 'email', '2024', '01', '02', 'email_20240102_030405.json')
+    assert os.path.exists(saved)
+    assert count_reports() == 2
+    assert sorted(os.path.basename(p) for p in iter_report_paths()) == [
+        'email_20240102_030405.json', 'phone_20231231_000000.json']
+    assert {data.get('email') for _, data in iter_reports()} == {'a@example.com', None}
+
+
+def test_migrate_moves_flat_reports(tmp_path):
+    reports = tmp_path / 'reports'
+    reports.mkdir()
+    (reports / 'phone_20220505_121212.json').write_text('{}')
+    (reports / 'legacy.json').write_text('{"username": "x"}')
+    (reports / 'notes.txt').write_text('keep me')
+
+    assert report_store.has_flat_reports(str(reports))
+    assert migrate_reports(str(reports)) == 2
+    assert not report_store.has_flat_reports(str(reports))
+    assert (reports / 'phone' / '2022' / '05' / '05' / 'phone_20220505_121212.json').exists()
+    assert (reports / 'notes.txt').exists()
+    assert count_reports(str(reports)) == 2
+    assert migrate_reports(str(reports)) == 0
+
+
+def test_count_is_walked_once_and_kept_up_to_date(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_report('reports/email_20240102_030405.json', {})
+    assert count_reports() == 1
+
+    walks = []
+    walk = report_store._walk
+    monkeypatch.setattr(report_store, '_walk', lambda directory: walks.append(directory) or walk(directory))
+    save_report('reports/phone_20231231_000000.json', {})
+    save_report('reports/phone_20231231_000000.json', {})   # overwrite, not a new report
+    save_report(str(tmp_path / 'elsewhere' / 'email_x.json'), {})
+
+    assert count_reports() == 2
+    assert walks == []
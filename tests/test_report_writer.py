@@ -0,0 +1,99 @@
+"""
+Background report writer: group commit, atomic placement and backpressure
+"""
+
+import os
+import json
+import queue
+import threading
+
+import pytest
+
+from report_store import count_reports, load_report
+from report_writer import ReportWriter
+
+
+def test_saves_are_committed_into_shards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert count_reports() == 0
+    writer = ReportWriter(max_queue=16, max_group=8)
+    try:
+        paths = [writer.save(f'reports/email_2024010{i}_000000.json', {'n': i}) for i in range(1, 6)]
+        writer.flush()
+    finally:
+        writer.close()
+
+    assert paths[0] == os.path.join('reports', 'email', '2024', '01', '01', 'email_20240101_000000.json')
+    assert [load_report(p) for p in paths] == [{'n': i} for i in range(1, 6)]
+    assert count_reports() == 5
+    assert writer.stats['written'] == 5 and writer.stats['errors'] == 0
+    # No temporary files are left behind
+    assert not [n for _, _, names in os.walk('reports') for n in names if n.endswith('.tmp')]
+
+
+def test_payload_is_captured_at_save_time(tmp_path):
+    writer = ReportWriter()
+    data = {'status': 'first'}
+    path = writer.save(str(tmp_path / 'out' / 'report.json'), data)
+    data['status'] = 'changed'
+    writer.close()
+
+    with open(path) as f:
+        assert json.load(f) == {'status': 'first'}
+
+
+def test_full_queue_applies_backpressure(tmp_path, monkeypatch):
+    release = threading.Event()
+    writer = ReportWriter(max_queue=1, max_group=1)
+    original = writer._commit
+    monkeypatch.setattr(writer, '_commit', lambda records: (release.wait(), original(records)))
+
+    writer.save(str(tmp_path / 'a.json'), {})   # taken by the stalled writer thread
+    writer.save(str(tmp_path / 'b.json'), {})   # fills the queue
+    with pytest.raises(queue.Full):
+        writer.save(str(tmp_path / 'c.json'), {}, timeout=0.05)
+
+    release.set()
+    writer.close()
+    assert sorted(os.listdir(tmp_path)) == ['a.json', 'b.json']
+
+
+def test_encryption_toggle_while_queued_keeps_names_honest(tmp_path, monkeypatch):
+    import base64
+    import secure_store
+
+    monkeypatch.setenv(secure_store.KEY_ENV, base64.urlsafe_b64encode(bytes(32)).decode())
+    monkeypatch.setenv(secure_store.ENABLE_ENV, '0')
+    release = threading.Event()
+    writer = ReportWriter(max_queue=4, max_group=1)
+    original = writer._commit
+    monkeypatch.setattr(writer, '_commit', lambda records: (release.wait(), original(records)))
+
+    plain = writer.save(str(tmp_path / 'plain.json'), {'n': 1})
+    secure_store.set_encryption_enabled(True)
+    encrypted = writer.save(str(tmp_path / 'secret.json'), {'n': 2})
+    secure_store.set_encryption_enabled(False)
+    release.set()
+    writer.close()
+
+    assert encrypted.endswith(secure_store.ENCRYPTED_SUFFIX)
+    assert load_report(plain) == {'n': 1} and load_report(encrypted) == {'n': 2}
+    with open(plain) as f:
+        assert json.load(f) == {'n': 1}
+
+
+def test_same_path_twice_in_one_group(tmp_path, monkeypatch):
+    release = threading.Event()
+    writer = ReportWriter(max_queue=4, max_group=4)
+    original = writer._commit
+    monkeypatch.setattr(writer, '_commit', lambda records: (release.wait(), original(records)))
+
+    writer.save(str(tmp_path / 'first.json'), {})     # taken alone by the stalled writer thread
+    path = writer.save(str(tmp_path / 'report.json'), {'n': 1})
+    writer.save(str(tmp_path / 'report.json'), {'n': 2})
+    release.set()
+    writer.close()
+
+    assert writer.stats['errors'] == 0 and writer.stats['written'] == 3
+    assert load_report(path) == {'n': 2}
+    assert sorted(os.listdir(tmp_path)) == ['first.json', 'report.json']
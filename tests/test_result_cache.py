@@ -0,0 +1,125 @@
+"""
+Result cache keys, TTLs, bypass and size-bounded eviction
+"""
+
+import time
+
+from result_cache import ResultCache, get_cache
+
+
+def make_cache(tmp_path, **kwargs):
+    return ResultCache(directory=str(tmp_path / 'results'), bypass=False, **kwargs)
+
+
+def test_hit_uses_normalized_target(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put('email', 'John.Doe@Example.com ', {'email': 'john.doe@example.com'})
+    cache.put('phone', '+94 77 123 4567', {'carrier': 'Dialog'})
+
+    assert cache.get('email', 'john.doe@example.com') == {'email': 'john.doe@example.com'}
+    assert cache.get('phone', '077-123-4567') == {'carrier': 'Dialog'}
+    assert cache.get('domain', 'example.com') is None
+    assert cache.stats['hits'] == 2
+
+
+def test_expired_entries_are_stale(tmp_path):
+    cache = make_cache(tmp_path, ttls={'domain': 0.05})
+    cache.put('domain', 'example.com', {'a_records': []})
+    time.sleep(0.1)
+
+    assert cache.get('domain', 'example.com') is None
+    assert cache.stats['stale'] == 1
+
+
+def test_bypass_skips_reads_but_still_stores(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.bypass = True
+    cache.put('email', 'a@example.com', {'v': 1})
+    assert cache.get('email', 'a@example.com') is None
+
+    cache.bypass = False
+    assert cache.get('email', 'a@example.com') == {'v': 1}
+
+
+def test_put_reports_content_changes(tmp_path):
+    cache = make_cache(tmp_path)
+
+    assert cache.put('email', 'a@example.com', {'v': 1}) is True
+    assert cache.put('email', 'a@example.com', {'v': 1}) is False
+    assert cache.put('email', 'a@example.com', {'v': 2}) is True
+
+
+def test_oldest_entries_are_evicted_past_the_size_bound(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=2000)
+    for i in range(20):
+        cache.put('email', f'user{i}@example.com', {'padding': 'x' * 200})
+
+    assert cache.stats['evicted'] > 0
+    assert cache.get('email', 'user19@example.com') is not None
+    assert cache.get('email', 'user0@example.com') is None
+
+
+def test_email_cache_hits_keep_the_requested_spelling(collector, stub_dns, monkeypatch):
+    answers = iter(['j.doe@gmail.com', 'y', 'J.Doe+x@gmail.com', 'y'])
+    saved = []
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+    monkeypatch.setattr(collector, 'save_email_report', saved.append)
+
+    collector.email_analysis()
+    collector.email_analysis()
+
+    first, second = saved
+    assert get_cache().stats['hits'] == 1
+    assert (second['email'], second['username']) == ('j.doe+x@gmail.com', 'j.doe+x')
+    assert second['social_profiles'] == collector.generate_social_links('j.doe+x')
+    assert second['mx_records'] == first['mx_records']
+    assert (first['email'], first['username']) == ('j.doe@gmail.com', 'j.doe')
+
+    served = collector.analyze_target('email', 'JDoe@Gmail.com')
+    assert (served['email'], served['username']) == ('jdoe@gmail.com', 'jdoe')
+
+
+def test_hunter_report_cache_hits_keep_the_requested_spelling(collector, hunter, stub_dns, capsys):
+    first = hunter.generate_email_intel_report('j.doe@gmail.com')
+    second = hunter.generate_email_intel_report('jdoe+news@gmail.com')
+
+    assert 'Cached report' in capsys.readouterr().out
+    assert second['email'] == second['verification']['email'] == 'jdoe+news@gmail.com'
+    assert second['accounts'] == hunter.find_associated_accounts('jdoe+news@gmail.com')
+    assert second['accounts']['profiles']['GitHub'] == 'https://github.com/jdoe%2Bnews'
+    assert second['breaches_found'] == len(second['accounts']['data_breaches'])
+    assert second['provider'] == first['provider']
+    assert hunter.generate_email_intel_report('j.doe@gmail.com') == first
+
+
+def test_resolver_failures_are_not_cached_as_no_mx(collector, hunter, stub_dns, monkeypatch, capsys):
+    import dns.resolver
+    import dns_tools
+
+    resolver = dns_tools.get_resolver()
+    real = resolver.resolve
+
+    def no_nameservers(name, rdtype, *args, **kwargs):
+        if rdtype == 'MX':
+            raise dns.resolver.NoNameservers()
+        return real(name, rdtype, *args, **kwargs)
+
+    monkeypatch.setattr(resolver, 'resolve', no_nameservers)
+    failed = collector.analyze_target('email', 'jane@example.com')
+    recon = collector.analyze_target('domain', 'example.com')
+    report = hunter.generate_email_intel_report('jane@example.com')
+    assert failed['mx_records'] == {'has_mx': False, 'servers': [], 'degraded': False, 'failed': True}
+    assert recon['failed'] and not recon['degraded']
+    assert not report['verification']['has_mx_records']
+
+    monkeypatch.setattr(resolver, 'resolve', real)
+    assert collector.analyze_target('email', 'jane@example.com')['mx_records']['has_mx']
+    assert collector.analyze_target('domain', 'example.com')['mx_records']['has_mx']
+    assert hunter.generate_email_intel_report('jane@example.com')['verification']['has_mx_records']
+    assert get_cache().stats['hits'] == 0
+
+    # NXDOMAIN is a definite answer and is cached
+    nxdomain = collector.analyze_target('email', 'jane@missing.example')
+    assert not nxdomain['mx_records']['failed']
+    assert collector.analyze_target('email', 'jane@missing.example') == nxdomain
+    assert get_cache().stats['hits'] == 1
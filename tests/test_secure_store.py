@@ -0,0 +1,99 @@
+"""
+Chunked AES-GCM file format: round trips, tampering and random access
+"""
+
+import os
+
+import pytest
+
+from secure_store import (HEADER, MAX_CHUNK_SIZE, TAG_SIZE, EncryptedReader, SecureStoreError,
+                          open_encrypted)
+
+KEY = bytes(range(32))
+CHUNK = 64
+
+
+def write(path, data, chunk_size=CHUNK):
+    with open_encrypted(str(path), 'wb', key=KEY, chunk_size=chunk_size) as f:
+        f.write(data)
+
+
+def read(path):
+    with open_encrypted(str(path), 'rb', key=KEY, chunk_size=CHUNK) as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('size', [0, 1, CHUNK - 1, CHUNK, CHUNK + 1, 3 * CHUNK, 3 * CHUNK + 7])
+def test_round_trip_at_chunk_boundaries(tmp_path, size):
+    data = os.urandom(size)
+    write(tmp_path / 'data.enc', data)
+
+    assert read(tmp_path / 'data.enc') == data
+    chunks = max(1, -(-size // CHUNK))
+    assert os.path.getsize(tmp_path / 'data.enc') == HEADER.size + size + chunks * TAG_SIZE
+
+
+def test_tampered_and_truncated_files_are_rejected(tmp_path):
+    path = tmp_path / 'data.enc'
+    write(path, os.urandom(3 * CHUNK))
+    original = path.read_bytes()
+
+    tampered = bytearray(original)
+    tampered[HEADER.size + CHUNK + 5] ^= 1
+    path.write_bytes(bytes(tampered))
+    with pytest.raises(SecureStoreError):
+        read(path)
+
+    # The header is authenticated as associated data
+    tampered = bytearray(original)
+    tampered[HEADER.size - 1] ^= 1
+    path.write_bytes(bytes(tampered))
+    with pytest.raises(SecureStoreError):
+        read(path)
+
+    # Dropping whole trailing chunks must not look like a shorter valid file
+    for cut in (CHUNK + TAG_SIZE, 2 * (CHUNK + TAG_SIZE), 10):
+        path.write_bytes(original[:-cut])
+        with pytest.raises(SecureStoreError):
+            read(path)
+
+    path.write_bytes(original[:HEADER.size - 1])
+    with pytest.raises(SecureStoreError):
+        read(path)
+
+
+@pytest.mark.parametrize('chunk_size', [0, MAX_CHUNK_SIZE + 1, 2 ** 32 - 1])
+def test_header_chunk_size_is_validated(tmp_path, chunk_size):
+    path = tmp_path / 'data.enc'
+    write(path, os.urandom(3 * CHUNK))
+    magic, version, _, prefix = HEADER.unpack_from(path.read_bytes())
+    path.write_bytes(HEADER.pack(magic, version, chunk_size, prefix) + path.read_bytes()[HEADER.size:])
+
+    with pytest.raises(SecureStoreError):
+        read(path)
+
+
+def test_read_chunk_and_seek_give_random_access(tmp_path):
+    data = os.urandom(5 * CHUNK + 9)
+    write(tmp_path / 'data.enc', data)
+
+    with open(tmp_path / 'data.enc', 'rb') as f:
+        reader = EncryptedReader(f, KEY)
+        assert reader.size == len(data) and reader.chunk_count == 6
+        assert reader.read_chunk(5) == data[5 * CHUNK:]
+        assert reader.read_chunk(2) == data[2 * CHUNK:3 * CHUNK]
+        with pytest.raises(IndexError):
+            reader.read_chunk(6)
+
+        reader.seek(3 * CHUNK - 4)
+        assert reader.read(10) == data[3 * CHUNK - 4:3 * CHUNK + 6]
+
+
+def test_text_mode_round_trip(tmp_path):
+    path = str(tmp_path / 'report.json.enc')
+    text = '{"name": "Zoë", "note": "ශ්‍රී ලංකා"}\n' * 20
+
+    with open_encrypted(path, 'w', key=KEY, chunk_size=CHUNK) as f:
+        f.write(text)
+    with open_encrypted(path, 'r', key=KEY) as f:
+        assert f.read() == text
@@ -0,0 +1,68 @@
+"""
+Serialization backends agree and encode project types explicitly
+"""
+
+import io
+import datetime
+import collections
+
+import phonenumbers
+import pytest
+
+import serialize
+from serialize import Serializer, available_backends
+
+Normalized = collections.namedtuple('Normalized', 'raw e164')
+
+RESULT = {
+    'timezones': ('Asia/Colombo',),
+    'checked': datetime.datetime(2024, 1, 2, 3, 4, 5),
+    'normalized': Normalized('077 123 4567', '+94771234567'),
+    'tags': {'mobile', 'dialog'},
+    'number': phonenumbers.parse('+94771234567'),
+    'name': 'Ünïcode',
+    200: 'non-string key',
+}
+
+EXPECTED = {
+    'timezones': ['Asia/Colombo'],
+    'checked': '2024-01-02T03:04:05',
+    'normalized': ['077 123 4567', '+94771234567'],
+    'tags': ['dialog', 'mobile'],
+    'number': '+94771234567',
+    'name': 'Ünïcode',
+    '200': 'non-string key',
+}
+
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_backends_encode_project_types_identically(backend):
+    codec = Serializer(backend)
+    reference = Serializer('json')
+
+    assert codec.loads(codec.dumps(RESULT)) == EXPECTED
+    assert codec.dumps(RESULT, pretty=True) == reference.dumps(RESULT, pretty=True)
+    assert codec.dumpb(EXPECTED, sort_keys=True) == reference.dumpb(EXPECTED, sort_keys=True)
+
+
+def test_compact_mode_controls_report_indentation():
+    pretty, compact = io.StringIO(), io.StringIO()
+    Serializer('json', compact=False).dump({'a': [1]}, pretty)
+    Serializer('json', compact=True).dump({'a': [1]}, compact)
+
+    assert pretty.getvalue() == '{\n  "a": [\n    1\n  ]\n}'
+    assert compact.getvalue() == '{"a":[1]}'
+
+
+def test_backend_selection_from_environment(monkeypatch):
+    monkeypatch.setenv('OSINT_JSON_BACKEND', 'json')
+    serialize.reset_serializer()
+    try:
+        assert serialize.get_serializer().backend == 'json'
+        with pytest.raises(ValueError):
+            serialize.loads('{not json')
+    finally:
+        serialize.reset_serializer()
+
+    with pytest.raises(ValueError):
+        Serializer('no-such-backend')
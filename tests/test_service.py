@@ -0,0 +1,92 @@
+"""
+Asyncio analysis service: coalescing, batches and the HTTP layer
+"""
+
+import json
+import time
+import asyncio
+import http.client
+
+from service import AnalysisService, build_analyzers, build_restamp
+
+
+def counting_analyzer(calls, delay=0.05):
+    def analyze(target):
+        calls.append(target)
+        time.sleep(delay)
+        return {'target': target}
+    return analyze
+
+
+def test_concurrent_identical_lookups_are_coalesced():
+    calls = []
+    service = AnalysisService({'email': counting_analyzer(calls)},
+                              restamp=lambda analysis, target, result: dict(result, target=target))
+
+    async def run():
+        return await asyncio.gather(*(service.analyze('email', e) for e in
+                                      ['a.b@gmail.com', 'AB@gmail.com', 'ab+x@gmail.com', 'c@example.com']))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 2
+    # One computation per identity, but every caller sees its own spelling
+    assert [r['target'] for r in results] == ['a.b@gmail.com', 'AB@gmail.com', 'ab+x@gmail.com', 'c@example.com']
+    assert service.stats['coalesced'] == 2
+    assert service._inflight == {}
+
+
+def test_batch_keeps_input_order_and_reports_errors():
+    def analyze(target):
+        if target == 'bad':
+            raise ValueError('boom')
+        return target.upper()
+
+    service = AnalysisService({'domain': analyze})
+    status, payload = asyncio.run(service.handle(
+        'POST', '/v1/batch', {}, json.dumps({'analysis': 'domain', 'targets': ['a.com', 'bad', 'b.com']}).encode()))
+
+    assert status == 200
+    assert payload['results'] == [{'target': 'a.com', 'result': 'A.COM'},
+                                  {'target': 'bad', 'error': 'boom'},
+                                  {'target': 'b.com', 'result': 'B.COM'}]
+
+
+def test_http_round_trip_with_real_analyzers(stub_dns, collector, hunter):
+    service = AnalysisService(build_analyzers(collector, hunter))
+
+    def client(port):
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        responses = []
+        for path in ('/v1/mx?target=gmail.com', '/v1/email?target=Support@Example.com', '/v1/nope?target=x'):
+            conn.request('GET', path)
+            response = conn.getresponse()
+            responses.append((response.status, json.loads(response.read())))
+        conn.close()
+        return responses
+
+    async def scenario():
+        server = await service.start('127.0.0.1', 0)
+        try:
+            return await asyncio.to_thread(client, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    (_, mx), (_, email), (missing, _) = asyncio.run(scenario())
+    service.close()
+
+    assert mx['result']['has_mx']
+    assert email['result']['mx_records']['has_mx']
+    assert email['result']['role_account']
+    assert missing == 404
+
+
+def test_shared_email_result_is_restamped_per_spelling(stub_dns, collector, hunter):
+    shared = build_analyzers(collector, hunter)['email']('a.b@gmail.com')
+
+    mine = build_restamp(collector, hunter)('email', 'AB+Support@gmail.com', shared)
+
+    assert (shared['email'], shared['role_account']) == ('a.b@gmail.com', False)
+    assert (mine['email'], mine['username'], mine['role_account']) == ('ab+support@gmail.com', 'ab+support', True)
+    assert mine['provider'] == shared['provider'] and mine['mx_records'] == shared['mx_records']
@@ -0,0 +1,138 @@
+"""
+SPF include-chain resolution, RFC limits and DMARC parsing against a stub nameserver
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import rate_limit
+from dns_stub import StubDNSServer
+from dns_tools import DeadlineResolver, ResolverConfig
+from spf import SPFAuditor, parse_spf
+
+
+def txt(text):
+    return {'TXT': [f'"{text}"']}
+
+
+ZONES = {
+    'a.test': txt('v=spf1 include:_spf.google.test include:spf.outlook.test -all'),
+    '_dmarc.a.test': txt('v=DMARC1; p=reject; sp=quarantine; rua=mailto:d@a.test'),
+    'b.test': txt('v=spf1 mx include:_spf.google.test ~all'),
+    '_spf.google.test': txt('v=spf1 include:_netblocks.google.test include:_netblocks2.google.test ~all'),
+    '_netblocks.google.test': txt('v=spf1 ip4:35.190.247.0/24 ip4:64.233.160.0/19 ~all'),
+    '_netblocks2.google.test': txt('v=spf1 ip6:2001:4860:4000::/36 ~all'),
+    'spf.outlook.test': txt('v=spf1 ip4:40.92.0.0/15 -all'),
+    'redirect.test': txt('v=spf1 redirect=_spf.google.test'),
+    'loop.test': txt('v=spf1 include:loop2.test -all'),
+    'loop2.test': txt('v=spf1 include:loop.test -all'),
+    'void.test': txt('v=spf1 include:nothing.test -all'),
+    'deep.test': txt('v=spf1 include:l1.deep.test -all'),
+    'nospf.test': txt('google-site-verification=abc'),
+}
+for n in range(1, 12):
+    ZONES[f'l{n}.deep.test'] = txt(f'v=spf1 include:l{n + 1}.deep.test -all' if n < 11 else 'v=spf1 -all')
+
+
+@pytest.fixture
+def auditor():
+    rate_limit.reset_limiter(rate_limit.RateLimiter(rate_limit.LimiterConfig(initial=1e9, maximum=1e9, burst=1e9)))
+    with StubDNSServer(ZONES) as server:
+        resolver = DeadlineResolver(ResolverConfig(nameservers=[server.address], query_timeout=1.0))
+        yield SPFAuditor(lambda name: resolver.resolve(name, 'TXT')), server
+    rate_limit.reset_limiter()
+
+
+def test_shared_includes_are_fetched_once(auditor):
+    auditor, server = auditor
+    a, b = auditor.audit(['a.test', 'B.test.'])
+
+    assert a['spf']['status'] == 'ok' and a['spf']['all'] == '-all'
+    assert a['spf']['lookups'] == 4 and a['spf']['ip4'] == 3 and a['spf']['ip6'] == 1
+    assert a['spf']['includes'] == ['_spf.google.test', '_netblocks.google.test',
+                                    '_netblocks2.google.test', 'spf.outlook.test']
+    assert a['dmarc'] == {'record': 'v=DMARC1; p=reject; sp=quarantine; rua=mailto:d@a.test', 'status': 'ok',
+                          'policy': 'reject', 'subdomain_policy': 'quarantine', 'pct': 100,
+                          'rua': ['mailto:d@a.test']}
+    assert b['domain'] == 'b.test' and b['spf']['lookups'] == 4 and b['spf']['all'] == '~all'
+    assert b['dmarc']['status'] == 'none'
+
+    # 2 domains + 2 _dmarc names + 4 distinct includes
+    assert server.queries == auditor.stats['queries'] == 8
+    auditor.audit(['b.test', 'redirect.test'])
+    assert server.queries == 10  # only redirect.test and _dmarc.redirect.test are new
+
+
+def test_rfc_limits_and_errors(auditor):
+    auditor, _ = auditor
+    results = {r['domain']: r['spf'] for r in auditor.audit(
+        ['redirect.test', 'loop.test', 'void.test', 'deep.test', 'nospf.test', 'missing.test'])}
+
+    assert results['redirect.test']['status'] == 'ok'
+    assert results['redirect.test']['all'] == '~all' and results['redirect.test']['lookups'] == 3
+    assert results['loop.test']['status'] == 'permerror'
+    assert any('loop' in e for e in results['loop.test']['errors'])
+    assert results['void.test']['status'] == 'permerror' and results['void.test']['void_lookups'] == 1
+    assert results['deep.test']['status'] == 'permerror' and results['deep.test']['lookups'] == 11
+    assert results['nospf.test']['status'] == results['missing.test']['status'] == 'none'
+
+    assert parse_spf('v=spf1 ~ip4:1.2.3.4 a/24 exp=explain.test') == (
+        [('~', 'ip4', '1.2.3.4'), ('+', 'a', '/24')], {'exp': 'explain.test'})
+
+
+def test_concurrent_audits_share_in_flight_fetches():
+    rate_limit.reset_limiter(rate_limit.RateLimiter(rate_limit.LimiterConfig(initial=1e9, maximum=1e9, burst=1e9)))
+    with StubDNSServer(ZONES, latency='fixed:0.05') as server:
+        resolver = DeadlineResolver(ResolverConfig(nameservers=[server.address], query_timeout=1.0))
+        auditor = SPFAuditor(lambda name: resolver.resolve(name, 'TXT'))
+        barrier = threading.Barrier(4)
+
+        def audit():
+            barrier.wait()
+            return auditor.audit(['a.test', 'b.test'])
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: audit(), range(4)))
+    rate_limit.reset_limiter()
+
+    assert all(r[0]['spf']['status'] == 'ok' and r[1]['spf']['lookups'] == 4 for r in results)
+    assert server.queries == auditor.stats['queries'] == 8
+
+
+def test_expired_and_forgotten_records_leave_the_memo(auditor):
+    auditor, server = auditor
+    auditor.memo_ttl = 0.05
+    auditor.audit(['redirect.test'])
+    assert set(auditor.records) == set(auditor._fetched) == {
+        'redirect.test', '_dmarc.redirect.test', '_spf.google.test',
+        '_netblocks.google.test', '_netblocks2.google.test'}
+
+    auditor.forget('_spf.google.test')
+    assert '_spf.google.test' not in auditor._fetched
+
+    time.sleep(0.06)
+    auditor.fetch_all(['spf.outlook.test'])
+    assert set(auditor.records) == set(auditor._fetched) == {'spf.outlook.test'}
+
+    auditor.forget()
+    assert auditor.records == auditor._fetched == {}
+
+
+def test_eviction_between_prefetch_and_evaluation_keeps_the_audit_whole(auditor):
+    auditor, server = auditor
+    auditor.memo_ttl = 0.05
+    records = auditor.prefetch(['a.test'])
+
+    time.sleep(0.06)
+    auditor.fetch_all(['b.test'])  # another audit's fetch evicts a.test's chain
+    assert 'a.test' not in auditor.records
+
+    assert auditor.evaluate_spf('a.test', records)['status'] == 'ok'
+    assert auditor.evaluate_dmarc('a.test', records)['policy'] == 'reject'
+    queries = server.queries
+    # Without a snapshot the records are fetched again rather than reported as temperror
+    assert auditor.evaluate_spf('a.test')['status'] == 'ok'
+    assert server.queries > queries
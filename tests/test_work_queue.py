@@ -0,0 +1,96 @@
+"""
+SQLite work queue: grouping, leases and concurrent workers
+"""
+
+import threading
+
+from work_queue import MAX_ATTEMPTS, WorkQueue, Worker
+
+EMAILS = ['a@gmail.com', 'b@example.com', 'c@gmail.com', 'A@Gmail.com', 'd@example.com', 'e@gmail.com']
+
+
+def make_queue(tmp_path, **kwargs):
+    return WorkQueue(str(tmp_path / 'queue.sqlite'), **kwargs)
+
+
+def test_enqueue_skips_duplicate_identities(tmp_path):
+    queue = make_queue(tmp_path)
+
+    assert queue.enqueue('email', EMAILS + ['', '# comment']) == 5
+    assert queue.enqueue('email', ['a.@gmail.com', 'f@example.com']) == 1
+    assert queue.status()['pending'] == 6
+
+
+def test_every_spelling_gets_the_shared_result(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.enqueue('email', ['a.b@gmail.com', 'ab@gmail.com', 'A.B+x@gmail.com', 'ab@gmail.com']) == 1
+
+    _, [(task_id, _, target)] = queue.claim('w1')
+    queue.complete('w1', task_id, {'email': target, 'mx': 'shared'})
+
+    assert list(queue.iter_results(restamp=lambda analysis, target, result: dict(result, email=target))) == [
+        ('email', 'a.b@gmail.com', {'email': 'a.b@gmail.com', 'mx': 'shared'}),
+        ('email', 'ab@gmail.com', {'email': 'ab@gmail.com', 'mx': 'shared'}),
+        ('email', 'A.B+x@gmail.com', {'email': 'A.B+x@gmail.com', 'mx': 'shared'}),
+    ]
+
+
+def test_claims_stay_within_one_domain(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('email', EMAILS)
+
+    group, tasks = queue.claim('w1')
+    other_group, other_tasks = queue.claim('w2')
+
+    assert {t[2].split('@')[1] for t in tasks} == {group}
+    assert other_group != group
+    assert len(tasks) + len(other_tasks) == 5
+
+
+def test_expired_lease_is_reclaimed_and_stale_completion_rejected(tmp_path):
+    queue = make_queue(tmp_path, lease=0.01)
+    queue.enqueue('domain', ['example.com'])
+
+    _, [(task_id, _, _)] = queue.claim('slow')
+    import time
+    time.sleep(0.05)
+    _, reclaimed = queue.claim('fast')
+
+    assert [t[0] for t in reclaimed] == [task_id]
+    assert not queue.complete('slow', task_id, {'late': True})
+    assert queue.complete('fast', task_id, {'ok': True})
+    assert list(queue.iter_results()) == [('domain', 'example.com', {'ok': True})]
+
+
+def test_failures_retry_then_give_up(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.enqueue('domain', ['broken.example'])
+
+    for _ in range(MAX_ATTEMPTS):
+        _, [(task_id, _, _)] = queue.claim('w1')
+        queue.fail('w1', task_id, 'boom')
+
+    assert queue.status()['failed'] == 1
+    assert queue.claim('w1') == (None, [])
+
+
+def test_workers_drain_queue_concurrently(tmp_path):
+    queue_path = str(tmp_path / 'queue.sqlite')
+    WorkQueue(queue_path).enqueue('email', [f'user{i}@domain{i % 4}.com' for i in range(40)])
+    analyzed = []
+
+    def analyze(analysis, target):
+        analyzed.append(target)
+        return {'target': target}
+
+    workers = [Worker(WorkQueue(queue_path), analyze, worker_id=f'w{i}') for i in range(3)]
+    threads = [threading.Thread(target=w.run) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    status = WorkQueue(queue_path).status()
+    assert sorted(analyzed) == sorted(f'user{i}@domain{i % 4}.com' for i in range(40))
+    assert status['done'] == 40
+    assert status['workers'] == []
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+🗃️ Work Queue
+SQLite-backed task queue shared by worker processes and hosts
+
+Tasks are leased in groups that share a domain (email/domain targets)
+or country code (phones), so a worker keeps hitting the same DNS names
+while its lease lasts. Workers heartbeat to extend their leases; tasks
+whose lease expires (crashed or stalled worker) go back to the pool.
+
+Each canonical identity is analyzed once. Every input spelling of it is
+remembered, and results are exported once per spelling.
+
+Configuration (environment):
+    OSINT_QUEUE_DB       database path (default jobs/queue.sqlite)
+    OSINT_QUEUE_SHARED   1 when the database is on a network filesystem
+                         (uses rollback journaling instead of WAL)
+    OSINT_QUEUE_LEASE    lease length in seconds (default 60)
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import threading
+
+import metrics
+import serialize
+from dedup import canonical
+
+DEFAULT_DB = os.path.join('jobs', 'queue.sqlite')
+DEFAULT_QUEUE = 'default'
+DEFAULT_LEASE = 60.0
+CLAIM_SIZE = 20
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    queue TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    target TEXT NOT NULL,
+    canonical TEXT NOT NULL,
+    group_key TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (queue, analysis, canonical)
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (queue, state, group_key);
+CREATE TABLE IF NOT EXISTS spellings (
+    id INTEGER PRIMARY KEY,
+    queue TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    canonical TEXT NOT NULL,
+    target TEXT NOT NULL,
+    UNIQUE (queue, analysis, canonical, target)
+);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    queue TEXT NOT NULL,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    started REAL NOT NULL,
+    heartbeat REAL NOT NULL,
+    group_key TEXT,
+    done INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def group_key(analysis, key):
+    """Lease group for a canonical target"""
+    if analysis == 'phone':
+        from phone_normalize import split_country_code
+        code, _ = split_country_code(key)
+        return f"+{code}" if code else 'unknown'
+    if '@' in key:
+        return key.rpartition('@')[2]
+    return key
+
+
+class WorkQueue:
+    def __init__(self, path=None, queue=DEFAULT_QUEUE, lease=None):
+        self.path = path or os.environ.get('OSINT_QUEUE_DB', DEFAULT_DB)
+        self.queue = queue
+        self.lease = float(lease or os.environ.get('OSINT_QUEUE_LEASE', DEFAULT_LEASE))
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._local = threading.local()
+        self.db.executescript(SCHEMA)
+
+    @property
+    def db(self):
+        """One connection per thread (the heartbeat runs on its own thread)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            shared = os.environ.get('OSINT_QUEUE_SHARED', '').lower() in ('1', 'true', 'yes')
+            # WAL needs shared memory, which network filesystems don't provide
+            conn.execute(f"PRAGMA journal_mode={'DELETE' if shared else 'WAL'}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Immediate(self.db)
+
+    def enqueue(self, analysis, targets):
+        """Add targets; returns how many new tasks (identities) were created
+
+        Spellings of an already queued identity join its task and are
+        exported with its result.
+        """
+        now = time.time()
+        rows = []
+        for target in targets:
+            target = str(target).strip()
+            if not target or target.startswith('#'):
+                continue
+            key = canonical(analysis, target)
+            rows.append((self.queue, analysis, target, key, group_key(analysis, key), now))
+
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO tasks (queue, analysis, target, canonical, group_key, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            added = db.total_changes - before
+            db.executemany(
+                "INSERT OR IGNORE INTO spellings (queue, analysis, canonical, target) VALUES (?, ?, ?, ?)",
+                [(queue, analysis, key, target) for queue, analysis, target, key, _, _ in rows])
+        metrics.inc('osint_queue_enqueued_total', added, queue=self.queue)
+        return added
+
+    def claim(self, worker_id, preferred_group=None, limit=CLAIM_SIZE):
+        """Lease up to limit tasks from one group; returns (group, tasks)"""
+        now = time.time()
+        available = ("queue = ? AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?))")
+
+        with self._transaction() as db:
+            # A task whose workers keep dying without reporting is given up on
+            db.execute("UPDATE tasks SET state = 'failed', error = 'lease expired', lease_owner = NULL "
+                       "WHERE queue = ? AND state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                       (self.queue, now, MAX_ATTEMPTS))
+
+            group = None
+            if preferred_group is not None:
+                row = db.execute(f"SELECT 1 FROM tasks WHERE {available} AND group_key = ? LIMIT 1",
+                                 (self.queue, now, preferred_group)).fetchone()
+                group = preferred_group if row else None
+            if group is None:
+                # Prefer groups no other live worker is holding
+                row = db.execute(
+                    f"SELECT group_key FROM tasks WHERE {available} AND group_key NOT IN "
+                    "(SELECT group_key FROM tasks WHERE queue = ? AND state = 'leased' "
+                    "AND lease_expires >= ? AND lease_owner != ?) LIMIT 1",
+                    (self.queue, now, self.queue, now, worker_id)).fetchone()
+                if row is None:
+                    row = db.execute(f"SELECT group_key FROM tasks WHERE {available} LIMIT 1",
+                                     (self.queue, now)).fetchone()
+                if row is None:
+                    return None, []
+                group = row[0]
+
+            ids = [r[0] for r in db.execute(
+                f"SELECT id FROM tasks WHERE {available} AND group_key = ? LIMIT ?",
+                (self.queue, now, group, limit))]
+            db.executemany(
+                "UPDATE tasks SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE id = ?",
+                [(worker_id, now + self.lease, now, task_id) for task_id in ids])
+            tasks = db.execute(
+                f"SELECT id, analysis, target FROM tasks WHERE id IN ({','.join('?' * len(ids))})",
+                ids).fetchall()
+            db.execute("UPDATE workers SET group_key = ?, heartbeat = ? WHERE worker_id = ?",
+                       (group, now, worker_id))
+        return group, tasks
+
+    def heartbeat(self, worker_id):
+        """Extend this worker's leases"""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("UPDATE tasks SET lease_expires = ? WHERE lease_owner = ? AND state = 'leased'",
+                       (now + self.lease, worker_id))
+            db.execute("UPDATE workers SET heartbeat = ? WHERE worker_id = ?", (now, worker_id))
+
+    def complete(self, worker_id, task_id, result):
+        """Store a result if this worker still holds the lease"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET state = 'done', result = ?, error = NULL, lease_owner = NULL, "
+                "updated = ? WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                (serialize.dumps(result), time.time(), task_id, worker_id))
+            if cursor.rowcount:
+                db.execute("UPDATE workers SET done = done + 1 WHERE worker_id = ?", (worker_id,))
+        return bool(cursor.rowcount)
+
+    def fail(self, worker_id, task_id, error, max_attempts=MAX_ATTEMPTS):
+        """Return a task to the pool, or mark it failed after max_attempts"""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_owner = NULL, updated = ? "
+                "WHERE id = ? AND lease_owner = ? AND state = 'leased'",
+                (max_attempts, str(error), time.time(), task_id, worker_id))
+            db.execute("UPDATE workers SET failed = failed + 1 WHERE worker_id = ?", (worker_id,))
+
+    def release(self, worker_id):
+        """Hand back unfinished leases (clean worker shutdown)"""
+        with self._transaction() as db:
+            db.execute("UPDATE tasks SET state = 'pending', lease_owner = NULL, "
+                       "attempts = MAX(attempts - 1, 0) WHERE lease_owner = ? AND state = 'leased'",
+                       (worker_id,))
+            db.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def register(self, worker_id):
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO workers (worker_id, queue, host, pid, started, heartbeat) "
+                       "VALUES (?, ?, ?, ?, ?, ?)",
+                       (worker_id, self.queue, socket.gethostname(), os.getpid(), now, now))
+
+    def status(self):
+        """Task counts by state plus live workers"""
+        counts = dict(self.db.execute(
+            "SELECT state, COUNT(*) FROM tasks WHERE queue = ? GROUP BY state", (self.queue,)))
+        groups = self.db.execute(
+            "SELECT COUNT(DISTINCT group_key) FROM tasks WHERE queue = ? AND state != 'done'",
+            (self.queue,)).fetchone()[0]
+        workers = [
+            dict(zip(('worker_id', 'host', 'pid', 'heartbeat', 'group_key', 'done', 'failed'), row))
+            for row in self.db.execute(
+                "SELECT worker_id, host, pid, heartbeat, group_key, done, failed FROM workers "
+                "WHERE queue = ? ORDER BY worker_id", (self.queue,))
+        ]
+        return {
+            'queue': self.queue,
+            'pending': counts.get('pending', 0),
+            'leased': counts.get('leased', 0),
+            'done': counts.get('done', 0),
+            'failed': counts.get('failed', 0),
+            'open_groups': groups,
+            'workers': workers,
+        }
+
+    def iter_results(self, restamp=None):
+        """Yield (analysis, target, result) for every spelling of every finished task
+
+        restamp(analysis, target, result) rewrites the shared result for a
+        spelling other than the one that was analyzed.
+        """
+        # Tasks queued before spellings were recorded have no rows there
+        for analysis, analyzed, target, result in self.db.execute(
+                "SELECT t.analysis, t.target, COALESCE(s.target, t.target), t.result FROM tasks t "
+                "LEFT JOIN spellings s ON s.queue = t.queue AND s.analysis = t.analysis "
+                "AND s.canonical = t.canonical "
+                "WHERE t.queue = ? AND t.state = 'done' ORDER BY t.id, s.id",
+                (self.queue,)):
+            result = serialize.loads(result)
+            if restamp is not None and target != analyzed:
+                result = restamp(analysis, target, result)
+            yield analysis, target, result
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class _Immediate:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent claimers serialize on the write lock"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class Worker:
+    """Claims task groups and runs analyze(analysis, target) on each"""
+
+    def __init__(self, queue, analyze, worker_id=None):
+        self.queue = queue
+        self.analyze = analyze
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.stats = {'done': 0, 'failed': 0, 'lost': 0}
+        self._stop = threading.Event()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.queue.lease / 3):
+            try:
+                self.queue.heartbeat(self.worker_id)
+            except sqlite3.Error:
+                pass
+        self.queue.close()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, idle_exit=True, poll=1.0):
+        """Process tasks until the queue is drained (or stop() is called)"""
+        self.queue.register(self.worker_id)
+        beat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        beat.start()
+        group = None
+
+        try:
+            while not self._stop.is_set():
+                group, tasks = self.queue.claim(self.worker_id, group)
+                if not tasks:
+                    if idle_exit:
+                        break
+                    self._stop.wait(poll)
+                    continue
+
+                for task_id, analysis, target in tasks:
+                    try:
+                        with metrics.timed(f"queue_{analysis}"):
+                            result = self.analyze(analysis, target)
+                    except KeyboardInterrupt:
+                        raise
+                    except Exception as e:
+                        self.queue.fail(self.worker_id, task_id, e)
+                        self.stats['failed'] += 1
+                        continue
+
+                    if self.queue.complete(self.worker_id, task_id, result):
+                        self.stats['done'] += 1
+                    else:
+                        # Lease expired and another worker took the task
+                        self.stats['lost'] += 1
+        finally:
+            self._stop.set()
+            beat.join()
+            self.queue.release(self.worker_id)
+        return self.stats